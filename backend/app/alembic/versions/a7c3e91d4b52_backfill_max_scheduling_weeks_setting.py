@@ -0,0 +1,42 @@
+"""backfill max_scheduling_weeks setting
+
+Revision ID: a7c3e91d4b52
+Revises: fb4f1d257e34
+Create Date: 2026-10-16 10:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91d4b52'
+down_revision: Union[str, None] = 'fb4f1d257e34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+
+    # Give every user without the setting the 12 weeks that used to be hardcoded
+    connection.execute(
+        sa.text("""
+            INSERT INTO user_settings (user_id, key, value, label)
+            SELECT users.id, 'max_scheduling_weeks', '12', '12 weeks'
+            FROM users
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_settings
+                WHERE user_settings.user_id = users.id
+                AND user_settings.key = 'max_scheduling_weeks'
+            )
+        """)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM user_settings WHERE key = 'max_scheduling_weeks'")
@@ -0,0 +1,42 @@
+"""backfill min_split_minutes setting
+
+Revision ID: d2b8f4a61c07
+Revises: a7c3e91d4b52
+Create Date: 2026-10-17 09:41:27.552904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b8f4a61c07'
+down_revision: Union[str, None] = 'a7c3e91d4b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+
+    # Give every user without the setting no minimum split, as before
+    connection.execute(
+        sa.text("""
+            INSERT INTO user_settings (user_id, key, value, label)
+            SELECT users.id, 'min_split_minutes', '0', 'No minimum'
+            FROM users
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_settings
+                WHERE user_settings.user_id = users.id
+                AND user_settings.key = 'min_split_minutes'
+            )
+        """)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM user_settings WHERE key = 'min_split_minutes'")
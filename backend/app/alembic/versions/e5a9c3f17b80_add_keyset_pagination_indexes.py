@@ -0,0 +1,37 @@
+"""add keyset pagination indexes
+
+Revision ID: e5a9c3f17b80
+Revises: d2b8f4a61c07
+Create Date: 2026-10-17 14:12:05.318840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3f17b80'
+down_revision: Union[str, None] = 'd2b8f4a61c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_tasks_user_created', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('idx_tasks_user_scheduled', 'tasks', ['user_id', 'scheduled_at', 'id'], unique=False)
+    op.create_index('idx_tasks_user_completed', 'tasks', ['user_id', 'completed_at', 'id'], unique=False)
+    # Extend the start time index with the id tiebreak of the page order
+    op.drop_index('idx_schedule_items_user_start', table_name='schedule_items')
+    op.create_index('idx_schedule_items_user_start', 'schedule_items', ['user_id', 'start_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_schedule_items_user_start', table_name='schedule_items')
+    op.create_index('idx_schedule_items_user_start', 'schedule_items', ['user_id', 'start_time'], unique=False)
+    op.drop_index('idx_tasks_user_completed', table_name='tasks')
+    op.drop_index('idx_tasks_user_scheduled', table_name='tasks')
+    op.drop_index('idx_tasks_user_created', table_name='tasks')
@@ -1,34 +1,142 @@
-from fastapi import APIRouter, Body, Depends, Response
+import datetime as dt
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 from sqlmodel import Session
 
 from app.core.auth import get_current_user_id
 from app.core.db import get_db
-from app.core.timezone import now_utc
+from app.core.exceptions import NotFoundError
+from app.core.timezone import get_next_half_hour, now_user_timezone, now_utc
 from app.crud.availability_crud import get_user_availability
-from app.crud.schedule_item_crud import create_schedule_items, get_user_schedule_items
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.crud.schedule_item_crud import (
+    create_schedule_items,
+    get_schedule_item_page,
+    get_schedule_item_stats,
+    get_schedule_items_in_horizon,
+    get_user_schedule_items,
+)
 from app.crud.setting_crud import get_schedule_config, get_user_timezone
 from app.crud.task_crud import (
     get_tasks_by_ids,
     get_unscheduled_tasks,
     update_tasks_scheduled_at,
 )
+from app.env import get_config
 from app.models.availability import WeeklyAvailability
 from app.models.schedule_item import ScheduleItem
 from app.models.task import Task
+from app.schemas.availability import WeeklyAvailabilityBase
 from app.schemas.schedule_item import ScheduleItemCreate, ScheduleItemResponse
-from app.schemas.schedule_requests import ScheduleGenerateRequest
+from app.schemas.schedule_requests import (
+    ScheduleCommitRequest,
+    ScheduleCompareRequest,
+    ScheduleGenerateRequest,
+)
+from app.services.anytime_scheduler import AnytimeScheduler
+from app.services.free_gap_cache import free_gap_cache, plan_signature
 from app.services.greedy_scheduler import GreedyScheduler
 from app.services.ical_service import export_calendar_from_schedule_items
-from app.services.protocols import ChronoScheduler
-from app.services.scheduling_types import SchedulingConfig, SchedulingResponse
+from app.services.protocols import (
+    CapacityPlanner,
+    ChronoScheduler,
+    IncrementalScheduler,
+)
+from app.services.request_capture import recorder_from_config
+from app.services.schedule_preview_store import (
+    SchedulePreview,
+    schedule_preview_store,
+)
+from app.services.schedule_result_cache import CachedScheduler, schedule_result_cache
+from app.services.scheduling_diagnostics import log_scheduling_diagnostics
+from app.services.scheduling_types import (
+    CapacityReport,
+    Clock,
+    SchedulingConfig,
+    SchedulingResponse,
+    VariantResult,
+)
 from app.services.scheduling_utils import schedule_blocks_to_schedule_items
+from app.services.what_if import compare_configs
 
 router = APIRouter(prefix="/schedule", tags=["schedule"])
 
 
-def get_task_scheduler() -> ChronoScheduler:
-    """Dependency injection for ChronoScheduler. Returns GreedyScheduler by default."""
-    return GreedyScheduler()
+def get_scheduler_clock() -> Clock:
+    """Dependency injection for the scheduling Clock. Returns the wall clock."""
+    return now_user_timezone
+
+
+def get_task_scheduler(
+    clock: Clock = Depends(get_scheduler_clock),
+) -> ChronoScheduler:
+    """
+    Dependency injection for ChronoScheduler. Returns GreedyScheduler by default,
+    or AnytimeScheduler when SCHEDULER_SEARCH_BUDGET_MS grants a search budget,
+    behind the shared scheduling result cache. Runs are captured for replay
+    when SCHEDULE_CAPTURE_DIR is set.
+    """
+    config = get_config()
+    greedy = GreedyScheduler(
+        diagnostics_hook=(
+            log_scheduling_diagnostics if config.SCHEDULER_DIAGNOSTICS_LOG else None
+        ),
+        recorder=recorder_from_config(),
+        clock=clock,
+    )
+    if config.SCHEDULER_SEARCH_BUDGET_MS > 0:
+        return CachedScheduler(AnytimeScheduler(greedy), clock=clock)
+    return CachedScheduler(greedy, clock=clock)
+
+
+def get_incremental_scheduler(
+    clock: Clock = Depends(get_scheduler_clock),
+) -> IncrementalScheduler:
+    """Dependency injection for IncrementalScheduler. Returns GreedyScheduler by default."""
+    return GreedyScheduler(clock=clock)
+
+
+def get_capacity_planner(
+    clock: Clock = Depends(get_scheduler_clock),
+) -> CapacityPlanner:
+    """Dependency injection for CapacityPlanner. Returns GreedyScheduler by default."""
+    return GreedyScheduler(clock=clock)
+
+
+def _start_time(clock: Clock, config: SchedulingConfig) -> dt.datetime:
+    """Start of the scheduler's horizon: the next half hour of its clock."""
+    return get_next_half_hour(clock(config.timezone))
+
+
+def _commit_schedule(
+    response: SchedulingResponse, user_id: int, session: Session
+) -> None:
+    """Persist the blocks of response as schedule items and mark their tasks."""
+    schedule_items_to_create: list[ScheduleItemCreate] = (
+        schedule_blocks_to_schedule_items(response.schedule_blocks, user_id)
+    )
+    create_schedule_items(schedule_items_to_create, session)
+    update_tasks_scheduled_at(
+        [block.task_id for block in response.schedule_blocks],
+        now_utc(),
+        user_id,
+        session,
+    )
+    schedule_result_cache.invalidate(user_id)
+
+
+def _store_preview(
+    response: SchedulingResponse, user_id: int, session: Session
+) -> SchedulingResponse:
+    """Store response for a later /schedule/commit and return it with its id."""
+    item_count, max_item_id = get_schedule_item_stats(user_id, session)
+    response.preview_id = schedule_preview_store.put(
+        user_id,
+        SchedulePreview(
+            response=response, item_count=item_count, max_item_id=max_item_id
+        ),
+    )
+    return response
 
 
 @router.get("/export")
@@ -48,11 +156,16 @@ async def export_schedule(
 
 @router.get("/items")
 async def get_schedule_items(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
     session: Session = Depends(get_db),
     source: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
 ) -> list[ScheduleItemResponse]:
-    items: list[ScheduleItem] = get_user_schedule_items(user_id, session, source)
+    items, next_cursor = get_schedule_item_page(user_id, session, source, limit, cursor)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     user_timezone: str = get_user_timezone(user_id, session)
     converted_items: list[ScheduleItemResponse] = [
         ScheduleItemResponse.from_model(item, user_timezone) for item in items
@@ -60,33 +173,168 @@ async def get_schedule_items(
     return converted_items
 
 
+@router.get("/capacity")
+async def get_schedule_capacity(
+    user_id: int = Depends(get_current_user_id),
+    session: Session = Depends(get_db),
+    planner: CapacityPlanner = Depends(get_capacity_planner),
+    clock: Clock = Depends(get_scheduler_clock),
+) -> CapacityReport:
+    """
+    Compare the minutes of the unscheduled tasks with the free minutes of the
+    scheduling horizon, so the client can warn before generating a schedule.
+    """
+    schedule_config: SchedulingConfig = get_schedule_config(user_id, session)
+    tasks: list[Task] = get_unscheduled_tasks(user_id, session)
+    schedule_items: list[ScheduleItem] = get_schedule_items_in_horizon(
+        user_id,
+        _start_time(clock, schedule_config),
+        schedule_config.max_scheduling_weeks,
+        session,
+    )
+    availability: WeeklyAvailability = get_user_availability(user_id, session)
+    return planner.capacity_report(tasks, schedule_items, availability, schedule_config)
+
+
+@router.post("/compare")
+async def compare_schedule_configs(
+    compare_request: ScheduleCompareRequest = Body(...),
+    user_id: int = Depends(get_current_user_id),
+    session: Session = Depends(get_db),
+    clock: Clock = Depends(get_scheduler_clock),
+) -> list[VariantResult]:
+    """
+    Schedule the same tasks under several variants of the user's configuration
+    and return one result per variant, without saving any of them.
+    """
+    tasks: list[Task] = (
+        get_unscheduled_tasks(user_id, session)
+        if compare_request.task_ids is None
+        else get_tasks_by_ids(compare_request.task_ids, user_id, session)
+    )
+    availability: WeeklyAvailability = get_user_availability(user_id, session)
+    schedule_config: SchedulingConfig = get_schedule_config(user_id, session)
+    schedule_items: list[ScheduleItem] = get_schedule_items_in_horizon(
+        user_id,
+        _start_time(clock, schedule_config),
+        max(
+            schedule_config.max_scheduling_weeks,
+            *(
+                variant.max_scheduling_weeks or 0
+                for variant in compare_request.variants
+            ),
+        ),
+        session,
+    )
+    request = GreedyScheduler(clock=clock).build_request(
+        tasks, schedule_items, availability, schedule_config
+    )
+    configs = [
+        schedule_config.model_copy(update=variant.model_dump(exclude_none=True))
+        for variant in compare_request.variants
+    ]
+    return compare_configs(request, configs)
+
+
 @router.post("/generate/selected")
 async def generate_schedule(
     generate_schedule_request: ScheduleGenerateRequest = Body(...),
     user_id: int = Depends(get_current_user_id),
     session: Session = Depends(get_db),
     scheduler: ChronoScheduler = Depends(get_task_scheduler),
+    clock: Clock = Depends(get_scheduler_clock),
+    diagnostics: bool = False,
 ) -> SchedulingResponse:
     tasks: list[Task] = get_tasks_by_ids(
         generate_schedule_request.task_ids, user_id, session
     )
-    schedule_items: list[ScheduleItem] = get_user_schedule_items(user_id, session)
     availability: WeeklyAvailability = get_user_availability(user_id, session)
     schedule_config: SchedulingConfig = get_schedule_config(user_id, session)
+    schedule_config.collect_diagnostics = diagnostics
+    schedule_items: list[ScheduleItem] = get_schedule_items_in_horizon(
+        user_id,
+        _start_time(clock, schedule_config),
+        schedule_config.max_scheduling_weeks,
+        session,
+    )
     response: SchedulingResponse = scheduler.schedule_tasks(
         tasks, schedule_items, availability, schedule_config
     )
+    if generate_schedule_request.preview:
+        return _store_preview(response, user_id, session)
+
+    _commit_schedule(response, user_id, session)
+    return response
+
+
+@router.post("/generate/incremental")
+async def generate_schedule_incremental(
+    generate_schedule_request: ScheduleGenerateRequest = Body(...),
+    user_id: int = Depends(get_current_user_id),
+    session: Session = Depends(get_db),
+    scheduler: IncrementalScheduler = Depends(get_incremental_scheduler),
+    clock: Clock = Depends(get_scheduler_clock),
+) -> SchedulingResponse:
+    """
+    Add the selected tasks to the existing schedule without rescheduling it.
+
+    The user's free slots are kept in free_gap_cache between calls and only
+    rebuilt from the schedule items when their signature no longer matches.
+    A preview is stored for /schedule/commit instead of being committed.
+    """
+    tasks: list[Task] = get_tasks_by_ids(
+        generate_schedule_request.task_ids, user_id, session
+    )
+    availability: WeeklyAvailability = get_user_availability(user_id, session)
+    schedule_config: SchedulingConfig = get_schedule_config(user_id, session)
+    item_count, max_item_id = get_schedule_item_stats(user_id, session)
+    signature = plan_signature(
+        WeeklyAvailabilityBase.model_validate(availability),
+        schedule_config,
+        item_count,
+        max_item_id,
+    )
+
+    free_gaps = free_gap_cache.take(user_id, signature)
+    if free_gaps is None:
+        schedule_items: list[ScheduleItem] = get_schedule_items_in_horizon(
+            user_id,
+            _start_time(clock, schedule_config),
+            schedule_config.max_scheduling_weeks,
+            session,
+        )
+        free_gaps = scheduler.build_free_gaps(
+            schedule_items, availability, schedule_config
+        )
+    response: SchedulingResponse = scheduler.add_tasks(
+        tasks, free_gaps, schedule_config
+    )
+    if generate_schedule_request.preview:
+        # free_gaps now hold the uncommitted blocks, so they are not cached
+        return _store_preview(response, user_id, session)
+
     schedule_items_to_create: list[ScheduleItemCreate] = (
         schedule_blocks_to_schedule_items(response.schedule_blocks, user_id)
     )
-
-    create_schedule_items(schedule_items_to_create, session)
+    created_items = create_schedule_items(schedule_items_to_create, session)
     update_tasks_scheduled_at(
         [block.task_id for block in response.schedule_blocks],
         now_utc(),
         user_id,
         session,
     )
+    schedule_result_cache.invalidate(user_id)
+    free_gap_cache.put(
+        user_id,
+        signature._replace(
+            item_count=item_count + len(created_items),
+            max_item_id=max(
+                (item.id for item in created_items if item.id is not None),
+                default=max_item_id,
+            ),
+        ),
+        free_gaps,
+    )
     return response
 
 
@@ -95,27 +343,54 @@ async def generate_schedule_all(
     user_id: int = Depends(get_current_user_id),
     session: Session = Depends(get_db),
     scheduler: ChronoScheduler = Depends(get_task_scheduler),
+    clock: Clock = Depends(get_scheduler_clock),
+    diagnostics: bool = False,
+    preview: bool = False,
 ) -> SchedulingResponse:
     schedule_config: SchedulingConfig = get_schedule_config(user_id, session)
+    schedule_config.collect_diagnostics = diagnostics
     tasks: list[Task] = get_unscheduled_tasks(user_id, session)
-    schedule_items: list[ScheduleItem] = get_user_schedule_items(user_id, session)
+    schedule_items: list[ScheduleItem] = get_schedule_items_in_horizon(
+        user_id,
+        _start_time(clock, schedule_config),
+        schedule_config.max_scheduling_weeks,
+        session,
+    )
     availability: WeeklyAvailability = get_user_availability(user_id, session)
     response: SchedulingResponse = scheduler.schedule_tasks(
         tasks, schedule_items, availability, schedule_config
     )
-    schedule_items_to_create: list[ScheduleItemCreate] = (
-        schedule_blocks_to_schedule_items(response.schedule_blocks, user_id)
-    )
-    create_schedule_items(schedule_items_to_create, session)
-    update_tasks_scheduled_at(
-        [block.task_id for block in response.schedule_blocks],
-        now_utc(),
-        user_id,
-        session,
-    )
+    if preview:
+        return _store_preview(response, user_id, session)
+
+    _commit_schedule(response, user_id, session)
     return response
 
 
-# TODO: When calender View is implemented, we want following endpoints in order to stage a schedule and commit/discard it:
-# TODO: 1. /schedule/generate (currently saves but later should show a preview)
-# TODO: 2. /schedule/comiit (commits the schedule, so actually saves the schedule)
+@router.post("/commit")
+async def commit_schedule(
+    commit_schedule_request: ScheduleCommitRequest = Body(...),
+    user_id: int = Depends(get_current_user_id),
+    session: Session = Depends(get_db),
+) -> SchedulingResponse:
+    """
+    Persist a schedule stored by a generate request with preview set, without
+    running the scheduler again. Fails with 409 if schedule items were added or
+    removed since the preview was generated, as the plan may overlap them.
+    """
+    stored = schedule_preview_store.take(user_id, commit_schedule_request.preview_id)
+    if stored is None:
+        raise NotFoundError(
+            f"Schedule preview {commit_schedule_request.preview_id} not found"
+        )
+    if get_schedule_item_stats(user_id, session) != (
+        stored.item_count,
+        stored.max_item_id,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Schedule changed since the preview was generated",
+        )
+
+    _commit_schedule(stored.response, user_id, session)
+    return stored.response
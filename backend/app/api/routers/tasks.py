@@ -1,14 +1,26 @@
 from typing import Any
 
 from celery.result import AsyncResult
-from fastapi import APIRouter, Body, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
 from sqlmodel import Session
 
 from app.celery_app import celery_app
 from app.core.auth import get_current_user_id
 from app.core.db import get_db
 from app.crud import task_crud, temp_upload_crud
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from app.crud.setting_crud import get_user_setting, get_user_timezone
+from app.crud.task_crud import TaskList
 from app.models.task import Task
 from app.models.temp_upload import TempUpload
 from app.schemas.job import IngestTaskJob, JobStatus
@@ -23,6 +35,7 @@ from app.schemas.task import (
     TaskUpdate,
     TextAnalysisRequest,
 )
+from app.services.schedule_result_cache import schedule_result_cache
 from app.tasks.ingestion_tasks import ingest_file as ingest_file_task
 from app.tasks.ingestion_tasks import ingest_text as ingest_text_task
 
@@ -84,6 +97,7 @@ async def create_task(
     session: Session = Depends(get_db),
 ) -> TaskCreateResponse:
     created_task: Task = task_crud.create_task(task, user_id, session)
+    schedule_result_cache.invalidate(user_id)
     if created_task.id is None:
         raise HTTPException(status_code=500, detail="Failed to create task")
     return TaskCreateResponse(task_id=created_task.id, created=True)
@@ -96,6 +110,7 @@ async def create_tasks(
     session: Session = Depends(get_db),
 ) -> TasksCreateResponse:
     created_tasks: list[Task] = task_crud.create_tasks(tasks, user_id, session)
+    schedule_result_cache.invalidate(user_id)
     if len(created_tasks) != len(tasks):
         raise HTTPException(status_code=500, detail="Failed to create tasks")
     return TasksCreateResponse(
@@ -106,38 +121,56 @@ async def create_tasks(
 
 @router.get("/unscheduled", status_code=status.HTTP_200_OK)
 async def get_unscheduled_tasks(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
     session: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
 ) -> list[TaskRead]:
-    user_timezone: str = get_user_timezone(user_id, session)
-    return [
-        TaskRead.from_model(task, user_timezone)
-        for task in task_crud.get_unscheduled_tasks(user_id, session)
-    ]
+    return _task_page("unscheduled", response, user_id, session, limit, cursor)
 
 
 @router.get("/scheduled", status_code=status.HTTP_200_OK)
 async def get_scheduled_tasks(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
     session: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
 ) -> list[TaskRead]:
-    user_timezone: str = get_user_timezone(user_id, session)
-    return [
-        TaskRead.from_model(task, user_timezone)
-        for task in task_crud.get_scheduled_tasks(user_id, session)
-    ]
+    return _task_page("scheduled", response, user_id, session, limit, cursor)
 
 
 @router.get("/completed", status_code=status.HTTP_200_OK)
 async def get_completed_tasks(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
     session: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+) -> list[TaskRead]:
+    return _task_page("completed", response, user_id, session, limit, cursor)
+
+
+def _task_page(
+    task_list: TaskList,
+    response: Response,
+    user_id: int,
+    session: Session,
+    limit: int,
+    cursor: str | None,
 ) -> list[TaskRead]:
+    """
+    A page of task_list; the cursor of the next page is returned in the
+    X-Next-Cursor header.
+    """
+    tasks, next_cursor = task_crud.get_task_page(
+        user_id, task_list, session, limit, cursor
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     user_timezone: str = get_user_timezone(user_id, session)
-    return [
-        TaskRead.from_model(task, user_timezone)
-        for task in task_crud.get_completed_tasks(user_id, session)
-    ]
+    return [TaskRead.from_model(task, user_timezone) for task in tasks]
 
 
 @router.delete("/bulk", status_code=status.HTTP_204_NO_CONTENT)
@@ -147,18 +180,18 @@ async def delete_tasks(
     session: Session = Depends(get_db),
 ) -> None:
     task_crud.delete_tasks(TasksDelete(task_ids=task_ids), user_id, session)
+    schedule_result_cache.invalidate(user_id)
 
 
 @router.get("/drafts", status_code=status.HTTP_200_OK)
 async def get_drafts(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
     session: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
 ) -> list[TaskRead]:
-    user_timezone: str = get_user_timezone(user_id, session)
-    return [
-        TaskRead.from_model(task, user_timezone)
-        for task in task_crud.get_drafts(user_id, session)
-    ]
+    return _task_page("drafts", response, user_id, session, limit, cursor)
 
 
 @router.post("/drafts/commit", status_code=status.HTTP_200_OK)
@@ -168,6 +201,7 @@ async def commit_drafts(
     session: Session = Depends(get_db),
 ) -> TasksCreateResponse:
     tasks = task_crud.commit_drafts(task_ids, user_id, session)
+    schedule_result_cache.invalidate(user_id)
     return TasksCreateResponse(
         task_ids=[t.id for t in tasks if t.id],
         created_count=len(tasks),
@@ -183,6 +217,7 @@ async def update_task(
 ) -> TaskRead:
     user_timezone: str = get_user_timezone(user_id, session)
     updated_task = task_crud.update_task(task_id, task_update, user_id, session)
+    schedule_result_cache.invalidate(user_id)
     return TaskRead.from_model(updated_task, user_timezone)
 
 
@@ -194,6 +229,7 @@ async def deschedule_tasks(
 ) -> dict[str, Any]:
     """Deschedule tasks by removing scheduled_at timestamp and deleting schedule items."""
     task_crud.deschedule_tasks(task_ids.task_ids, user_id, session)
+    schedule_result_cache.invalidate(user_id)
     return {"descheduled_count": len(task_ids.task_ids)}
 
 
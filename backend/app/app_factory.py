@@ -8,7 +8,8 @@ from pydantic import ValidationError
 from app.api.routers import health, schedule, settings, tasks, users
 from app.core.config import APP_NAME, APP_VERSION
 from app.core.db import init_db
-from app.core.exceptions import NotFoundError, SystemError
+from app.core.exceptions import InvalidCursorError, NotFoundError, SystemError
+from app.crud.pagination import NEXT_CURSOR_HEADER
 
 
 def create_app(local: bool) -> FastAPI:
@@ -32,6 +33,7 @@ def create_app(local: bool) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     @app.exception_handler(NotFoundError)
@@ -54,6 +56,16 @@ def create_app(local: bool) -> FastAPI:
             content={"detail": str(exc)},
         )
 
+    @app.exception_handler(InvalidCursorError)
+    async def invalid_cursor_error_handler(
+        _request: Request, exc: InvalidCursorError
+    ) -> JSONResponse:
+        """Handle InvalidCursorError exceptions - returns 400 Bad Request."""
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": str(exc)},
+        )
+
     @app.exception_handler(SystemError)
     async def system_error_handler(_request: Request, exc: SystemError) -> JSONResponse:
         """Handle SystemError exceptions - returns 500 Internal Server Error."""
@@ -69,5 +81,6 @@ def create_app(local: bool) -> FastAPI:
     app.include_router(schedule.router)
     assert app.exception_handlers[NotFoundError] is not_found_error_handler
     assert app.exception_handlers[ValidationError] is validation_error_handler
+    assert app.exception_handlers[InvalidCursorError] is invalid_cursor_error_handler
     assert app.exception_handlers[SystemError] is system_error_handler
     return app
@@ -8,7 +8,7 @@ celery_app = Celery(
     "chrono_guide",
     broker=redis_url,
     backend=redis_url,
-    include=["app.tasks.ingestion_tasks"],
+    include=["app.tasks.ingestion_tasks", "app.tasks.scheduling_tasks"],
 )
 
 celery_app.conf.update(
@@ -12,6 +12,8 @@ DEFAULT_USER_SETTINGS: dict[str, dict[str, str]] = {
     "timezone": {"value": "UTC", "label": "UTC"},
     "language": {"value": "en", "label": "English"},
     "allow_task_splitting": {"value": "true", "label": "True"},
+    "max_scheduling_weeks": {"value": "12", "label": "12 weeks"},
+    "min_split_minutes": {"value": "0", "label": "No minimum"},
 }
 
 METADATA_SETTINGS: dict[str, SettingMetadata] = {
@@ -40,6 +42,29 @@ METADATA_SETTINGS: dict[str, SettingMetadata] = {
         "option_type": None,
         "options": None,
     },
+    "max_scheduling_weeks": {
+        "type": "string",
+        "description": "How many weeks ahead tasks may be scheduled",
+        "option_type": "static",
+        "options": [
+            {"value": "4", "label": "4 weeks"},
+            {"value": "8", "label": "8 weeks"},
+            {"value": "12", "label": "12 weeks"},
+            {"value": "26", "label": "26 weeks"},
+            {"value": "52", "label": "52 weeks"},
+        ],
+    },
+    "min_split_minutes": {
+        "type": "string",
+        "description": "Shortest part a split task may be scheduled in",
+        "option_type": "static",
+        "options": [
+            {"value": "0", "label": "No minimum"},
+            {"value": "15", "label": "15 minutes"},
+            {"value": "30", "label": "30 minutes"},
+            {"value": "60", "label": "60 minutes"},
+        ],
+    },
     "availability": {
         "type": "schedule",
         "description": "The availability of the user",
@@ -7,6 +7,12 @@ class NotFoundError(ValueError):
     pass
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
 class SystemError(RuntimeError):
     """Raised when a system-level error occurs."""
 
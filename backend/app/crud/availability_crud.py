@@ -4,7 +4,15 @@ from sqlmodel import Session, select
 
 from app.core.exceptions import NotFoundError
 from app.models.availability import DailyWindowModel, WeeklyAvailability
-from app.schemas.availability import DayOfWeek, WeeklyAvailabilityUpdate
+from app.schemas.availability import (
+    DayOfWeek,
+    WeeklyAvailabilityBase,
+    WeeklyAvailabilityUpdate,
+)
+from app.services.availability_cache import (
+    availability_fingerprint,
+    week_expansion_cache,
+)
 
 
 def get_user_availability(user_id: int, session: Session) -> WeeklyAvailability:
@@ -17,6 +25,21 @@ def get_user_availability(user_id: int, session: Session) -> WeeklyAvailability:
     return availability
 
 
+def get_users_availability(
+    user_ids: list[int], session: Session
+) -> list[WeeklyAvailability]:
+    """Get the availability of several users in one query."""
+    if not user_ids:
+        return []
+    return list(
+        session.exec(
+            select(WeeklyAvailability).where(
+                WeeklyAvailability.user_id.in_(user_ids)  # type: ignore[attr-defined]
+            )
+        ).all()
+    )
+
+
 def create_user_availability(user_id: int, session: Session) -> WeeklyAvailability:
     """Create default availability for a user."""
     availability = WeeklyAvailability(user_id=user_id)
@@ -44,6 +67,9 @@ def update_user_availability(
     """Update user availability in the database. Returns the updated model."""
     db_availability: WeeklyAvailability = get_user_availability(user_id, session)
     assert db_availability.id is not None
+    week_expansion_cache.invalidate(
+        availability_fingerprint(WeeklyAvailabilityBase.model_validate(db_availability))
+    )
 
     # Delete existing windows
     for window in db_availability.windows:
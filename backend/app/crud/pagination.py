@@ -0,0 +1,64 @@
+"""Keyset pagination over (sort key, id) with opaque cursors."""
+
+import base64
+import binascii
+import datetime as dt
+import json
+from typing import Any, TypeVar
+
+from sqlalchemy import tuple_
+from sqlmodel import Session
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.exceptions import InvalidCursorError
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: dt.datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the row with this sort key and id."""
+    payload = json.dumps([sort_value.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime, int]:
+    """Sort key and id of a cursor, raising InvalidCursorError if malformed."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(payload)
+        return dt.datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}") from exc
+
+
+def keyset_page(
+    query: SelectOfScalar[T],
+    sort_column: Any,
+    id_column: Any,
+    session: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[T], str | None]:
+    """
+    Rows of query after cursor in (sort_column, id_column) order.
+
+    At most limit rows are returned, together with the cursor of the next
+    page, or None on the last page. The sort column must not be NULL for any
+    row of query.
+    """
+    if cursor is not None:
+        query = query.where(
+            tuple_(sort_column, id_column) > tuple_(*decode_cursor(cursor))
+        )
+    query = query.order_by(sort_column, id_column)
+    rows = list(session.exec(query.limit(limit + 1)).all())
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(
+        getattr(last, sort_column.key), getattr(last, id_column.key)
+    )
@@ -1,34 +1,184 @@
-from sqlmodel import Session, select
+import datetime as dt
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import insert
+from sqlmodel import Session, and_, col, func, or_, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from app.core.exceptions import NotFoundError
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 from app.models.schedule_item import ScheduleItem
 from app.schemas.schedule_item import ScheduleItemCreate
 from app.services.scheduling_types import ScheduleBlock
 
+# Longest schedule item that is still found when it started before the horizon.
+MAX_BUSY_ITEM_SPAN = dt.timedelta(days=31)
+
 
 def get_user_schedule_items(
     user_id: int, session: Session, source: str | None = None
 ) -> list[ScheduleItem]:
+    return list(session.exec(_user_items_query(user_id, source)).all())
+
+
+def get_schedule_item_page(
+    user_id: int,
+    session: Session,
+    source: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[ScheduleItem], str | None]:
+    """
+    One page of the user's schedule items ordered by start_time and id, and
+    the cursor of the next page, see keyset_page.
+    """
+    return keyset_page(
+        _user_items_query(user_id, source),
+        ScheduleItem.start_time,
+        ScheduleItem.id,
+        session,
+        limit,
+        cursor,
+    )
+
+
+def _user_items_query(user_id: int, source: str | None) -> SelectOfScalar[ScheduleItem]:
     query = select(ScheduleItem).where(ScheduleItem.user_id == user_id)
     if source:
         query = query.where(ScheduleItem.source == source)
-    return list(session.exec(query).all())
+    return query
+
+
+def get_schedule_items_in_horizon(
+    user_id: int, start_time: dt.datetime, weeks: int, session: Session
+) -> list[ScheduleItem]:
+    """
+    The user's schedule items overlapping the weeks from start_time, as busy
+    intervals for the scheduler. start_time must be the scheduler's start, so
+    a fixed or replayed clock loads the items of the horizon it schedules.
+
+    Only task_id, start_time and end_time are loaded, into detached
+    ScheduleItems. The start_time range is served by
+    idx_schedule_items_user_start; items that started more than
+    MAX_BUSY_ITEM_SPAN ago are skipped even if they are still running.
+    """
+    window_end = start_time + dt.timedelta(weeks=max(weeks, 1), days=1)
+    rows = session.exec(
+        select(ScheduleItem.task_id, ScheduleItem.start_time, ScheduleItem.end_time)
+        .where(ScheduleItem.user_id == user_id)
+        .where(ScheduleItem.start_time >= start_time - MAX_BUSY_ITEM_SPAN)
+        .where(ScheduleItem.start_time < window_end)
+        .where(ScheduleItem.end_time > start_time)
+    ).all()
+    return [
+        ScheduleItem(
+            user_id=user_id, task_id=task_id, start_time=item_start, end_time=item_end
+        )
+        for task_id, item_start, item_end in rows
+    ]
+
+
+def get_users_schedule_items_in_horizon(
+    horizons: dict[int, tuple[dt.datetime, int]], session: Session
+) -> list[ScheduleItem]:
+    """
+    The schedule items of several users overlapping their horizons, in one
+    query; horizons maps each user to the scheduler's start and the weeks of
+    their horizon.
+
+    Loads the same columns and range as get_schedule_items_in_horizon, plus
+    user_id to group the items by user.
+    """
+    if not horizons:
+        return []
+    users_by_horizon: defaultdict[tuple[dt.datetime, int], list[int]] = defaultdict(
+        list
+    )
+    for user_id, (start_time, weeks) in horizons.items():
+        users_by_horizon[start_time, max(weeks, 1)].append(user_id)
+    rows = session.exec(
+        select(
+            ScheduleItem.user_id,
+            ScheduleItem.task_id,
+            ScheduleItem.start_time,
+            ScheduleItem.end_time,
+        ).where(
+            or_(
+                *(
+                    and_(
+                        col(ScheduleItem.user_id).in_(user_ids),
+                        col(ScheduleItem.start_time) >= start_time - MAX_BUSY_ITEM_SPAN,
+                        col(ScheduleItem.start_time)
+                        < start_time + dt.timedelta(weeks=weeks, days=1),
+                        col(ScheduleItem.end_time) > start_time,
+                    )
+                    for (start_time, weeks), user_ids in users_by_horizon.items()
+                )
+            )
+        )
+    ).all()
+    return [
+        ScheduleItem(
+            user_id=user_id, task_id=task_id, start_time=item_start, end_time=item_end
+        )
+        for user_id, task_id, item_start, item_end in rows
+    ]
+
+
+def get_schedule_item_stats(user_id: int, session: Session) -> tuple[int, int | None]:
+    """Count and highest id of the user's schedule items, without loading them."""
+    count, max_id = session.exec(
+        select(func.count(), func.max(ScheduleItem.id)).where(
+            ScheduleItem.user_id == user_id
+        )
+    ).one()
+    return count, max_id
 
 
 def create_schedule_items(
     schedule_items: list[ScheduleItemCreate], session: Session
 ) -> list[ScheduleItem]:
-    schedule_item_models: list[ScheduleItem] = []
-    for schedule_item in schedule_items:
-        schedule_item_model: ScheduleItem = ScheduleItem.model_validate(schedule_item)
-        schedule_item_models.append(schedule_item_model)
-    session.add_all(schedule_item_models)
-    session.flush()
-    for schedule_item_model in schedule_item_models:
-        session.refresh(schedule_item_model)
+    """Insert schedule items with a multi-row INSERT ... RETURNING, in order."""
+    return _insert_returning(
+        [
+            ScheduleItem.model_validate(schedule_item).model_dump(exclude={"id"})
+            for schedule_item in schedule_items
+        ],
+        session,
+    )
+
+
+def _insert_returning(
+    rows: list[dict[str, Any]], session: Session
+) -> list[ScheduleItem]:
+    """
+    Insert rows and load the created schedule items from the RETURNING clause,
+    batched by insertmanyvalues instead of refreshed one by one.
+    """
+    if not rows:
+        return []
+    schedule_item_models = list(
+        session.scalars(
+            insert(ScheduleItem).returning(ScheduleItem, sort_by_parameter_order=True),
+            rows,
+        )
+    )
     return schedule_item_models
 
 
+def insert_schedule_items(
+    schedule_items: list[ScheduleItemCreate], session: Session
+) -> None:
+    """Insert schedule items with a single executemany, without loading them back."""
+    if not schedule_items:
+        return
+    session.execute(
+        insert(ScheduleItem),
+        [schedule_item.model_dump() for schedule_item in schedule_items],
+    )
+
+
 def get_schedule_item(schedule_item_id: int, session: Session) -> ScheduleItem:
     item = session.get(ScheduleItem, schedule_item_id)
     if item is None:
@@ -40,22 +190,18 @@ def create_schedule_items_from_blocks(
     schedule_blocks: list[ScheduleBlock], user_id: int, session: Session
 ) -> list[ScheduleItem]:
     """Convert schedule blocks to schedule items and save to database."""
-    schedule_items: list[ScheduleItem] = []
-    for block in schedule_blocks:
-        schedule_item: ScheduleItem = ScheduleItem(
-            user_id=user_id,
-            task_id=block.task_id,
-            start_time=block.start_time,
-            end_time=block.end_time,
-            source=block.source,
-            title=block.title,
-            description=block.description,
-        )
-        schedule_items.append(schedule_item)
-        session.add(schedule_item)
-
-    session.flush()
-    for item in schedule_items:
-        session.refresh(item)
-
-    return schedule_items
+    return _insert_returning(
+        [
+            ScheduleItem(
+                user_id=user_id,
+                task_id=block.task_id,
+                start_time=block.start_time,
+                end_time=block.end_time,
+                source=block.source,
+                title=block.title,
+                description=block.description,
+            ).model_dump(exclude={"id"})
+            for block in schedule_blocks
+        ],
+        session,
+    )
@@ -1,10 +1,18 @@
 from sqlmodel import Session, select
 
+from app.core.default_settings import DEFAULT_USER_SETTINGS
 from app.core.exceptions import NotFoundError
+from app.env import get_config
 from app.models.user_setting import UserSetting
 from app.schemas.user import BooleanSettingUpdate, StringSettingUpdate
 from app.services.scheduling_types import SchedulingConfig
 
+# Inclusive bounds of the integer settings, stored values are clamped to them
+_INT_SETTING_BOUNDS: dict[str, tuple[int, int]] = {
+    "max_scheduling_weeks": (1, 104),
+    "min_split_minutes": (0, 240),
+}
+
 
 def get_user_settings(user_id: int, session: Session) -> list[UserSetting]:
     """Get all user settings from the database."""
@@ -36,6 +44,20 @@ def get_bool_setting(user_id: int, key: str, session: Session) -> bool:
     return False if setting.value == "false" else True
 
 
+def get_int_setting(user_id: int, key: str, session: Session) -> int:
+    """Get an integer setting of the user, defaulting if not set."""
+    try:
+        value = get_user_setting(user_id, key, session).value
+    except NotFoundError:
+        value = DEFAULT_USER_SETTINGS[key]["value"]
+    return _parse_int_setting(key, value)
+
+
+def get_max_scheduling_weeks(user_id: int, session: Session) -> int:
+    """Get the user's scheduling horizon limit, defaulting if not set."""
+    return get_int_setting(user_id, "max_scheduling_weeks", session)
+
+
 def update_user_setting(
     user_id: int,
     setting: StringSettingUpdate | BooleanSettingUpdate,
@@ -63,8 +85,76 @@ def update_user_settings(
 def get_schedule_config(user_id: int, session: Session) -> SchedulingConfig:
     """Get the schedule configuration for a user."""
     allow_splitting = get_bool_setting(user_id, "allow_task_splitting", session)
+    return _build_schedule_config(
+        allow_splitting,
+        get_user_timezone(user_id, session),
+        get_max_scheduling_weeks(user_id, session),
+        get_int_setting(user_id, "min_split_minutes", session),
+    )
+
+
+def get_schedule_configs(
+    user_ids: list[int], session: Session
+) -> dict[int, SchedulingConfig]:
+    """Get the schedule configurations of several users in one query."""
+    if not user_ids:
+        return {}
+    values: dict[int, dict[str, str]] = {user_id: {} for user_id in user_ids}
+    for setting in session.exec(
+        select(UserSetting)
+        .where(UserSetting.user_id.in_(user_ids))  # type: ignore[attr-defined]
+        .where(
+            UserSetting.key.in_(  # type: ignore[attr-defined]
+                [
+                    "allow_task_splitting",
+                    "timezone",
+                    "max_scheduling_weeks",
+                    "min_split_minutes",
+                ]
+            )
+        )
+    ).all():
+        values[setting.user_id][setting.key] = setting.value
+
+    return {
+        user_id: _build_schedule_config(
+            user_values.get(
+                "allow_task_splitting",
+                DEFAULT_USER_SETTINGS["allow_task_splitting"]["value"],
+            )
+            != "false",
+            user_values.get("timezone", DEFAULT_USER_SETTINGS["timezone"]["value"]),
+            *(
+                _parse_int_setting(
+                    key, user_values.get(key, DEFAULT_USER_SETTINGS[key]["value"])
+                )
+                for key in ("max_scheduling_weeks", "min_split_minutes")
+            ),
+        )
+        for user_id, user_values in values.items()
+    }
+
+
+def _parse_int_setting(key: str, value: str) -> int:
+    """Parse an integer setting value, falling back to the default."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = int(DEFAULT_USER_SETTINGS[key]["value"])
+    low, high = _INT_SETTING_BOUNDS[key]
+    return min(max(number, low), high)
+
+
+def _build_schedule_config(
+    allow_splitting: bool,
+    timezone: str,
+    max_scheduling_weeks: int,
+    min_split_minutes: int,
+) -> SchedulingConfig:
     return SchedulingConfig(
-        max_scheduling_weeks=12,  # TODO: Make this configurable
+        max_scheduling_weeks=max_scheduling_weeks,
         allow_splitting=allow_splitting,
-        timezone=get_user_timezone(user_id, session),
+        min_split_minutes=min_split_minutes,
+        timezone=timezone,
+        search_budget_ms=get_config().SCHEDULER_SEARCH_BUDGET_MS,
     )
@@ -1,51 +1,128 @@
 import datetime as dt
+from collections.abc import Callable
+from typing import Any, Literal
 
-from sqlmodel import Session, select
+from sqlalchemy import delete, insert, update
+from sqlmodel import Session, col, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from app.core.exceptions import NotFoundError
 from app.core.timezone import now_utc
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 from app.models.task import Task
 from app.schemas.task import TaskCreate, TasksDelete, TaskUpdate
 
+TaskList = Literal["drafts", "unscheduled", "scheduled", "completed"]
 
-def get_drafts(user_id: int, session: Session) -> list[Task]:
-    return list(
-        session.exec(
-            select(Task).where(Task.user_id == user_id).where(Task.committed_at == None)
-        ).all()
+
+def _drafts_query(user_id: int) -> SelectOfScalar[Task]:
+    return (
+        select(Task)
+        .where(Task.user_id == user_id)
+        .where(col(Task.committed_at).is_(None))
+    )
+
+
+def _unscheduled_query(user_id: int) -> SelectOfScalar[Task]:
+    return (
+        select(Task)
+        .where(Task.user_id == user_id)
+        .where(col(Task.committed_at).is_not(None))
+        .where(col(Task.scheduled_at).is_(None))
     )
 
 
+def _scheduled_query(user_id: int) -> SelectOfScalar[Task]:
+    return (
+        select(Task)
+        .where(Task.user_id == user_id)
+        .where(col(Task.scheduled_at).is_not(None))
+        .where(col(Task.completed_at).is_(None))
+    )
+
+
+def _completed_query(user_id: int) -> SelectOfScalar[Task]:
+    return (
+        select(Task)
+        .where(Task.user_id == user_id)
+        .where(col(Task.completed_at).is_not(None))
+    )
+
+
+# Query and keyset sort column of every task list, see get_task_page.
+_TASK_LISTS: dict[TaskList, tuple[Callable[[int], SelectOfScalar[Task]], Any]] = {
+    "drafts": (_drafts_query, Task.created_at),
+    "unscheduled": (_unscheduled_query, Task.created_at),
+    "scheduled": (_scheduled_query, Task.scheduled_at),
+    "completed": (_completed_query, Task.completed_at),
+}
+
+
+def get_drafts(user_id: int, session: Session) -> list[Task]:
+    return list(session.exec(_drafts_query(user_id)).all())
+
+
 def get_unscheduled_tasks(user_id: int, session: Session) -> list[Task]:
+    return list(session.exec(_unscheduled_query(user_id)).all())
+
+
+def get_task_page(
+    user_id: int,
+    task_list: TaskList,
+    session: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[Task], str | None]:
+    """
+    One page of a task list and the cursor of the next page, see keyset_page.
+
+    Drafts and unscheduled tasks are ordered by created_at, scheduled tasks by
+    scheduled_at and completed tasks by completed_at, ties by id; each order is
+    served by an index on (user_id, sort column, id).
+    """
+    query, sort_column = _TASK_LISTS[task_list]
+    return keyset_page(query(user_id), sort_column, Task.id, session, limit, cursor)
+
+
+def get_users_unscheduled_tasks(user_ids: list[int], session: Session) -> list[Task]:
+    """Get the unscheduled tasks of several users in one query."""
+    if not user_ids:
+        return []
     return list(
         session.exec(
             select(Task)
-            .where(Task.user_id == user_id)
-            .where(Task.committed_at != None)
-            .where(Task.scheduled_at == None)
+            .where(Task.user_id.in_(user_ids))  # type: ignore[attr-defined]
+            .where(col(Task.committed_at).is_not(None))
+            .where(col(Task.scheduled_at).is_(None))
         ).all()
     )
 
 
-def get_scheduled_tasks(user_id: int, session: Session) -> list[Task]:
-    """Get tasks that are scheduled but not completed."""
+def get_user_ids_with_unscheduled_tasks(
+    session: Session, after_user_id: int = 0, limit: int = 500
+) -> list[int]:
+    """Get the next page of user ids with unscheduled tasks, ordered by id."""
     return list(
         session.exec(
-            select(Task)
-            .where(Task.user_id == user_id)
-            .where(Task.scheduled_at != None)
-            .where(Task.completed_at == None)
+            select(Task.user_id)
+            .where(Task.user_id > after_user_id)
+            .where(col(Task.committed_at).is_not(None))
+            .where(col(Task.scheduled_at).is_(None))
+            .distinct()
+            .order_by(Task.user_id)  # type: ignore[arg-type]
+            .limit(limit)
         ).all()
     )
 
 
+def get_scheduled_tasks(user_id: int, session: Session) -> list[Task]:
+    """Get tasks that are scheduled but not completed."""
+    return list(session.exec(_scheduled_query(user_id)).all())
+
+
 def get_completed_tasks(user_id: int, session: Session) -> list[Task]:
     """Get tasks that are completed."""
-    return list(
-        session.exec(
-            select(Task).where(Task.user_id == user_id).where(Task.completed_at != None)
-        ).all()
-    )
+    return list(session.exec(_completed_query(user_id)).all())
 
 
 def get_tasks_by_ids(task_ids: list[int], user_id: int, session: Session) -> list[Task]:
@@ -66,19 +143,35 @@ def update_tasks_scheduled_at(
     user_id: int,
     session: Session,
 ) -> None:
-    """Update scheduled_at for multiple tasks. task_scheduled_times maps task_id to scheduled_at datetime."""
+    """
+    Set scheduled_at for the user's tasks with a single UPDATE.
+
+    task_scheduled may repeat ids, split tasks have a block per part. Raises
+    NotFoundError for the first id that is not a task of the user.
+    """
     if not task_scheduled:
         return
 
-    for task_id in task_scheduled:
-        task = session.exec(
-            select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
-        ).one_or_none()
-        if not task:
-            raise NotFoundError(f"Task with id {task_id} not found")
-        task.scheduled_at = scheduled_at
-        session.add(task)
-    session.flush()
+    task_ids = list(dict.fromkeys(task_scheduled))
+    updated_ids = set(
+        session.execute(
+            update(Task)
+            .where(Task.user_id == user_id)  # type: ignore[arg-type]
+            .where(Task.id.in_(task_ids))  # type: ignore[union-attr]
+            .values(scheduled_at=scheduled_at)
+            .returning(Task.id)  # type: ignore[call-overload]
+        ).scalars()
+    )
+    _raise_missing(task_ids, updated_ids)
+
+
+def _raise_missing(task_ids: list[int], found_ids: set[int]) -> None:
+    """Raise NotFoundError for the first of task_ids not in found_ids."""
+    missing_id = next(
+        (task_id for task_id in task_ids if task_id not in found_ids), None
+    )
+    if missing_id is not None:
+        raise NotFoundError(f"Task with id {missing_id} not found")
 
 
 def create_task(task: TaskCreate, user_id: int, session: Session) -> Task:
@@ -91,15 +184,25 @@ def create_task(task: TaskCreate, user_id: int, session: Session) -> Task:
 
 
 def create_tasks(tasks: list[TaskCreate], user_id: int, session: Session) -> list[Task]:
-    task_models: list[Task] = []
+    """
+    Insert tasks with a multi-row INSERT ... RETURNING, in the given order.
+
+    The created rows come back from the INSERT itself, so no per-row refresh
+    is needed.
+    """
+    if not tasks:
+        return []
+
+    rows: list[dict[str, Any]] = []
     for task in tasks:
         task_model: Task = Task.model_validate(task)
         task_model.user_id = user_id
-        task_models.append(task_model)
-    session.add_all(task_models)
-    session.flush()
-    for task_model in task_models:
-        session.refresh(task_model)
+        rows.append(task_model.model_dump(exclude={"id"}))
+    task_models = list(
+        session.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True), rows
+        )
+    )
     return task_models
 
 
@@ -114,14 +217,24 @@ def delete_task(task_id: int, user_id: int, session: Session) -> None:
 
 
 def delete_tasks(tasks_delete: TasksDelete, user_id: int, session: Session) -> None:
-    for task_id in tasks_delete.task_ids:
-        task = session.exec(
-            select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
-        ).one_or_none()
-        if not task:
-            raise NotFoundError(f"Task with id {task_id} not found")
-        session.delete(task)
-    session.flush()
+    """
+    Delete the user's tasks with a single DELETE.
+
+    Raises NotFoundError for the first id that is not a task of the user.
+    """
+    if not tasks_delete.task_ids:
+        return
+
+    task_ids = list(dict.fromkeys(tasks_delete.task_ids))
+    deleted_ids = set(
+        session.execute(
+            delete(Task)
+            .where(Task.user_id == user_id)  # type: ignore[arg-type]
+            .where(Task.id.in_(task_ids))  # type: ignore[union-attr]
+            .returning(Task.id)  # type: ignore[call-overload]
+        ).scalars()
+    )
+    _raise_missing(task_ids, deleted_ids)
 
 
 def update_task(
@@ -163,6 +276,9 @@ def deschedule_tasks(task_ids: list[int], user_id: int, session: Session) -> Non
     """
     Deschedule tasks by setting scheduled_at to None and deleting their schedule items.
 
+    Issues one UPDATE for the tasks and one DELETE for their schedule items;
+    ids that are not tasks of the user are ignored.
+
     Args:
         task_ids: List of task IDs to deschedule
         user_id: User ID to ensure ownership
@@ -173,27 +289,21 @@ def deschedule_tasks(task_ids: list[int], user_id: int, session: Session) -> Non
 
     from app.models.schedule_item import ScheduleItem
 
-    tasks = session.exec(
-        select(Task)
-        .where(Task.id.in_(task_ids))  # type: ignore[union-attr]
-        .where(Task.user_id == user_id)
-    ).all()
-
-    if not tasks:
+    descheduled_ids = list(
+        session.execute(
+            update(Task)
+            .where(Task.user_id == user_id)  # type: ignore[arg-type]
+            .where(Task.id.in_(set(task_ids)))  # type: ignore[union-attr]
+            .values(scheduled_at=None)
+            .returning(Task.id)  # type: ignore[call-overload]
+        ).scalars()
+    )
+    if not descheduled_ids:
         return
 
-    schedule_items = session.exec(
-        select(ScheduleItem)
-        .where(ScheduleItem.task_id.in_(task_ids))  # type: ignore[union-attr]
-        .where(ScheduleItem.user_id == user_id)
-        .where(ScheduleItem.source == "task")
-    ).all()
-
-    for schedule_item in schedule_items:
-        session.delete(schedule_item)
-
-    for task in tasks:
-        task.scheduled_at = None
-        session.add(task)
-
-    session.flush()
+    session.execute(
+        delete(ScheduleItem)
+        .where(ScheduleItem.user_id == user_id)  # type: ignore[arg-type]
+        .where(ScheduleItem.task_id.in_(descheduled_ids))  # type: ignore[union-attr]
+        .where(ScheduleItem.source == "task")  # type: ignore[arg-type]
+    )
@@ -11,6 +11,11 @@ class EnvConfig(BaseSettings):
     )
 
     IS_LOCAL: bool = False
+    SCHEDULER_DIAGNOSTICS_LOG: bool = False
+    SCHEDULER_SEARCH_BUDGET_MS: int = 0
+    SCHEDULE_CACHE_REDIS_URL: str | None = None
+    SCHEDULE_CAPTURE_DIR: str | None = None
+    SCHEDULE_CAPTURE_SAMPLE_RATE: float = 1.0
 
 
 def get_config() -> EnvConfig:
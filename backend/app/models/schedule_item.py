@@ -10,7 +10,9 @@ from app.core.timezone import convert_model_datetimes_to_utc, now_utc
 
 class ScheduleItem(SQLModel, table=True):
     __tablename__ = "schedule_items"  # type: ignore[assignment]
-    __table_args__ = (Index("idx_schedule_items_user_start", "user_id", "start_time"),)
+    __table_args__ = (
+        Index("idx_schedule_items_user_start", "user_id", "start_time", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", nullable=False)
@@ -2,7 +2,7 @@ import datetime as dt
 from typing import Any
 
 from pydantic import model_validator
-from sqlalchemy import JSON, Column, DateTime, func
+from sqlalchemy import JSON, Column, DateTime, Index, func
 from sqlmodel import Field, SQLModel
 
 from app.core.timezone import convert_model_datetimes_to_utc, now_utc
@@ -10,6 +10,11 @@ from app.core.timezone import convert_model_datetimes_to_utc, now_utc
 
 class Task(SQLModel, table=True):
     __tablename__ = "tasks"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("idx_tasks_user_created", "user_id", "created_at", "id"),
+        Index("idx_tasks_user_scheduled", "user_id", "scheduled_at", "id"),
+        Index("idx_tasks_user_completed", "user_id", "completed_at", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(default=None, foreign_key="users.id", index=True)
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.task import IngestTaskResponse
 
@@ -23,3 +23,27 @@ class CeleryJobBase(BaseModel):
 
 class IngestTaskJob(CeleryJobBase):
     result: IngestTaskResponse | None = None
+
+
+class UserScheduleResult(BaseModel):
+    user_id: int
+    scheduled_blocks: int = 0
+    unscheduled_tasks: int = 0
+    duration_ms: float = 0.0
+    error: str | None = None
+    skip_reason: str | None = None
+
+
+class BatchScheduleReport(BaseModel):
+    users: list[UserScheduleResult] = Field(default_factory=lambda: [])
+    duration_ms: float = 0.0
+
+    @property
+    def failed_user_ids(self) -> list[int]:
+        return [result.user_id for result in self.users if result.error is not None]
+
+    @property
+    def skipped_user_ids(self) -> list[int]:
+        return [
+            result.user_id for result in self.users if result.skip_reason is not None
+        ]
@@ -3,9 +3,10 @@ Pydantic schemas for schedule-related API endpoints.
 Only essential schemas - no duplication of existing models.
 """
 
-from pydantic import BaseModel, Field
+import pytz  # type: ignore[import-untyped]
+from pydantic import BaseModel, Field, field_validator
 
-from app.services.scheduling_types import ScheduleBlock
+from app.services.scheduling_types import PlacementMode, ScheduleBlock
 
 
 class ScheduleGenerateRequest(BaseModel):
@@ -13,15 +14,44 @@ class ScheduleGenerateRequest(BaseModel):
 
     task_ids: list[int] = Field(..., description="List of task IDs to schedule")
     preview: bool = Field(
-        default=True, description="Whether to preview without committing"
+        default=False,
+        description="Store the schedule as a preview instead of committing it",
     )
 
 
 class ScheduleCommitRequest(BaseModel):
     """Request schema for committing a generated schedule."""
 
-    schedule_blocks: list[ScheduleBlock] = Field(
-        ..., description="Generated schedule blocks to commit"
+    preview_id: str = Field(
+        ..., description="Id of the preview returned by the generate endpoint"
+    )
+
+
+class ScheduleVariant(BaseModel):
+    """Overrides of the user's scheduling configuration for one variant."""
+
+    allow_splitting: bool | None = None
+    max_scheduling_weeks: int | None = Field(default=None, ge=1, le=104)
+    timezone: str | None = None
+    placement: PlacementMode | None = None
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v: str | None) -> str | None:
+        if v is not None and v not in pytz.all_timezones_set:
+            raise ValueError(f"Unknown timezone: {v}")
+        return v
+
+
+class ScheduleCompareRequest(BaseModel):
+    """Request schema for comparing scheduling configurations."""
+
+    task_ids: list[int] | None = Field(
+        default=None,
+        description="Task IDs to schedule, all unscheduled tasks if omitted",
+    )
+    variants: list[ScheduleVariant] = Field(
+        ..., min_length=1, max_length=8, description="Configurations to compare"
     )
 
 
@@ -0,0 +1,235 @@
+"""Time-budgeted scheduler that improves the greedy plan by local search."""
+
+import datetime as dt
+import random
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from typing import NamedTuple, TypeVar
+
+from app.models.availability import WeeklyAvailability
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.scheduling_types import (
+    BusyIntervalIndex,
+    CapacityProfile,
+    PendingTask,
+    PlacedBlock,
+    SchedulableTask,
+    ScheduleBlock,
+    SchedulingConfig,
+    SchedulingRequest,
+    SchedulingResponse,
+    TimeSlot,
+)
+
+T = TypeVar("T")
+
+
+class PlanScore(NamedTuple):
+    """Quality of a plan, compared lexicographically; lower is better."""
+
+    late_tasks: int
+    unscheduled_minutes: int
+    splits: int
+
+
+class _Budget:
+    """Wall-clock cut-off of one scheduling run."""
+
+    def __init__(self, budget_ms: int):
+        self.ends_at = time.perf_counter() + budget_ms / 1000
+        self.expired = False
+
+    def exhausted(self) -> bool:
+        if time.perf_counter() >= self.ends_at:
+            self.expired = True
+        return self.expired
+
+    def guard(self, items: Iterable[T]) -> Iterator[T]:
+        """Yield items until the budget is used up."""
+        for item in items:
+            if self.exhausted():
+                return
+            yield item
+
+
+class AnytimeScheduler:
+    """
+    Anytime implementation of ChronoScheduler protocol.
+
+    Starts from the greedy plan and, within config.search_budget_ms of wall
+    time, searches for a better one by moving tasks that end past their
+    deadline, are split or stay unscheduled to other positions of the placement
+    order. A candidate is only kept if it lowers the PlanScore. The budget is
+    checked before every slot a candidate takes, so a search running into it
+    is abandoned and the best plan found so far is returned. EDF placement
+    orders the tasks itself, so there is nothing to search with it.
+    """
+
+    def __init__(self, greedy: GreedyScheduler | None = None, seed: int = 0):
+        self.greedy = greedy or GreedyScheduler()
+        self.seed = seed
+
+    def schedule_tasks(
+        self,
+        tasks: list[Task],
+        schedule_items: list[ScheduleItem],
+        availability: WeeklyAvailability,
+        config: SchedulingConfig,
+    ) -> SchedulingResponse:
+        """
+        Schedule tasks, improving the greedy plan until the budget runs out.
+
+        Args:
+            tasks: List of tasks to schedule
+            schedule_items: Existing schedule items (busy intervals)
+            availability: User's weekly availability
+            config: Scheduling configuration, search_budget_ms bounds the search
+
+        Returns:
+            SchedulingResponse with schedule blocks and warnings as unscheduled tasks
+        """
+        if not tasks:
+            return SchedulingResponse(
+                schedule_blocks=[],
+                warnings=[],
+            )
+
+        request = self.greedy.build_request(tasks, schedule_items, availability, config)
+        response = self._schedule(request)
+        if self.greedy.recorder is not None:
+            self.greedy.recorder.record(request, response)
+        return response
+
+    def _schedule(self, request: SchedulingRequest) -> SchedulingResponse:
+        """Internal method: Greedy pass followed by the budgeted local search."""
+        started = time.perf_counter()
+        budget = _Budget(request.config.search_budget_ms)
+        response = self.greedy._schedule(request)
+        if (
+            request.config.search_budget_ms <= 0
+            or request.config.placement == "edf"
+            or not request.tasks
+        ):
+            return response
+
+        deadlines = {task.id: task.deadline for task in request.tasks if task.deadline}
+        order = self.greedy._rank_tasks(request.tasks, request.start_time)
+        best_score, problem_ids = self._score(
+            response.schedule_blocks, response.warnings, deadlines
+        )
+        best: tuple[list[PlacedBlock], list[PendingTask], int] | None = None
+        iterations = 0
+
+        slots: list[TimeSlot] = []
+        if problem_ids:
+            slots = list(budget.guard(self._horizon_slots(request)))
+        rng = random.Random(self.seed)
+        while problem_ids and not budget.exhausted():
+            candidate_order = self._move_problem_task(order, problem_ids, rng)
+            capacity = CapacityProfile(budget.guard(slots))
+            placed_blocks, remaining_tasks = self.greedy._place_pending_tasks(
+                [PendingTask.from_schedulable(task) for task in candidate_order],
+                capacity,
+                request.config.allow_splitting,
+                min_split_minutes=request.config.min_split_minutes,
+            )
+            if budget.expired:
+                break
+            placed_blocks = self.greedy._coalesce_blocks(placed_blocks)
+            iterations += 1
+            score, candidate_problems = self._score(
+                placed_blocks, remaining_tasks, deadlines
+            )
+            if score < best_score:
+                order = candidate_order
+                best = (
+                    placed_blocks,
+                    remaining_tasks,
+                    self.greedy._weeks_reached(request.start_time, capacity),
+                )
+                best_score, problem_ids = score, candidate_problems
+
+        if best is not None:
+            response = response.model_copy(
+                update={
+                    "schedule_blocks": [block.to_schedule_block() for block in best[0]],
+                    "warnings": [task.to_schedulable() for task in best[1]],
+                    "horizon_weeks": best[2],
+                }
+            )
+        if response.diagnostics is not None:
+            response.diagnostics.add_time("search", time.perf_counter() - started)
+            response.diagnostics.increment("search_iterations", iterations)
+            response.diagnostics.counts["schedule_blocks"] = len(
+                response.schedule_blocks
+            )
+            response.diagnostics.counts["unscheduled_tasks"] = len(response.warnings)
+        return response
+
+    def _horizon_slots(self, request: SchedulingRequest) -> Iterator[TimeSlot]:
+        """Internal method: Lazily yield every free slot of the horizon."""
+        windows = self.greedy._expand_availability_windows(
+            request.scheduler_availability,
+            request.start_time,
+            self.greedy._horizon_end(request.start_time, request.config),
+            request.config.timezone,
+        )
+        return self.greedy._free_slots(
+            windows,
+            BusyIntervalIndex(request.busy_intervals),
+            request.config.slot_engine,
+        )
+
+    def _score(
+        self,
+        blocks: Sequence[ScheduleBlock | PlacedBlock],
+        unscheduled: Sequence[SchedulableTask | PendingTask],
+        deadlines: dict[int, dt.datetime],
+    ) -> tuple[PlanScore, set[int]]:
+        """
+        Internal method: Score a plan and collect the ids of the tasks that
+        are late, split or (partly) unscheduled.
+        """
+        late_ids: set[int] = set()
+        block_counts: dict[int, int] = {}
+        for block in blocks:
+            block_counts[block.task_id] = block_counts.get(block.task_id, 0) + 1
+            deadline = deadlines.get(block.task_id)
+            if deadline is not None and block.end_time > deadline:
+                late_ids.add(block.task_id)
+        unscheduled_ids = {task.id for task in unscheduled}
+        late_ids.update(task_id for task_id in unscheduled_ids if task_id in deadlines)
+        split_ids = {task_id for task_id, count in block_counts.items() if count > 1}
+
+        score = PlanScore(
+            late_tasks=len(late_ids),
+            unscheduled_minutes=sum(
+                task.expected_duration_minutes for task in unscheduled
+            ),
+            splits=sum(block_counts.values()) - len(block_counts),
+        )
+        return score, late_ids | unscheduled_ids | split_ids
+
+    def _move_problem_task(
+        self,
+        order: list[SchedulableTask],
+        problem_ids: set[int],
+        rng: random.Random,
+    ) -> list[SchedulableTask]:
+        """
+        Internal method: Move a random problem task to a random position,
+        earlier in the order with even odds.
+        """
+        positions = [
+            index for index, task in enumerate(order) if task.id in problem_ids
+        ]
+        source = rng.choice(positions)
+        if source > 0 and rng.random() < 0.5:
+            target = rng.randrange(source)
+        else:
+            target = rng.randrange(len(order))
+        candidate = list(order)
+        candidate.insert(target, candidate.pop(source))
+        return candidate
@@ -0,0 +1,104 @@
+"""Process-wide cache of weekly availability expanded to UTC windows."""
+
+import datetime as dt
+import threading
+from collections import OrderedDict
+
+from app.core.timezone import parse_user_datetime
+from app.schemas.availability import WeeklyAvailabilityBase
+
+AvailabilityFingerprint = tuple[tuple[int, dt.time, dt.time], ...]
+ExpandedWindow = tuple[dt.date, dt.datetime, dt.datetime]
+WeekKey = tuple[AvailabilityFingerprint, str, dt.date]
+
+MAX_CACHED_WEEKS = 4096
+
+
+def availability_fingerprint(
+    availability: WeeklyAvailabilityBase,
+) -> AvailabilityFingerprint:
+    """Hashable, order-independent summary of the availability windows."""
+    return tuple(
+        sorted(
+            (int(day), window.start, window.end)
+            for day, windows in availability.windows.items()
+            for window in windows
+        )
+    )
+
+
+class WeekExpansionCache:
+    """
+    LRU cache of UTC availability windows per (fingerprint, timezone, week).
+
+    Every day of a week is localized on its own date, so weeks containing a DST
+    transition are expanded with the offsets that apply before and after it.
+    Entries are keyed by the concrete week start, never reused across weeks.
+    """
+
+    def __init__(self, max_weeks: int = MAX_CACHED_WEEKS):
+        self._max_weeks = max_weeks
+        self._weeks: OrderedDict[WeekKey, tuple[ExpandedWindow, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_week(
+        self,
+        fingerprint: AvailabilityFingerprint,
+        user_timezone: str,
+        week_start: dt.date,
+    ) -> tuple[ExpandedWindow, ...]:
+        """Return the UTC windows of the week starting on week_start (a Monday)."""
+        key: WeekKey = (fingerprint, user_timezone, week_start)
+        with self._lock:
+            cached = self._weeks.get(key)
+            if cached is not None:
+                self._weeks.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        expanded = self._expand_week(fingerprint, user_timezone, week_start)
+        with self._lock:
+            self.misses += 1
+            self._weeks[key] = expanded
+            while len(self._weeks) > self._max_weeks:
+                self._weeks.popitem(last=False)
+        return expanded
+
+    def invalidate(self, fingerprint: AvailabilityFingerprint) -> None:
+        """Drop every cached week expanded from the given availability."""
+        with self._lock:
+            for key in [key for key in self._weeks if key[0] == fingerprint]:
+                del self._weeks[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._weeks.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _expand_week(
+        self,
+        fingerprint: AvailabilityFingerprint,
+        user_timezone: str,
+        week_start: dt.date,
+    ) -> tuple[ExpandedWindow, ...]:
+        expanded: list[ExpandedWindow] = []
+        for day, start, end in fingerprint:
+            current_date = week_start + dt.timedelta(days=day)
+            expanded.append(
+                (
+                    current_date,
+                    parse_user_datetime(
+                        dt.datetime.combine(current_date, start), user_timezone
+                    ),
+                    parse_user_datetime(
+                        dt.datetime.combine(current_date, end), user_timezone
+                    ),
+                )
+            )
+        return tuple(expanded)
+
+
+week_expansion_cache = WeekExpansionCache()
@@ -0,0 +1,275 @@
+"""
+Batch scheduling of many users' unscheduled tasks.
+
+Users are streamed in chunks by id. The inputs of a chunk are loaded with one
+query per table, each user is scheduled in a process pool, and the results are
+written back with bulk statements and committed per chunk, so a failing chunk
+or a crashing worker only costs the users involved.
+"""
+
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from sqlmodel import Session
+
+from app.core.timezone import now_utc
+from app.crud.availability_crud import get_users_availability
+from app.crud.schedule_item_crud import (
+    get_users_schedule_items_in_horizon,
+    insert_schedule_items,
+)
+from app.crud.setting_crud import get_schedule_configs
+from app.crud.task_crud import (
+    get_user_ids_with_unscheduled_tasks,
+    get_users_unscheduled_tasks,
+    update_tasks_scheduled_at,
+)
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.schemas.job import BatchScheduleReport, UserScheduleResult
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.schedule_result_cache import schedule_result_cache
+from app.services.scheduling_types import SchedulingRequest, SchedulingResponse
+from app.services.scheduling_utils import schedule_blocks_to_schedule_items
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+def iter_user_id_chunks(
+    session: Session, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[list[int]]:
+    """Yield the ids of users with unscheduled tasks, chunk_size at a time."""
+    last_user_id = 0
+    while True:
+        user_ids = get_user_ids_with_unscheduled_tasks(
+            session, after_user_id=last_user_id, limit=chunk_size
+        )
+        if not user_ids:
+            return
+        yield user_ids
+        last_user_id = user_ids[-1]
+
+
+def load_scheduling_requests(
+    user_ids: list[int], session: Session
+) -> tuple[dict[int, SchedulingRequest], list[UserScheduleResult]]:
+    """
+    Build the SchedulingRequest of every user that has unscheduled tasks and
+    availability, and a skipped UserScheduleResult for every other user.
+
+    Only the schedule items overlapping each user's horizon, anchored on the
+    scheduler's start time, are loaded as busy intervals.
+    """
+    scheduler = GreedyScheduler()
+    tasks: defaultdict[int, list[Task]] = defaultdict(list)
+    for task in get_users_unscheduled_tasks(user_ids, session):
+        tasks[task.user_id].append(task)
+    configs = get_schedule_configs(user_ids, session)
+    schedule_items: defaultdict[int, list[ScheduleItem]] = defaultdict(list)
+    for schedule_item in get_users_schedule_items_in_horizon(
+        {
+            user_id: (
+                scheduler._start_time(configs[user_id]),
+                configs[user_id].max_scheduling_weeks,
+            )
+            for user_id in user_ids
+        },
+        session,
+    ):
+        schedule_items[schedule_item.user_id].append(schedule_item)
+    availabilities = {
+        availability.user_id: availability
+        for availability in get_users_availability(user_ids, session)
+    }
+
+    requests: dict[int, SchedulingRequest] = {}
+    skipped: list[UserScheduleResult] = []
+    for user_id in user_ids:
+        if not tasks[user_id]:
+            skipped.append(
+                UserScheduleResult(user_id=user_id, skip_reason="no unscheduled tasks")
+            )
+        elif user_id not in availabilities:
+            skipped.append(
+                UserScheduleResult(user_id=user_id, skip_reason="no availability")
+            )
+        else:
+            requests[user_id] = scheduler.build_request(
+                tasks[user_id],
+                schedule_items[user_id],
+                availabilities[user_id],
+                configs[user_id],
+            )
+    return requests, skipped
+
+
+def schedule_request(
+    request: SchedulingRequest,
+) -> tuple[SchedulingResponse, float]:
+    """Schedule one request, returning the response and the time it took in ms."""
+    started = time.perf_counter()
+    response = GreedyScheduler()._schedule(request)
+    return response, (time.perf_counter() - started) * 1000
+
+
+def schedule_all_users(
+    session: Session,
+    max_workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BatchScheduleReport:
+    """
+    Schedule the unscheduled tasks of every user and save the results.
+
+    Args:
+        session: Database session, committed after every chunk
+        max_workers: Size of the process pool, None for one per CPU and 0 to
+            schedule in the calling process
+        chunk_size: Number of users loaded and written back together
+
+    Returns:
+        BatchScheduleReport with a result per user, including skipped users
+    """
+    started = time.perf_counter()
+    report = BatchScheduleReport()
+    executor = _new_executor(max_workers)
+    try:
+        for user_ids in iter_user_id_chunks(session, chunk_size):
+            requests, skipped = load_scheduling_requests(user_ids, session)
+            results, executor = _schedule_chunk(requests, executor, max_workers)
+            report.users.extend(_save_chunk(results, session))
+            report.users.extend(skipped)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report.duration_ms = (time.perf_counter() - started) * 1000
+    return report
+
+
+ChunkResult = tuple[UserScheduleResult, SchedulingResponse | None]
+
+
+def _new_executor(max_workers: int | None) -> ProcessPoolExecutor | None:
+    if max_workers == 0:
+        return None
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _schedule_chunk(
+    requests: dict[int, SchedulingRequest],
+    executor: ProcessPoolExecutor | None,
+    max_workers: int | None,
+) -> tuple[list[ChunkResult], ProcessPoolExecutor | None]:
+    """
+    Schedule a chunk of requests, returning the results and the executor to
+    keep using.
+
+    A crashing worker breaks the whole pool, so the users whose futures failed
+    with BrokenProcessPool are retried one at a time in fresh pools; only the
+    user that crashes again is reported as failed.
+    """
+    if executor is None:
+        return [
+            _run_inline(user_id, request) for user_id, request in requests.items()
+        ], None
+
+    futures = {
+        user_id: executor.submit(schedule_request, request)
+        for user_id, request in requests.items()
+    }
+    results: list[ChunkResult] = []
+    crashed: list[int] = []
+    for user_id, future in futures.items():
+        result = _collect(user_id, future)
+        if result is None:
+            crashed.append(user_id)
+        else:
+            results.append(result)
+
+    broken = bool(crashed)
+    for user_id in crashed:
+        if broken:
+            executor.shutdown(wait=False)
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        result = _collect(user_id, executor.submit(schedule_request, requests[user_id]))
+        broken = result is None
+        results.append(
+            result
+            or (UserScheduleResult(user_id=user_id, error="worker crashed"), None)
+        )
+    if broken:
+        executor.shutdown(wait=False)
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    return results, executor
+
+
+def _collect(
+    user_id: int, future: Future[tuple[SchedulingResponse, float]]
+) -> ChunkResult | None:
+    """Result of a future, or None if its worker process died."""
+    try:
+        return _result(user_id, *future.result())
+    except BrokenProcessPool:
+        return None
+    except Exception as exc:
+        return UserScheduleResult(user_id=user_id, error=repr(exc)), None
+
+
+def _run_inline(user_id: int, request: SchedulingRequest) -> ChunkResult:
+    try:
+        return _result(user_id, *schedule_request(request))
+    except Exception as exc:
+        return UserScheduleResult(user_id=user_id, error=repr(exc)), None
+
+
+def _result(
+    user_id: int, response: SchedulingResponse, duration_ms: float
+) -> ChunkResult:
+    return (
+        UserScheduleResult(
+            user_id=user_id,
+            scheduled_blocks=len(response.schedule_blocks),
+            unscheduled_tasks=len(response.warnings),
+            duration_ms=duration_ms,
+        ),
+        response,
+    )
+
+
+def _save_chunk(
+    results: list[ChunkResult], session: Session
+) -> list[UserScheduleResult]:
+    """Write the schedule blocks of a chunk back and commit them together."""
+    scheduled_at = now_utc()
+    try:
+        for result, response in results:
+            if response is None:
+                continue
+            insert_schedule_items(
+                schedule_blocks_to_schedule_items(
+                    response.schedule_blocks, result.user_id
+                ),
+                session,
+            )
+            update_tasks_scheduled_at(
+                [block.task_id for block in response.schedule_blocks],
+                scheduled_at,
+                result.user_id,
+                session,
+            )
+        session.commit()
+    except Exception as exc:
+        session.rollback()
+        return [
+            result
+            if response is None
+            else result.model_copy(update={"error": f"save failed: {exc!r}"})
+            for result, response in results
+        ]
+    for result, response in results:
+        if response is not None:
+            schedule_result_cache.invalidate(result.user_id)
+    return [result for result, _ in results]
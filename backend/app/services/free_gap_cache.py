@@ -0,0 +1,103 @@
+"""Process-wide cache of per-user free-slot structures for incremental scheduling."""
+
+import datetime as dt
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from app.core.timezone import get_next_half_hour, get_next_weekday, now_user_timezone
+from app.schemas.availability import DayOfWeek, WeeklyAvailabilityBase
+from app.services.availability_cache import (
+    AvailabilityFingerprint,
+    availability_fingerprint,
+)
+from app.services.scheduling_types import FreeGapIndex, SchedulingConfig
+
+MAX_CACHED_USERS = 1024
+
+
+class PlanSignature(NamedTuple):
+    """Everything a user's free slots are derived from."""
+
+    availability: AvailabilityFingerprint
+    config: str
+    horizon_week: dt.date
+    item_count: int
+    max_item_id: int | None
+
+
+def plan_signature(
+    availability: WeeklyAvailabilityBase,
+    config: SchedulingConfig,
+    item_count: int,
+    max_item_id: int | None,
+) -> PlanSignature:
+    """
+    Signature of the free slots for the given inputs at the current time.
+
+    Schedule items are only ever inserted or deleted, never moved, so their
+    count and highest id are enough to notice any change to them. The week the
+    horizon starts in is part of the signature, so a structure is rebuilt once
+    its horizon would be cut short.
+    """
+    start_time = get_next_half_hour(now_user_timezone(config.timezone))
+    return PlanSignature(
+        availability=availability_fingerprint(availability),
+        config=config.model_dump_json(),
+        horizon_week=get_next_weekday(start_time, weekday=DayOfWeek.MON).date(),
+        item_count=item_count,
+        max_item_id=max_item_id,
+    )
+
+
+class FreeGapCache:
+    """
+    LRU cache of one FreeGapIndex per user, validated by a PlanSignature.
+
+    Entries are handed out with take() and only come back with put() once the
+    caller has placed its tasks, so a failed request never leaves a half-updated
+    structure behind and two concurrent requests never share one.
+    """
+
+    def __init__(self, max_users: int = MAX_CACHED_USERS):
+        self._max_users = max_users
+        self._plans: OrderedDict[int, tuple[PlanSignature, FreeGapIndex]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def take(self, user_id: int, signature: PlanSignature) -> FreeGapIndex | None:
+        """Remove and return the user's structure if it matches signature."""
+        with self._lock:
+            cached = self._plans.pop(user_id, None)
+            if cached is None or cached[0] != signature:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return cached[1]
+
+    def put(
+        self, user_id: int, signature: PlanSignature, free_gaps: FreeGapIndex
+    ) -> None:
+        """Store the user's structure, as it looks for signature."""
+        with self._lock:
+            self._plans[user_id] = (signature, free_gaps)
+            self._plans.move_to_end(user_id)
+            while len(self._plans) > self._max_users:
+                self._plans.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the user's structure."""
+        with self._lock:
+            self._plans.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+free_gap_cache = FreeGapCache()
@@ -1,29 +1,53 @@
 """Greedy scheduling algorithm implementation."""
 
 import datetime as dt
+import itertools
+import time
 from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TypeVar
 
 from app.core.timezone import (
     get_next_half_hour,
     get_next_weekday,
     now_user_timezone,
-    parse_user_datetime,
 )
 from app.models.availability import WeeklyAvailability
 from app.models.schedule_item import ScheduleItem
 from app.models.task import Task
 from app.schemas.availability import DayOfWeek
+from app.services.availability_cache import (
+    availability_fingerprint,
+    week_expansion_cache,
+)
+from app.services.request_capture import RequestRecorder
 from app.services.scheduling_types import (
     AvailableSlots,
     BusyInterval,
+    BusyIntervalIndex,
+    CapacityProfile,
+    CapacityReport,
+    Clock,
+    DeadlineBucket,
+    DiagnosticsHook,
+    FreeGapIndex,
+    PendingTask,
+    PlacedBlock,
+    RankedTaskIndex,
     SchedulableTask,
     ScheduleBlock,
     SchedulerAvailability,
     SchedulingConfig,
+    SchedulingDiagnostics,
     SchedulingRequest,
     SchedulingResponse,
+    SlotEngine,
     TimeSlot,
 )
+from app.services.timeline_engine import iter_free_slots
+
+TaskT = TypeVar("TaskT", SchedulableTask, PendingTask)
+BlockT = TypeVar("BlockT", ScheduleBlock, PlacedBlock)
 
 
 class GreedyScheduler:
@@ -32,8 +56,25 @@ class GreedyScheduler:
 
     This scheduler uses a greedy approach to fill available time slots with tasks,
     prioritizing tasks with deadlines, then by priority, then by duration.
+
+    With config.collect_diagnostics set, or a diagnostics_hook given, the wall
+    time and counters of every phase are recorded in a SchedulingDiagnostics.
+
+    Scheduling starts at the next half hour of clock, the current time unless
+    another clock is injected. With a recorder given, the request and response
+    of every schedule_tasks call are captured for offline replay.
     """
 
+    def __init__(
+        self,
+        diagnostics_hook: DiagnosticsHook | None = None,
+        clock: Clock | None = None,
+        recorder: RequestRecorder | None = None,
+    ):
+        self.diagnostics_hook = diagnostics_hook
+        self.clock = clock
+        self.recorder = recorder
+
     def schedule_tasks(
         self,
         tasks: list[Task],
@@ -59,123 +100,715 @@ class GreedyScheduler:
                 warnings=[],
             )
 
+        diagnostics = self._new_diagnostics(config)
+        started = time.perf_counter()
+        request = self.build_request(tasks, schedule_items, availability, config)
+        if diagnostics is not None:
+            diagnostics.add_time("task_conversion", time.perf_counter() - started)
+        response = self._schedule(request, diagnostics)
+        if self.recorder is not None:
+            self.recorder.record(request, response)
+        return response
+
+    def build_request(
+        self,
+        tasks: list[Task],
+        schedule_items: list[ScheduleItem],
+        availability: WeeklyAvailability,
+        config: SchedulingConfig,
+    ) -> SchedulingRequest:
+        """
+        Convert database models into a self-contained SchedulingRequest.
+
+        The request only holds plain pydantic models, so it can be pickled and
+        scheduled in another process.
+
+        Args:
+            tasks: List of tasks to schedule
+            schedule_items: Existing schedule items (busy intervals)
+            availability: User's weekly availability
+            config: Scheduling configuration
+
+        Returns:
+            SchedulingRequest starting at the next half hour of the clock
+        """
         from app.services.scheduling_utils import (
             schedule_items_to_busy_intervals,
             tasks_to_schedulables,
         )
 
-        schedulable_tasks = tasks_to_schedulables(tasks)
-        busy_intervals = schedule_items_to_busy_intervals(schedule_items)
-        scheduler_availability = SchedulerAvailability.model_validate(availability)
-        user_now = now_user_timezone(config.timezone)
-        start_time = get_next_half_hour(user_now)
-
-        request = SchedulingRequest(
-            tasks=schedulable_tasks,
-            busy_intervals=busy_intervals,
-            scheduler_availability=scheduler_availability,
+        return SchedulingRequest(
+            tasks=tasks_to_schedulables(tasks),
+            busy_intervals=schedule_items_to_busy_intervals(schedule_items),
+            scheduler_availability=SchedulerAvailability.model_validate(availability),
             config=config,
-            start_time=start_time,
+            start_time=self._start_time(config),
         )
 
-        return self._schedule(request)
+    def _start_time(self, config: SchedulingConfig) -> dt.datetime:
+        """Internal method: Next half hour of the clock in the user's timezone."""
+        clock = self.clock or now_user_timezone
+        return get_next_half_hour(clock(config.timezone))
 
-    def _schedule(self, request: SchedulingRequest) -> SchedulingResponse:
+    def _schedule(
+        self,
+        request: SchedulingRequest,
+        diagnostics: SchedulingDiagnostics | None = None,
+        windows: Sequence[tuple[dt.datetime, dt.datetime]] | None = None,
+    ) -> SchedulingResponse:
         """
         Internal method: Schedules the tasks in the request.
+
+        Slots are generated lazily while placing, so the time spent pulling
+        slots is measured separately and split into slot expansion and busy
+        filtering; placement only keeps the remainder. windows are availability
+        windows already expanded from request.start_time in the request's
+        timezone, for at least its horizon; they are cut at the horizon end, so
+        requests with shorter horizons can share them.
         """
+        if diagnostics is None:
+            diagnostics = self._new_diagnostics(request.config)
+        started = time.perf_counter()
         ranked_tasks: list[SchedulableTask] = self._rank_tasks(
             request.tasks, request.start_time
         )
-        schedule_blocks: list[ScheduleBlock] = []
-        week_end = get_next_weekday(request.start_time, weekday=DayOfWeek.MON)
-        week_busy = [
-            bi
-            for bi in request.busy_intervals
-            if request.start_time <= bi.start_time < week_end
-        ]
-        available_slots: AvailableSlots = self._get_available_time_slots(
-            week_busy,
+        if diagnostics is not None:
+            diagnostics.add_time("ranking", time.perf_counter() - started)
+            started = time.perf_counter()
+        busy_index = BusyIntervalIndex(request.busy_intervals)
+        if diagnostics is not None:
+            diagnostics.add_time("busy_filtering", time.perf_counter() - started)
+        horizon_end = self._horizon_end(request.start_time, request.config)
+        request_windows: Iterable[tuple[dt.datetime, dt.datetime]] = (
+            self._expand_availability_windows(
+                request.scheduler_availability,
+                request.start_time,
+                horizon_end,
+                request.config.timezone,
+                diagnostics,
+            )
+            if windows is None
+            else itertools.takewhile(lambda window: window[0] < horizon_end, windows)
+        )
+        if diagnostics is not None:
+            request_windows = diagnostics.timed(
+                request_windows, "slot_expansion", "windows"
+            )
+        free_slots: Iterable[TimeSlot] = self._free_slots(
+            request_windows, busy_index, request.config.slot_engine
+        )
+        if diagnostics is not None:
+            free_slots = diagnostics.timed(free_slots, "slot_generation", "free_slots")
+
+        started = time.perf_counter()
+        infeasible_task_ids: list[int] = []
+        capacity = CapacityProfile(free_slots)
+        if request.config.placement == "edf":
+            schedule_blocks, unscheduled_tasks, infeasible_task_ids = self._place_edf(
+                ranked_tasks,
+                FreeGapIndex(capacity),
+                request.config.allow_splitting,
+                request.config.min_split_minutes,
+            )
+        else:
+            placeable_tasks, overflow_tasks = self._split_overflow(
+                ranked_tasks,
+                capacity,
+                request.config.allow_splitting,
+                request.config.min_split_minutes,
+            )
+            schedule_blocks, unscheduled_tasks = self._place_tasks_in_slots(
+                placeable_tasks,
+                capacity,
+                request.config.allow_splitting,
+                diagnostics,
+                request.config.min_split_minutes,
+            )
+            if overflow_tasks:
+                unscheduled_tasks = self._in_rank_order(
+                    unscheduled_tasks + overflow_tasks, ranked_tasks
+                )
+            if diagnostics is not None:
+                diagnostics.increment("overflow_tasks", len(overflow_tasks))
+
+        placed_block_count = len(schedule_blocks)
+        schedule_blocks = self._coalesce_blocks(schedule_blocks)
+        horizon_weeks = self._weeks_reached(request.start_time, capacity)
+        if diagnostics is None:
+            return SchedulingResponse(
+                schedule_blocks=schedule_blocks,
+                warnings=unscheduled_tasks,
+                infeasible_task_ids=infeasible_task_ids,
+                horizon_weeks=horizon_weeks,
+            )
+
+        slot_generation_ms = diagnostics.phase_ms.pop("slot_generation", 0.0)
+        expansion_ms = diagnostics.phase_ms.get("slot_expansion", 0.0)
+        diagnostics.add_time(
+            "busy_filtering", max(slot_generation_ms - expansion_ms, 0.0) / 1000
+        )
+        diagnostics.add_time(
+            "placement",
+            max(time.perf_counter() - started - slot_generation_ms / 1000, 0.0),
+        )
+        diagnostics.increment("tasks", len(request.tasks))
+        diagnostics.increment("busy_intervals", len(request.busy_intervals))
+        diagnostics.increment("schedule_blocks", len(schedule_blocks))
+        diagnostics.increment(
+            "coalesced_blocks", placed_block_count - len(schedule_blocks)
+        )
+        diagnostics.increment("unscheduled_tasks", len(unscheduled_tasks))
+        diagnostics.increment("infeasible_tasks", len(infeasible_task_ids))
+        if self.diagnostics_hook is not None:
+            self.diagnostics_hook(diagnostics)
+
+        return SchedulingResponse(
+            schedule_blocks=schedule_blocks,
+            warnings=unscheduled_tasks,
+            infeasible_task_ids=infeasible_task_ids,
+            horizon_weeks=horizon_weeks,
+            diagnostics=diagnostics if request.config.collect_diagnostics else None,
+        )
+
+    def _weeks_reached(self, start_time: dt.datetime, capacity: CapacityProfile) -> int:
+        """
+        Internal method: Number of weeks, counted from the week of start_time,
+        that the placement pulled free slots from.
+
+        Slots are expanded week by week only while tasks remain to be placed,
+        so this is the horizon the workload actually needed, capped by
+        config.max_scheduling_weeks.
+        """
+        last_slot = capacity.last_pulled
+        if last_slot is None:
+            return 0
+        first_date = start_time.date()
+        last_date = last_slot.start.astimezone(start_time.tzinfo).date()
+        first_monday = first_date - dt.timedelta(days=first_date.weekday())
+        return (last_date - first_monday).days // 7 + 1
+
+    def _split_overflow(
+        self,
+        ranked_tasks: list[SchedulableTask],
+        capacity: CapacityProfile,
+        split_tasks: bool,
+        min_split_minutes: int = 0,
+    ) -> tuple[list[SchedulableTask], list[SchedulableTask]]:
+        """
+        Internal method: Set aside the tasks no placement can fit, before
+        any slot is scanned for them.
+
+        Slots are only pulled until they cover the total demand, which is the
+        common case. Otherwise, with unrestricted splitting the slots are
+        filled in rank order, so every task starting beyond the capacity
+        overflows. Otherwise only tasks whose smallest placeable part is
+        longer than the longest slot are certain to, since a minimum split
+        can leave gaps that later, shorter tasks fill.
+
+        Returns:
+            tuple: (placeable_tasks, overflow_tasks), both in rank order
+        """
+        if capacity.covers(
+            sum(task.expected_duration_minutes for task in ranked_tasks)
+        ):
+            return ranked_tasks, []
+
+        if split_tasks and min_split_minutes <= 1:
+            capacity_minutes = capacity.pulled_minutes
+            demand_minutes = 0
+            for index, task in enumerate(ranked_tasks):
+                if demand_minutes >= capacity_minutes:
+                    return ranked_tasks[:index], ranked_tasks[index:]
+                demand_minutes += task.expected_duration_minutes
+            return ranked_tasks, []
+
+        longest_slot = capacity.longest_slot_minutes()
+        placeable_tasks: list[SchedulableTask] = []
+        overflow_tasks: list[SchedulableTask] = []
+        for task in ranked_tasks:
+            smallest_part = (
+                self._smallest_part(task, min_split_minutes)
+                if split_tasks
+                else task.expected_duration_minutes
+            )
+            if smallest_part <= longest_slot:
+                placeable_tasks.append(task)
+            else:
+                overflow_tasks.append(task)
+        return placeable_tasks, overflow_tasks
+
+    def _in_rank_order(
+        self, tasks: list[SchedulableTask], ranked_tasks: list[SchedulableTask]
+    ) -> list[SchedulableTask]:
+        """
+        Internal method: tasks sorted as in ranked_tasks, so the warnings do
+        not depend on whether a task overflowed or failed placement.
+        """
+        rank = {task.id: index for index, task in enumerate(ranked_tasks)}
+        return sorted(tasks, key=lambda task: rank[task.id])
+
+    def capacity_report(
+        self,
+        tasks: list[Task],
+        schedule_items: list[ScheduleItem],
+        availability: WeeklyAvailability,
+        config: SchedulingConfig,
+    ) -> CapacityReport:
+        """
+        Compare the minutes requested by tasks with the free minutes left by
+        schedule_items, without placing anything.
+
+        Args:
+            tasks: List of tasks that would be scheduled
+            schedule_items: Existing schedule items (busy intervals)
+            availability: User's weekly availability
+            config: Scheduling configuration
+
+        Returns:
+            CapacityReport with the overflow and the capacity up to each deadline
+        """
+        return self._capacity_report(
+            self.build_request(tasks, schedule_items, availability, config)
+        )
+
+    def _capacity_report(self, request: SchedulingRequest) -> CapacityReport:
+        """
+        Internal method: Capacity report of a request.
+
+        Tasks with a deadline rank first, in deadline order, so the demand up
+        to a deadline is the running sum over them. A task is reported late
+        when that sum exceeds the free minutes before its deadline.
+        """
+        ranked_tasks = self._rank_tasks(request.tasks, request.start_time)
+        demand_minutes = sum(task.expected_duration_minutes for task in ranked_tasks)
+        windows = self._expand_availability_windows(
             request.scheduler_availability,
             request.start_time,
+            self._horizon_end(request.start_time, request.config),
             request.config.timezone,
         )
-        for _ in range(1, request.config.max_scheduling_weeks):
-            week_start = week_end
-            week_end = week_end + dt.timedelta(days=7)
-            week_busy = [
-                bi
-                for bi in request.busy_intervals
-                if week_start <= bi.start_time < week_end
-            ]
-            week_slots = self._get_available_time_slots(
-                week_busy,
-                request.scheduler_availability,
-                week_start,
-                request.config.timezone,
+        capacity = CapacityProfile(
+            self._free_slots(
+                windows,
+                BusyIntervalIndex(request.busy_intervals),
+                request.config.slot_engine,
             )
-            available_slots.merge_slots(week_slots)
+        )
+        _, overflow_tasks = self._split_overflow(
+            ranked_tasks,
+            capacity,
+            request.config.allow_splitting,
+            request.config.min_split_minutes,
+        )
+
+        buckets: list[DeadlineBucket] = []
+        late_task_ids: list[int] = []
+        deadline_demand = 0
+        for task in ranked_tasks:
+            if task.deadline is None:
+                break
+            deadline_demand += task.expected_duration_minutes
+            capacity_minutes = capacity.minutes_before(task.deadline)
+            if deadline_demand > capacity_minutes:
+                late_task_ids.append(task.id)
+            if buckets and buckets[-1].deadline == task.deadline:
+                buckets[-1].demand_minutes = deadline_demand
+            else:
+                buckets.append(
+                    DeadlineBucket(
+                        deadline=task.deadline,
+                        demand_minutes=deadline_demand,
+                        capacity_minutes=capacity_minutes,
+                    )
+                )
 
-        schedule_blocks, unscheduled_tasks = self._place_tasks_in_slots(
-            ranked_tasks, available_slots, request.config.allow_splitting
+        return CapacityReport(
+            demand_minutes=demand_minutes,
+            capacity_minutes=capacity.total_minutes(),
+            overflow_task_ids=[task.id for task in overflow_tasks],
+            late_task_ids=late_task_ids,
+            deadline_buckets=buckets,
         )
 
+    def _new_diagnostics(
+        self, config: SchedulingConfig
+    ) -> SchedulingDiagnostics | None:
+        """Internal method: Start diagnostics if the config or a hook asks for them."""
+        if config.collect_diagnostics or self.diagnostics_hook is not None:
+            return SchedulingDiagnostics()
+        return None
+
+    def build_free_gaps(
+        self,
+        schedule_items: list[ScheduleItem],
+        availability: WeeklyAvailability,
+        config: SchedulingConfig,
+    ) -> FreeGapIndex:
+        """
+        Build the free-slot structure that add_tasks inserts new tasks into.
+
+        Args:
+            schedule_items: Existing schedule items (busy intervals)
+            availability: User's weekly availability
+            config: Scheduling configuration
+
+        Returns:
+            FreeGapIndex over the free slots of the whole scheduling horizon
+        """
+        from app.services.scheduling_utils import schedule_items_to_busy_intervals
+
+        return self._build_free_gaps(
+            schedule_items_to_busy_intervals(schedule_items),
+            SchedulerAvailability.model_validate(availability),
+            config,
+            self._start_time(config),
+        )
+
+    def add_tasks(
+        self,
+        tasks: list[Task],
+        free_gaps: FreeGapIndex,
+        config: SchedulingConfig,
+    ) -> SchedulingResponse:
+        """
+        Insert tasks into the earliest fitting gaps of an existing schedule.
+
+        Unlike schedule_tasks nothing is re-expanded: every task is looked up in
+        free_gaps in O(log n), and free_gaps is updated in place so it can be
+        kept for the next call.
+
+        Args:
+            tasks: List of tasks to add
+            free_gaps: Free slots left by the existing schedule, see build_free_gaps
+            config: Scheduling configuration
+
+        Returns:
+            SchedulingResponse with schedule blocks and warnings as unscheduled tasks
+        """
+        if not tasks:
+            return SchedulingResponse(
+                schedule_blocks=[],
+                warnings=[],
+            )
+
+        from app.services.scheduling_utils import tasks_to_schedulables
+
+        return self._add_tasks(
+            tasks_to_schedulables(tasks),
+            free_gaps,
+            self._start_time(config),
+            config.allow_splitting,
+            config.min_split_minutes,
+        )
+
+    def _build_free_gaps(
+        self,
+        busy_intervals: list[BusyInterval],
+        availability: SchedulerAvailability,
+        config: SchedulingConfig,
+        start_time: dt.datetime,
+    ) -> FreeGapIndex:
+        """Internal method: Index the free slots of the whole horizon."""
+        windows = self._expand_availability_windows(
+            availability,
+            start_time,
+            self._horizon_end(start_time, config),
+            config.timezone,
+        )
+        return FreeGapIndex(
+            self._free_slots(
+                windows, BusyIntervalIndex(busy_intervals), config.slot_engine
+            )
+        )
+
+    def _add_tasks(
+        self,
+        tasks: list[SchedulableTask],
+        free_gaps: FreeGapIndex,
+        start_time: dt.datetime,
+        split_tasks: bool,
+        min_split_minutes: int = 0,
+    ) -> SchedulingResponse:
+        """Internal method: Insert the ranked tasks into free_gaps from start_time."""
+        free_gaps.advance(start_time)
+        placed_blocks, remaining_tasks = self._insert_pending_tasks(
+            [
+                PendingTask.from_schedulable(task)
+                for task in self._rank_tasks(tasks, start_time)
+            ],
+            free_gaps,
+            split_tasks,
+            min_split_minutes,
+        )
         return SchedulingResponse(
-            schedule_blocks=schedule_blocks, warnings=unscheduled_tasks
+            schedule_blocks=[
+                block.to_schedule_block()
+                for block in self._coalesce_blocks(placed_blocks)
+            ],
+            warnings=[task.to_schedulable() for task in remaining_tasks],
+        )
+
+    def _insert_pending_tasks(
+        self,
+        tasks: list[PendingTask],
+        free_gaps: FreeGapIndex,
+        split_tasks: bool,
+        min_split_minutes: int = 0,
+    ) -> tuple[list[PlacedBlock], list[PendingTask]]:
+        """
+        Internal method: Place every task at the start of the earliest gap
+        that fits it, or with splitting enabled, fill the earliest gaps until
+        the task is used up.
+        """
+        placed_blocks: list[PlacedBlock] = []
+        remaining_tasks: list[PendingTask] = []
+        for task in tasks:
+            remainder = self._insert_pending_task(
+                task, free_gaps, split_tasks, placed_blocks, min_split_minutes
+            )
+            if remainder is not None:
+                remaining_tasks.append(remainder)
+
+        return placed_blocks, remaining_tasks
+
+    def _insert_pending_task(
+        self,
+        task: PendingTask,
+        free_gaps: FreeGapIndex,
+        split_tasks: bool,
+        placed_blocks: list[PlacedBlock],
+        min_split_minutes: int = 0,
+    ) -> PendingTask | None:
+        """
+        Internal method: Insert one task into the earliest fitting gaps,
+        appending its blocks to placed_blocks. Returns the part that did not fit.
+        """
+        while True:
+            position = free_gaps.first_fitting(
+                self._smallest_part(task, min_split_minutes)
+                if split_tasks
+                else task.expected_duration_minutes
+            )
+            if position is None:
+                return task
+            free_minutes = free_gaps.free_minutes(position)
+            remainder: PendingTask | None = None
+            if not task.can_fit_duration(free_minutes):
+                remainder = task.split(
+                    self._split_minutes(task, free_minutes, min_split_minutes)
+                )
+            taken = free_gaps.take(position, task.expected_duration_minutes)
+            placed_blocks.append(self._create_schedule_block(task, taken.start))
+            if remainder is None:
+                return None
+            task = remainder
+
+    def _place_edf(
+        self,
+        tasks: list[SchedulableTask],
+        free_gaps: FreeGapIndex,
+        split_tasks: bool,
+        min_split_minutes: int = 0,
+    ) -> tuple[list[ScheduleBlock], list[SchedulableTask], list[int]]:
+        """
+        Internal method: Earliest-deadline-first placement with a feasibility
+        check for every task with a deadline.
+
+        tasks must be ranked by _rank_tasks, which puts deadline tasks first in
+        deadline order, and are placed in that order. Before a deadline task is
+        placed, free_gaps tells in O(log n) whether it can still finish in
+        time: the free minutes left before the deadline with splitting, the end
+        of the earliest fitting gap without. Tasks that cannot are reported as
+        infeasible right away instead of being placed late. With a minimum split, gaps shorter than a part are skipped by
+        the placement but still counted by the check, so a task placed late
+        anyway is taken out of free_gaps again and reported as infeasible.
+
+        Returns:
+            tuple: (scheduled_blocks, unscheduled_tasks, infeasible_task_ids)
+        """
+        placed_blocks: list[PlacedBlock] = []
+        remaining_tasks: list[PendingTask] = []
+        infeasible_task_ids: list[int] = []
+        for task in map(PendingTask.from_schedulable, tasks):
+            if task.deadline is not None and not self._meets_deadline(
+                task, task.deadline, free_gaps, split_tasks
+            ):
+                infeasible_task_ids.append(task.id)
+                remaining_tasks.append(task)
+                continue
+            duration_minutes = task.expected_duration_minutes
+            first_block = len(placed_blocks)
+            remainder = self._insert_pending_task(
+                task, free_gaps, split_tasks, placed_blocks, min_split_minutes
+            )
+            if task.deadline is not None and (
+                remainder is not None
+                or any(
+                    block.end_time > task.deadline
+                    for block in placed_blocks[first_block:]
+                )
+            ):
+                for block in reversed(placed_blocks[first_block:]):
+                    free_gaps.release(
+                        TimeSlot(start=block.start_time, end=block.end_time)
+                    )
+                del placed_blocks[first_block:]
+                task.expected_duration_minutes = duration_minutes
+                infeasible_task_ids.append(task.id)
+                remaining_tasks.append(task)
+            elif remainder is not None:
+                remaining_tasks.append(remainder)
+
+        return (
+            [block.to_schedule_block() for block in placed_blocks],
+            [task.to_schedulable() for task in remaining_tasks],
+            infeasible_task_ids,
+        )
+
+    def _meets_deadline(
+        self,
+        task: PendingTask,
+        deadline: dt.datetime,
+        free_gaps: FreeGapIndex,
+        split_tasks: bool,
+    ) -> bool:
+        """Internal method: Whether task can still be placed to end by deadline."""
+        if split_tasks:
+            return (
+                free_gaps.free_minutes_before(deadline)
+                >= task.expected_duration_minutes
+            )
+        position = free_gaps.first_fitting(task.expected_duration_minutes)
+        return (
+            position is not None
+            and free_gaps.slot_start(position)
+            + dt.timedelta(minutes=task.expected_duration_minutes)
+            <= deadline
+        )
+
+    def _horizon_end(
+        self, start_time: dt.datetime, config: SchedulingConfig
+    ) -> dt.datetime:
+        """Internal method: End of the last week the scheduler may plan into."""
+        return get_next_weekday(start_time, weekday=DayOfWeek.MON) + dt.timedelta(
+            weeks=max(config.max_scheduling_weeks, 1) - 1
         )
 
     def _get_available_time_slots(
         self,
-        busy_intervals: list[BusyInterval],
+        busy_intervals: list[BusyInterval] | BusyIntervalIndex,
         availability: SchedulerAvailability,
         week_start: dt.datetime,
         user_timezone: str,
+        slot_engine: SlotEngine = "timeline",
     ) -> AvailableSlots:
-        """Internal method: Get available time slots for a week."""
+        """
+        Internal method: Get available time slots for a week.
+
+        Accepts a prebuilt BusyIntervalIndex so callers expanding several weeks
+        sort the busy intervals only once.
+        """
+        if not isinstance(busy_intervals, BusyIntervalIndex):
+            busy_intervals = BusyIntervalIndex(busy_intervals)
+        week_end = get_next_weekday(week_start, weekday=DayOfWeek.MON)
+        windows = self._expand_availability_windows(
+            availability, week_start, week_end, user_timezone
+        )
         available_slots: AvailableSlots = AvailableSlots()
-        start_weekday_int: int = week_start.date().weekday()
-        start_weekday: DayOfWeek = DayOfWeek(start_weekday_int)
-        for day_offset in range(start_weekday_int, 7):
-            current_date: dt.date = week_start.date() + dt.timedelta(
-                days=day_offset - start_weekday_int
-            )
-            day_of_week_int: int = current_date.weekday()
-            day_of_week: DayOfWeek = DayOfWeek(day_of_week_int)
+        available_slots.add_slots(
+            list(self._free_slots(windows, busy_intervals, slot_engine))
+        )
+        return available_slots
 
-            if day_of_week not in availability.windows.keys():
-                continue
+    def _free_slots(
+        self,
+        windows: Iterable[tuple[dt.datetime, dt.datetime]],
+        busy_index: BusyIntervalIndex,
+        slot_engine: SlotEngine,
+    ) -> Iterator[TimeSlot]:
+        """Internal method: Lazily subtract busy time with the chosen engine."""
+        if slot_engine == "timeline":
+            return iter_free_slots(windows, busy_index)
+        return self._sweep_free_slots(windows, busy_index)
 
-            day_windows = availability.windows[day_of_week]
+    def _expand_availability_windows(
+        self,
+        availability: SchedulerAvailability,
+        range_start: dt.datetime,
+        range_end: dt.datetime,
+        user_timezone: str,
+        diagnostics: SchedulingDiagnostics | None = None,
+    ) -> Iterator[tuple[dt.datetime, dt.datetime]]:
+        """
+        Internal method: Yield the UTC availability windows of every day from
+        range_start up to (excluding) the day of range_end, in chronological order.
 
-            for window in day_windows:
-                window_start_raw = parse_user_datetime(
-                    dt.datetime.combine(current_date, window.start), user_timezone
-                )
-                window_end_raw = parse_user_datetime(
-                    dt.datetime.combine(current_date, window.end), user_timezone
-                )
-                window_start: dt.datetime = window_start_raw
-                window_end: dt.datetime = window_end_raw
-
-                if start_weekday == day_offset:
-                    if window_end <= week_start:
-                        continue
-                    elif window_start < week_start:
-                        window_start = week_start
-
-                overlapping_busy: list[BusyInterval] = [
-                    bi
-                    for bi in busy_intervals
-                    if (bi.start_time < window_end and bi.end_time > window_start)
-                ]
-
-                free_slots = self._subtract_busy_from_window(
-                    window_start, window_end, overlapping_busy
+        Windows ending before range_start are dropped, a window containing
+        range_start is clipped to it. Whole weeks are expanded through the
+        shared week_expansion_cache, so repeated runs for the same availability
+        and timezone skip the timezone conversion entirely.
+        """
+        fingerprint = availability_fingerprint(availability)
+        first_date: dt.date = range_start.date()
+        last_date: dt.date = range_end.date()
+        week_start: dt.date = first_date - dt.timedelta(days=first_date.weekday())
+        while week_start < last_date:
+            started = time.perf_counter()
+            week = week_expansion_cache.get_week(fingerprint, user_timezone, week_start)
+            if diagnostics is not None:
+                diagnostics.week_expansion_ms.append(
+                    (time.perf_counter() - started) * 1000
                 )
+            for window_date, window_start, window_end in week:
+                if window_date < first_date:
+                    continue
+                if window_date >= last_date:
+                    break
+                if window_end <= range_start:
+                    continue
+                if window_start < range_start:
+                    window_start = range_start
+                if window_end <= window_start:
+                    continue
 
-                available_slots.add_slots(free_slots)
+                yield window_start, window_end
+            week_start += dt.timedelta(weeks=1)
 
-        return available_slots
+    def _sweep_free_slots(
+        self,
+        windows: Iterable[tuple[dt.datetime, dt.datetime]],
+        busy_index: BusyIntervalIndex,
+    ) -> Iterator[TimeSlot]:
+        """
+        Internal method: Subtract busy intervals from chronologically ordered
+        windows in a single pass.
+
+        Busy intervals are consumed once they start before the current window
+        ends; the furthest end seen so far carries nested, overlapping and
+        window-spanning intervals over to the following windows.
+        """
+        busy = busy_index.intervals
+        position: int | None = None
+        blocked_until: dt.datetime | None = None
+        for window_start, window_end in windows:
+            if position is None:
+                position = busy_index.first_reaching(window_start)
+            cursor = (
+                window_start
+                if blocked_until is None
+                else max(window_start, blocked_until)
+            )
+            while position < len(busy) and busy[position].start_time < window_end:
+                interval = busy[position]
+                # if the busy starts somewhere inside the window, there is a free gap
+                if interval.start_time > cursor:
+                    yield TimeSlot(start=cursor, end=interval.start_time)
+                cursor = max(cursor, interval.end_time)
+                position += 1
+
+            if cursor < window_end:
+                yield TimeSlot(start=cursor, end=window_end)
+            blocked_until = max(cursor, window_end)
 
     def _subtract_busy_from_window(
         self,
@@ -184,28 +817,11 @@ class GreedyScheduler:
         overlapping_busy: list[BusyInterval],
     ) -> list[TimeSlot]:
         """Internal method: Calculate free slots by subtracting busy intervals."""
-        if not overlapping_busy:
-            return [TimeSlot(start=window_start, end=window_end)]
-
-        sorted_busy = sorted(overlapping_busy, key=lambda bi: bi.start_time)
-        current_start = window_start
-        free_slots: list[TimeSlot] = []
-        for busy in sorted_busy:
-            # if the busy starts somewhere inside the window, there is a free gap
-            if busy.start_time > current_start:
-                new_slot = TimeSlot(
-                    start=current_start, end=min(busy.start_time, window_end)
-                )
-                free_slots.append(new_slot)
-            current_start = max(
-                current_start, busy.end_time
-            )  # edge case where nested busy intervals are happening
-
-        if current_start < window_end:
-            new_slot = TimeSlot(start=current_start, end=window_end)
-            free_slots.append(new_slot)
-
-        return free_slots
+        return list(
+            self._sweep_free_slots(
+                [(window_start, window_end)], BusyIntervalIndex(overlapping_busy)
+            )
+        )
 
     def _rank_tasks(
         self, tasks: list[SchedulableTask], now: dt.datetime
@@ -217,78 +833,214 @@ class GreedyScheduler:
         3. Tasks with a longer expected duration are ranked higher but below tasks with a higher priority
         """
 
-        def get_sort_key(task: SchedulableTask) -> tuple[int, int, int]:
-            if task.deadline:
-                deadline_rank = int((task.deadline - now).total_seconds() / 60)
-            else:
-                deadline_rank = 999999999
+        return sorted(tasks, key=lambda task: self._rank_key(task, now))
 
-            return (deadline_rank, task.priority, -task.expected_duration_minutes)
+    def _rank_key(
+        self, task: SchedulableTask | PendingTask, now: dt.datetime
+    ) -> tuple[int, int, int]:
+        """Internal method: Sort key implementing the _rank_tasks hierarchy."""
+        if task.deadline:
+            deadline_rank = int((task.deadline - now).total_seconds() / 60)
+        else:
+            deadline_rank = 999999999
 
-        return sorted(tasks, key=get_sort_key)
+        return (deadline_rank, task.priority, -task.expected_duration_minutes)
 
     def _place_tasks_in_slots(
         self,
         tasks: list[SchedulableTask],
-        free_slots: AvailableSlots,
+        free_slots: AvailableSlots | Iterable[TimeSlot],
         split_tasks: bool,
+        diagnostics: SchedulingDiagnostics | None = None,
+        min_split_minutes: int = 0,
     ) -> tuple[list[ScheduleBlock], list[SchedulableTask]]:
         """
         Internal method: Place tasks into available time slots.
 
+        Placement runs on PendingTask/PlacedBlock; the pydantic models are only
+        built once for the result. free_slots may be a lazy iterator, it is
+        not consumed past the slot in which the last task was placed.
+
         Returns:
             tuple: (scheduled_blocks, unscheduled_tasks)
         """
-        schedule_blocks: list[ScheduleBlock] = []
-        remaining_tasks: deque[SchedulableTask] = deque(tasks.copy())
+        placed_blocks, remaining_tasks = self._place_pending_tasks(
+            [PendingTask.from_schedulable(task) for task in tasks],
+            free_slots.slots if isinstance(free_slots, AvailableSlots) else free_slots,
+            split_tasks,
+            diagnostics,
+            min_split_minutes,
+        )
+        schedule_blocks: list[ScheduleBlock] = [
+            block.to_schedule_block() for block in placed_blocks
+        ]
+        unscheduled_tasks: list[SchedulableTask] = [
+            task.to_schedulable() for task in remaining_tasks
+        ]
+        return schedule_blocks, unscheduled_tasks
 
-        for slot in free_slots.slots:
-            schedule_blocks.extend(
-                self._fill_single_slot(slot, remaining_tasks, split_tasks)
+    def _place_pending_tasks(
+        self,
+        tasks: list[PendingTask],
+        free_slots: Iterable[TimeSlot],
+        split_tasks: bool,
+        diagnostics: SchedulingDiagnostics | None = None,
+        min_split_minutes: int = 0,
+    ) -> tuple[list[PlacedBlock], list[PendingTask]]:
+        """Internal method: Placement loop on the compact task representation."""
+        if not split_tasks:
+            return self._place_without_splitting(tasks, free_slots, diagnostics)
+        if min_split_minutes > 1:
+            return self._place_with_minimum_split(
+                tasks, free_slots, min_split_minutes, diagnostics
             )
 
-        unscheduled_tasks: list[SchedulableTask] = list(remaining_tasks)
-        return schedule_blocks, unscheduled_tasks
+        placed_blocks: list[PlacedBlock] = []
+        remaining_tasks: deque[PendingTask] = deque(tasks)
+
+        for slot in free_slots:
+            placed_blocks.extend(
+                self._fill_single_slot(
+                    slot, remaining_tasks, split_tasks, diagnostics, min_split_minutes
+                )
+            )
+            if not remaining_tasks:
+                break
+
+        return placed_blocks, list(remaining_tasks)
+
+    def _place_without_splitting(
+        self,
+        tasks: list[PendingTask],
+        free_slots: Iterable[TimeSlot],
+        diagnostics: SchedulingDiagnostics | None = None,
+    ) -> tuple[list[PlacedBlock], list[PendingTask]]:
+        """
+        Internal method: Place whole tasks, each slot repeatedly taking the
+        highest-ranked remaining task that still fits.
+
+        Produces the same blocks as _fill_single_slot with splitting disabled,
+        but looks the fitting task up in a RankedTaskIndex instead of scanning
+        and rebuilding the deque for every slot.
+        """
+        placed_blocks: list[PlacedBlock] = []
+        task_index = RankedTaskIndex(tasks)
+
+        for slot in free_slots:
+            slot_position = slot.start
+            remaining_slot_duration = int(slot.duration_minutes)
+            while remaining_slot_duration > 0:
+                task = task_index.pop_first_fitting(remaining_slot_duration)
+                if diagnostics is not None:
+                    diagnostics.increment("best_fit_lookups")
+                if task is None:
+                    break
+                schedule_block = self._create_schedule_block(task, slot_position)
+                slot_position = schedule_block.end_time
+                remaining_slot_duration -= task.expected_duration_minutes
+                placed_blocks.append(schedule_block)
+            if not task_index:
+                break
+
+        return placed_blocks, task_index.remaining_tasks()
+
+    def _place_with_minimum_split(
+        self,
+        tasks: list[PendingTask],
+        free_slots: Iterable[TimeSlot],
+        min_split_minutes: int,
+        diagnostics: SchedulingDiagnostics | None = None,
+    ) -> tuple[list[PlacedBlock], list[PendingTask]]:
+        """
+        Internal method: Split placement where no part may be shorter than
+        min_split_minutes.
+
+        Produces the same blocks as _fill_single_slot: the highest-ranked task
+        is split into the slot rest if both parts stay long enough, otherwise
+        the rest goes to the highest-ranked whole task that fits, looked up in
+        a RankedTaskIndex instead of scanning the deque.
+        """
+        placed_blocks: list[PlacedBlock] = []
+        task_index = RankedTaskIndex(tasks)
+
+        for slot in free_slots:
+            slot_position = slot.start
+            remaining_slot_duration = int(slot.duration_minutes)
+            while remaining_slot_duration > 0 and task_index:
+                first = task_index.first()
+                assert first is not None
+                task: PendingTask | None
+                if first.can_fit_duration(remaining_slot_duration):
+                    task = task_index.pop_first_fitting(remaining_slot_duration)
+                elif split_minutes := self._split_minutes(
+                    first, remaining_slot_duration, min_split_minutes
+                ):
+                    task = task_index.split_first(split_minutes)
+                    if diagnostics is not None:
+                        diagnostics.increment("splits")
+                else:
+                    task = task_index.pop_first_fitting(remaining_slot_duration)
+                    if diagnostics is not None:
+                        diagnostics.increment("best_fit_lookups")
+                if task is None:
+                    break
+                schedule_block = self._create_schedule_block(task, slot_position)
+                slot_position = schedule_block.end_time
+                remaining_slot_duration -= task.expected_duration_minutes
+                placed_blocks.append(schedule_block)
+            if not task_index:
+                break
+
+        return placed_blocks, task_index.remaining_tasks()
 
     def _create_schedule_block(
-        self, task: SchedulableTask, start_time: dt.datetime
-    ) -> ScheduleBlock:
+        self, task: SchedulableTask | PendingTask, start_time: dt.datetime
+    ) -> PlacedBlock:
         """Internal method: Create a schedule block from a task."""
         end_time = start_time + dt.timedelta(minutes=task.expected_duration_minutes)
-        return ScheduleBlock(
-            task_id=task.id,
-            start_time=start_time,
-            end_time=end_time,
-            source="task",
-            title=task.title,
-            description=task.description,
+        return PlacedBlock(
+            task.id,
+            start_time,
+            end_time,
+            task.title,
+            task.description,
         )
 
     def _fill_single_slot(
         self,
         slot: TimeSlot,
-        remaining_tasks: deque[SchedulableTask],
+        remaining_tasks: deque[TaskT],
         split_tasks: bool,
-    ) -> list[ScheduleBlock]:
-        """Internal method: Fill a single time slot with tasks."""
+        diagnostics: SchedulingDiagnostics | None = None,
+        min_split_minutes: int = 0,
+    ) -> list[PlacedBlock]:
+        """
+        Internal method: Fill a single time slot with tasks.
+
+        A task is only split if both parts are at least min_split_minutes
+        long; otherwise the slot rest goes to the best fitting whole task.
+        """
         slot_position = slot.start
         remaining_slot_duration = int(slot.duration_minutes)
-        schedule_blocks: list[ScheduleBlock] = []
+        schedule_blocks: list[PlacedBlock] = []
         while remaining_slot_duration > 0 and remaining_tasks:
             task = remaining_tasks.popleft()
 
             if not task.can_fit_duration(remaining_slot_duration):
-                if split_tasks:
-                    remainder_duration = (
-                        task.expected_duration_minutes - remaining_slot_duration
+                split_minutes = (
+                    self._split_minutes(
+                        task, remaining_slot_duration, min_split_minutes
                     )
-                    task_split = task.model_copy()
-                    task_split.expected_duration_minutes = remainder_duration
-
-                    task.expected_duration_minutes = remaining_slot_duration
-
-                    remaining_tasks.appendleft(task_split)
+                    if split_tasks
+                    else 0
+                )
+                if split_minutes:
+                    remaining_tasks.appendleft(task.split(split_minutes))
+                    if diagnostics is not None:
+                        diagnostics.increment("splits")
                 else:
+                    if diagnostics is not None:
+                        diagnostics.increment("best_fit_lookups")
                     fitting_task = self._find_best_fitting_task(
                         remaining_tasks, remaining_slot_duration
                     )
@@ -308,20 +1060,60 @@ class GreedyScheduler:
 
         return schedule_blocks
 
+    def _smallest_part(
+        self, task: SchedulableTask | PendingTask, min_split_minutes: int
+    ) -> int:
+        """
+        Internal method: Shortest gap task can use when splitting is allowed,
+        the whole task if it is too short to split into two minimum parts.
+        """
+        if task.expected_duration_minutes < 2 * min_split_minutes:
+            return task.expected_duration_minutes
+        return max(min_split_minutes, 1)
+
+    def _split_minutes(
+        self,
+        task: SchedulableTask | PendingTask,
+        free_minutes: int,
+        min_split_minutes: int,
+    ) -> int:
+        """
+        Internal method: Minutes of a task too long for free_minutes to place
+        there, keeping both parts at least min_split_minutes long. 0 if the
+        task cannot be split into that gap.
+        """
+        minutes = min(free_minutes, task.expected_duration_minutes - min_split_minutes)
+        return minutes if minutes >= max(min_split_minutes, 1) else 0
+
+    def _coalesce_blocks(self, blocks: list[BlockT]) -> list[BlockT]:
+        """
+        Internal method: Merge every block into the previous block of the same
+        task when that one ends where it starts, as the parts of a task split
+        across touching slots do. Blocks are merged in place.
+        """
+        coalesced: list[BlockT] = []
+        last_blocks: dict[int, BlockT] = {}
+        for block in blocks:
+            previous = last_blocks.get(block.task_id)
+            if previous is not None and previous.end_time == block.start_time:
+                previous.end_time = block.end_time
+                continue
+            coalesced.append(block)
+            last_blocks[block.task_id] = block
+        return coalesced
+
     def _find_best_fitting_task(
-        self, tasks: deque[SchedulableTask], max_duration: int
-    ) -> SchedulableTask | None:
+        self, tasks: deque[TaskT], max_duration: int
+    ) -> TaskT | None:
         """Internal method: Find the best task that fits in the given duration."""
         return next(
             (task for task in tasks if task.can_fit_duration(max_duration)),
             None,
         )
 
-    def _remove_task_from_deque(
-        self, tasks: deque[SchedulableTask], task: SchedulableTask
-    ) -> None:
+    def _remove_task_from_deque(self, tasks: deque[TaskT], task: TaskT) -> None:
         """Internal method: Remove a specific task from a deque."""
-        temp_queue: deque[SchedulableTask] = deque()
+        temp_queue: deque[TaskT] = deque()
         found = False
         while tasks and not found:
             candidate = tasks.popleft()
@@ -6,7 +6,12 @@ from app.models.availability import WeeklyAvailability
 from app.models.schedule_item import ScheduleItem
 from app.models.task import Task
 from app.schemas.task import FileAnalysisRequest, TaskDraft
-from app.services.scheduling_types import SchedulingConfig, SchedulingResponse
+from app.services.scheduling_types import (
+    CapacityReport,
+    FreeGapIndex,
+    SchedulingConfig,
+    SchedulingResponse,
+)
 
 
 class ChronoAgent(Protocol):
@@ -63,3 +68,70 @@ class ChronoScheduler(Protocol):
             SchedulingResponse with schedule blocks and warnings
         """
         ...
+
+
+class IncrementalScheduler(Protocol):
+    """Protocol for schedulers that add tasks to an existing schedule."""
+
+    def build_free_gaps(
+        self,
+        schedule_items: list[ScheduleItem],
+        availability: WeeklyAvailability,
+        config: SchedulingConfig,
+    ) -> FreeGapIndex:
+        """
+        Build the free-slot structure left by the existing schedule.
+
+        Args:
+            schedule_items: Existing schedule items (busy intervals)
+            availability: User's weekly availability
+            config: Scheduling configuration
+
+        Returns:
+            FreeGapIndex over the free slots of the scheduling horizon
+        """
+        ...
+
+    def add_tasks(
+        self,
+        tasks: list[Task],
+        free_gaps: FreeGapIndex,
+        config: SchedulingConfig,
+    ) -> SchedulingResponse:
+        """
+        Insert tasks into the free slots, updating free_gaps in place.
+
+        Args:
+            tasks: List of tasks to add
+            free_gaps: Free slots left by the existing schedule
+            config: Scheduling configuration
+
+        Returns:
+            SchedulingResponse with schedule blocks and warnings
+        """
+        ...
+
+
+class CapacityPlanner(Protocol):
+    """Protocol for services that estimate capacity without scheduling."""
+
+    def capacity_report(
+        self,
+        tasks: list[Task],
+        schedule_items: list[ScheduleItem],
+        availability: WeeklyAvailability,
+        config: SchedulingConfig,
+    ) -> CapacityReport:
+        """
+        Compare the requested minutes with the free minutes of the horizon.
+
+        Args:
+            tasks: List of tasks that would be scheduled
+            schedule_items: Existing schedule items (busy intervals)
+            availability: User's weekly availability
+            config: Scheduling configuration
+
+        Returns:
+            CapacityReport with overflow, late tasks and deadline buckets
+        """
+        ...
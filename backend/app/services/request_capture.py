@@ -0,0 +1,230 @@
+"""Capture of scheduling runs for offline replay against any scheduler."""
+
+import datetime as dt
+import gzip
+import logging
+import random
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+import pytz  # type: ignore[import-untyped]
+from pydantic import BaseModel
+
+from app.core.timezone import now_utc
+from app.env import get_config
+from app.models.availability import DailyWindowModel, WeeklyAvailability
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.services.protocols import ChronoScheduler
+from app.services.scheduling_types import (
+    BusyInterval,
+    Clock,
+    SchedulableTask,
+    ScheduleBlock,
+    SchedulingRequest,
+    SchedulingResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_SUFFIX = ".json.gz"
+
+SchedulerFactory = Callable[[Clock], ChronoScheduler]
+
+
+class CapturedRun(BaseModel):
+    """The full input of one scheduling run and the response it produced."""
+
+    captured_at: dt.datetime
+    request: SchedulingRequest
+    response: SchedulingResponse
+
+
+class ResponseDiff(NamedTuple):
+    """Differences of a replayed response from the captured one."""
+
+    missing_blocks: int
+    extra_blocks: int
+    changed_unscheduled: int
+
+    @property
+    def identical(self) -> bool:
+        return not (
+            self.missing_blocks or self.extra_blocks or self.changed_unscheduled
+        )
+
+
+class RequestRecorder:
+    """
+    Writes sampled scheduling runs to directory, one gzip-compressed JSON file
+    per run.
+
+    Titles and descriptions are replaced by the task ids before writing, the
+    scheduler only depends on the shape of its input. Write errors are logged
+    and never fail the scheduling run.
+    """
+
+    def __init__(self, directory: Path, sample_rate: float = 1.0):
+        self.directory = directory
+        self.sample_rate = sample_rate
+
+    def record(
+        self, request: SchedulingRequest, response: SchedulingResponse
+    ) -> Path | None:
+        """Write the run, returning its file, or None if it was not written."""
+        if random.random() >= self.sample_rate:
+            return None
+        run = CapturedRun(
+            captured_at=now_utc(),
+            request=_redact_request(request),
+            response=_redact_response(response),
+        )
+        path = self.directory / (
+            f"{run.captured_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:12]}{CAPTURE_SUFFIX}"
+        )
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(
+                gzip.compress(run.model_dump_json(exclude_defaults=True).encode())
+            )
+        except OSError:
+            logger.warning("request capture: writing %s failed", path)
+            return None
+        return path
+
+
+def recorder_from_config() -> RequestRecorder | None:
+    """RequestRecorder for SCHEDULE_CAPTURE_DIR, or None when it is unset."""
+    config = get_config()
+    if not config.SCHEDULE_CAPTURE_DIR:
+        return None
+    return RequestRecorder(
+        Path(config.SCHEDULE_CAPTURE_DIR), config.SCHEDULE_CAPTURE_SAMPLE_RATE
+    )
+
+
+def read_capture(path: Path) -> CapturedRun:
+    return CapturedRun.model_validate_json(gzip.decompress(path.read_bytes()))
+
+
+def iter_captures(path: Path) -> Iterator[tuple[Path, CapturedRun]]:
+    """Captured runs of a file, or of every capture file in a directory."""
+    files = sorted(path.glob(f"*{CAPTURE_SUFFIX}")) if path.is_dir() else [path]
+    for file in files:
+        yield file, read_capture(file)
+
+
+def frozen_clock(start_time: dt.datetime) -> Clock:
+    """
+    Clock standing just before start_time, so a scheduler rounding it up to
+    the next half hour starts at start_time again.
+    """
+    instant = start_time - dt.timedelta(microseconds=1)
+    return lambda timezone: instant.astimezone(pytz.timezone(timezone))
+
+
+def request_to_models(
+    request: SchedulingRequest,
+) -> tuple[list[Task], list[ScheduleItem], WeeklyAvailability]:
+    """Rebuild the database models a ChronoScheduler takes from a request."""
+    tasks = [
+        Task(
+            id=task.id,
+            user_id=0,
+            title=task.title,
+            description=task.description or "",
+            expected_duration_minutes=task.expected_duration_minutes,
+            deadline=task.deadline,
+            priority=task.priority,
+        )
+        for task in request.tasks
+    ]
+    schedule_items = [
+        ScheduleItem(
+            id=item_id,
+            user_id=0,
+            task_id=busy.task_id,
+            start_time=busy.start_time,
+            end_time=busy.end_time,
+            title=busy.title,
+        )
+        for item_id, busy in enumerate(request.busy_intervals, start=1)
+    ]
+    availability = WeeklyAvailability(id=0, user_id=0)
+    availability.windows = [
+        DailyWindowModel(
+            weekly_availability_id=0,
+            day_of_week=day,
+            start_time=window.start,
+            end_time=window.end,
+        )
+        for day, windows in request.scheduler_availability.windows.items()
+        for window in windows
+    ]
+    return tasks, schedule_items, availability
+
+
+def replay(run: CapturedRun, factory: SchedulerFactory) -> SchedulingResponse:
+    """Schedule the captured request again, starting at its original time."""
+    tasks, schedule_items, availability = request_to_models(run.request)
+    scheduler = factory(frozen_clock(run.request.start_time))
+    return scheduler.schedule_tasks(
+        tasks, schedule_items, availability, run.request.config
+    )
+
+
+def diff_responses(
+    expected: SchedulingResponse, actual: SchedulingResponse
+) -> ResponseDiff:
+    """Compare the blocks and unscheduled tasks of two responses."""
+    expected_blocks = Counter(_block_key(block) for block in expected.schedule_blocks)
+    actual_blocks = Counter(_block_key(block) for block in actual.schedule_blocks)
+    return ResponseDiff(
+        missing_blocks=(expected_blocks - actual_blocks).total(),
+        extra_blocks=(actual_blocks - expected_blocks).total(),
+        changed_unscheduled=len(
+            {task.id for task in expected.warnings}
+            ^ {task.id for task in actual.warnings}
+        ),
+    )
+
+
+def _block_key(block: ScheduleBlock) -> tuple[int, dt.datetime, dt.datetime]:
+    return block.task_id, block.start_time, block.end_time
+
+
+def _redact_task(task: SchedulableTask) -> SchedulableTask:
+    return task.model_copy(update={"title": f"Task {task.id}", "description": None})
+
+
+def _redact_request(request: SchedulingRequest) -> SchedulingRequest:
+    return request.model_copy(
+        update={
+            "tasks": [_redact_task(task) for task in request.tasks],
+            "busy_intervals": [
+                BusyInterval(
+                    task_id=busy.task_id,
+                    start_time=busy.start_time,
+                    end_time=busy.end_time,
+                )
+                for busy in request.busy_intervals
+            ],
+        }
+    )
+
+
+def _redact_response(response: SchedulingResponse) -> SchedulingResponse:
+    return response.model_copy(
+        update={
+            "schedule_blocks": [
+                block.model_copy(
+                    update={"title": f"Task {block.task_id}", "description": None}
+                )
+                for block in response.schedule_blocks
+            ],
+            "warnings": [_redact_task(task) for task in response.warnings],
+        }
+    )
@@ -0,0 +1,111 @@
+"""Server-side store of generated schedules waiting to be committed."""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import redis
+from pydantic import BaseModel
+
+from app.services.schedule_result_cache import redis_from_config
+from app.services.scheduling_types import SchedulingResponse
+
+logger = logging.getLogger(__name__)
+
+MAX_STORED_PREVIEWS = 1024
+PREVIEW_TTL_SECONDS = 30 * 60
+REDIS_KEY_PREFIX = "chrono:schedule-preview"
+
+
+class SchedulePreview(BaseModel):
+    """A generated schedule plus the schedule item stats it was planned on."""
+
+    response: SchedulingResponse
+    item_count: int
+    max_item_id: int | None
+
+
+class SchedulePreviewStore:
+    """
+    Previews per (user, preview id), kept for PREVIEW_TTL_SECONDS.
+
+    Each preview can be taken once. With SCHEDULE_CACHE_REDIS_URL set, previews
+    are stored in Redis instead of in process, so the commit may reach another
+    worker than the generate request did.
+    """
+
+    def __init__(
+        self,
+        max_previews: int = MAX_STORED_PREVIEWS,
+        ttl_seconds: int = PREVIEW_TTL_SECONDS,
+        redis_client: redis.Redis | None = None,
+    ):
+        self._max_previews = max_previews
+        self._ttl_seconds = ttl_seconds
+        self._previews: OrderedDict[tuple[int, str], tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+
+    def put(self, user_id: int, preview: SchedulePreview) -> str:
+        """Store preview and return its id."""
+        preview_id = uuid.uuid4().hex
+        payload = preview.model_dump_json()
+        client = self._client()
+        if client is not None:
+            try:
+                client.setex(
+                    self._redis_key(user_id, preview_id), self._ttl_seconds, payload
+                )
+                return preview_id
+            except redis.RedisError:
+                logger.warning("schedule preview store: redis set failed")
+
+        with self._lock:
+            self._previews[(user_id, preview_id)] = (
+                time.monotonic() + self._ttl_seconds,
+                payload,
+            )
+            while len(self._previews) > self._max_previews:
+                self._previews.popitem(last=False)
+        return preview_id
+
+    def take(self, user_id: int, preview_id: str) -> SchedulePreview | None:
+        """Remove and return the preview, or None if it is unknown or expired."""
+        with self._lock:
+            stored = self._previews.pop((user_id, preview_id), None)
+        if stored is not None:
+            expires_at, payload = stored
+            if expires_at < time.monotonic():
+                return None
+            return SchedulePreview.model_validate_json(payload)
+
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            redis_payload = client.getdel(self._redis_key(user_id, preview_id))
+        except redis.RedisError:
+            logger.warning("schedule preview store: redis get failed")
+            return None
+        if redis_payload is None:
+            return None
+        return SchedulePreview.model_validate_json(redis_payload)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._previews.clear()
+
+    def _client(self) -> redis.Redis | None:
+        if not self._redis_resolved:
+            self._redis = redis_from_config()
+            self._redis_resolved = True
+        return self._redis
+
+    def _redis_key(self, user_id: int, preview_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{user_id}:{preview_id}"
+
+
+schedule_preview_store = SchedulePreviewStore()
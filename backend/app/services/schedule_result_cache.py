@@ -0,0 +1,267 @@
+"""Two-tier cache of scheduling results keyed by a fingerprint of their inputs."""
+
+import datetime as dt
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import cast
+
+import redis
+
+from app.core.timezone import get_next_half_hour, now_user_timezone
+from app.env import get_config
+from app.models.availability import WeeklyAvailability
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.schemas.availability import WeeklyAvailabilityBase
+from app.services.availability_cache import availability_fingerprint
+from app.services.protocols import ChronoScheduler
+from app.services.scheduling_types import Clock, SchedulingConfig, SchedulingResponse
+from app.services.scheduling_utils import tasks_to_schedulables
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_RESULTS = 1024
+RESULT_TTL_SECONDS = 30 * 60
+REDIS_KEY_PREFIX = "chrono:schedule-result"
+
+
+def redis_from_config() -> redis.Redis | None:
+    """Redis client for SCHEDULE_CACHE_REDIS_URL, or None when it is unset."""
+    url = get_config().SCHEDULE_CACHE_REDIS_URL
+    if not url:
+        return None
+    return redis.Redis.from_url(url, socket_timeout=0.2)
+
+
+def schedule_fingerprint(
+    tasks: list[Task],
+    schedule_items: list[ScheduleItem],
+    availability: WeeklyAvailability,
+    config: SchedulingConfig,
+    now: dt.datetime,
+) -> str:
+    """
+    Stable hash of everything schedule_tasks reads, at the half hour after now.
+
+    now must be the time of the scheduler's clock, so schedulers with a fixed
+    clock get fingerprints that do not depend on the wall clock.
+
+    Tasks are hashed in the given order with the fields the scheduler uses
+    and their updated_at, since ties in the ranking keep the input order.
+    Schedule items only contribute their time ranges.
+    """
+    payload = {
+        "tasks": [
+            [schedulable.model_dump(mode="json"), task.updated_at.isoformat()]
+            for task, schedulable in zip(
+                tasks, tasks_to_schedulables(tasks), strict=True
+            )
+        ],
+        "busy": sorted(
+            [item.start_time.isoformat(), item.end_time.isoformat()]
+            for item in schedule_items
+        ),
+        "availability": availability_fingerprint(
+            WeeklyAvailabilityBase.model_validate(availability)
+        ),
+        "config": config.model_dump(mode="json"),
+        "start": get_next_half_hour(now).isoformat(),
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class ScheduleResultCache:
+    """
+    LRU cache of SchedulingResponses per (user, fingerprint), backed by Redis.
+
+    The in-process tier answers repeated requests on the same worker. With
+    SCHEDULE_CACHE_REDIS_URL set, results are also stored in Redis for
+    RESULT_TTL_SECONDS, so other workers can answer them too. Redis entries
+    carry a per-user generation that invalidate() increments, which drops
+    them from Redis for every worker at once; in-process entries of other
+    workers stay until evicted, which is safe because every input change also
+    changes the fingerprint. Redis errors only cost the cache hit.
+
+    Stored results are tagged with the generation they were written under
+    and read in one MGET together with the current generation, a stale tag
+    is a miss. put() tags with the generation read by the preceding get().
+    """
+
+    def __init__(
+        self,
+        max_results: int = MAX_CACHED_RESULTS,
+        redis_client: redis.Redis | None = None,
+    ):
+        self._max_results = max_results
+        self._results: OrderedDict[tuple[int, str], SchedulingResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, fingerprint: str) -> SchedulingResponse | None:
+        """Return a copy of the stored response, or None."""
+        with self._lock:
+            cached = self._results.get((user_id, fingerprint))
+            if cached is not None:
+                self._results.move_to_end((user_id, fingerprint))
+                self.hits += 1
+                return cached.model_copy(deep=True)
+
+        client = self._client()
+        if client is not None:
+            try:
+                generation, stored = cast(
+                    list[bytes | None],
+                    client.mget(
+                        self._generation_key(user_id),
+                        self._result_key(user_id, fingerprint),
+                    ),
+                )
+            except redis.RedisError:
+                logger.warning("schedule result cache: redis get failed")
+            else:
+                current = int(generation or 0)
+                with self._lock:
+                    self._generations[user_id] = current
+                tag, _, payload = (stored or b"").partition(b":")
+                if tag and int(tag) == current:
+                    response = SchedulingResponse.model_validate_json(payload)
+                    self._store(user_id, fingerprint, response)
+                    with self._lock:
+                        self.hits += 1
+                    return response.model_copy(deep=True)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, user_id: int, fingerprint: str, response: SchedulingResponse) -> None:
+        """Store a copy of response in both tiers."""
+        self._store(user_id, fingerprint, response.model_copy(deep=True))
+        client = self._client()
+        if client is None:
+            return
+        try:
+            with self._lock:
+                generation = self._generations.get(user_id)
+            if generation is None:
+                generation = int(client.get(self._generation_key(user_id)) or 0)
+            client.setex(
+                self._result_key(user_id, fingerprint),
+                RESULT_TTL_SECONDS,
+                f"{generation}:{response.model_dump_json()}",
+            )
+        except redis.RedisError:
+            logger.warning("schedule result cache: redis set failed")
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every result of the user, in this process and in Redis."""
+        with self._lock:
+            for key in [key for key in self._results if key[0] == user_id]:
+                del self._results[key]
+            self._generations.pop(user_id, None)
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.incr(self._generation_key(user_id))
+        except redis.RedisError:
+            logger.warning("schedule result cache: redis invalidate failed")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._generations.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _store(
+        self, user_id: int, fingerprint: str, response: SchedulingResponse
+    ) -> None:
+        with self._lock:
+            self._results[(user_id, fingerprint)] = response
+            self._results.move_to_end((user_id, fingerprint))
+            while len(self._results) > self._max_results:
+                self._results.popitem(last=False)
+
+    def _client(self) -> redis.Redis | None:
+        if not self._redis_resolved:
+            self._redis = redis_from_config()
+            self._redis_resolved = True
+        return self._redis
+
+    def _generation_key(self, user_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:{user_id}:generation"
+
+    def _result_key(self, user_id: int, fingerprint: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{user_id}:{fingerprint}"
+
+
+schedule_result_cache = ScheduleResultCache()
+
+
+class CachedScheduler:
+    """
+    ChronoScheduler that answers repeated identical requests from a
+    ScheduleResultCache instead of scheduling them again.
+
+    Requests collecting diagnostics always run, their timings would be
+    meaningless for a cached result. clock must be the clock of scheduler,
+    the wall clock when None.
+    """
+
+    def __init__(
+        self,
+        scheduler: ChronoScheduler,
+        cache: ScheduleResultCache = schedule_result_cache,
+        clock: Clock | None = None,
+    ):
+        self.scheduler = scheduler
+        self.cache = cache
+        self.clock = clock
+
+    def schedule_tasks(
+        self,
+        tasks: list[Task],
+        schedule_items: list[ScheduleItem],
+        availability: WeeklyAvailability,
+        config: SchedulingConfig,
+    ) -> SchedulingResponse:
+        """
+        Return the stored response for identical inputs, or schedule and store.
+
+        Args:
+            tasks: List of tasks to schedule
+            schedule_items: Existing schedule items (busy intervals)
+            availability: User's weekly availability
+            config: Scheduling configuration
+
+        Returns:
+            SchedulingResponse with schedule blocks and warnings
+        """
+        if not tasks or config.collect_diagnostics:
+            return self.scheduler.schedule_tasks(
+                tasks, schedule_items, availability, config
+            )
+
+        user_id = tasks[0].user_id
+        clock = self.clock or now_user_timezone
+        fingerprint = schedule_fingerprint(
+            tasks, schedule_items, availability, config, clock(config.timezone)
+        )
+        cached = self.cache.get(user_id, fingerprint)
+        if cached is not None:
+            return cached
+        response = self.scheduler.schedule_tasks(
+            tasks, schedule_items, availability, config
+        )
+        self.cache.put(user_id, fingerprint, response)
+        return response
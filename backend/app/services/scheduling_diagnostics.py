@@ -0,0 +1,17 @@
+"""Hooks that receive the SchedulingDiagnostics of every scheduling run."""
+
+import logging
+
+from app.services.scheduling_types import SchedulingDiagnostics
+
+logger = logging.getLogger(__name__)
+
+
+def log_scheduling_diagnostics(diagnostics: SchedulingDiagnostics) -> None:
+    """Log the phase timings and counters of one run at INFO level."""
+    logger.info(
+        "scheduling phases_ms=%s weeks=%d counts=%s",
+        {phase: round(ms, 3) for phase, ms in diagnostics.phase_ms.items()},
+        len(diagnostics.week_expansion_ms),
+        diagnostics.counts,
+    )
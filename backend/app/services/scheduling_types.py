@@ -1,7 +1,12 @@
 """Type definitions for the scheduling system."""
 
+import bisect
 import datetime as dt
-from typing import Any
+import math
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Literal, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -22,6 +27,72 @@ class SchedulableTask(BaseModel):
         """Check if this task can fit within the given duration."""
         return self.expected_duration_minutes <= duration_minutes
 
+    def split(self, duration_minutes: int) -> "SchedulableTask":
+        """Shorten this task to duration_minutes and return the remainder."""
+        remainder = self.model_copy(
+            update={
+                "expected_duration_minutes": self.expected_duration_minutes
+                - duration_minutes
+            }
+        )
+        self.expected_duration_minutes = duration_minutes
+        return remainder
+
+
+@dataclass(slots=True)
+class PendingTask:
+    """
+    Compact counterpart of SchedulableTask used inside the scheduler.
+
+    Placement splits and requeues tasks constantly, so it works on this plain
+    slotted object and only converts back to SchedulableTask for the response.
+    """
+
+    id: int
+    title: str
+    description: str | None
+    expected_duration_minutes: int
+    deadline: dt.datetime | None
+    priority: int
+
+    @classmethod
+    def from_schedulable(cls, task: SchedulableTask) -> "PendingTask":
+        return cls(
+            task.id,
+            task.title,
+            task.description,
+            task.expected_duration_minutes,
+            task.deadline,
+            task.priority,
+        )
+
+    def to_schedulable(self) -> SchedulableTask:
+        return SchedulableTask(
+            id=self.id,
+            title=self.title,
+            description=self.description,
+            expected_duration_minutes=self.expected_duration_minutes,
+            deadline=self.deadline,
+            priority=self.priority,
+        )
+
+    def can_fit_duration(self, duration_minutes: int) -> bool:
+        """Check if this task can fit within the given duration."""
+        return self.expected_duration_minutes <= duration_minutes
+
+    def split(self, duration_minutes: int) -> "PendingTask":
+        """Shorten this task to duration_minutes and return the remainder."""
+        remainder = PendingTask(
+            self.id,
+            self.title,
+            self.description,
+            self.expected_duration_minutes - duration_minutes,
+            self.deadline,
+            self.priority,
+        )
+        self.expected_duration_minutes = duration_minutes
+        return remainder
+
 
 class BusyInterval(BaseModel):
     """A time interval that is already occupied."""
@@ -32,6 +103,128 @@ class BusyInterval(BaseModel):
     title: str | None = None
 
 
+class BusyIntervalIndex:
+    """
+    Busy intervals sorted by start time, queried by binary search.
+
+    Next to the sorted start times a running maximum of the end times is kept,
+    so the first interval that can still reach into a window is found with
+    bisect as well, even when long intervals enclose shorter ones.
+    """
+
+    def __init__(self, busy_intervals: Iterable[BusyInterval]):
+        self.intervals: list[BusyInterval] = sorted(
+            busy_intervals, key=lambda bi: bi.start_time
+        )
+        self._starts: list[dt.datetime] = [bi.start_time for bi in self.intervals]
+        self._max_ends: list[dt.datetime] = []
+        for busy in self.intervals:
+            if self._max_ends and self._max_ends[-1] > busy.end_time:
+                self._max_ends.append(self._max_ends[-1])
+            else:
+                self._max_ends.append(busy.end_time)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def first_reaching(self, moment: dt.datetime) -> int:
+        """Position of the first interval that may still end after moment."""
+        return bisect.bisect_right(self._max_ends, moment)
+
+    def timeline(self) -> tuple[list[dt.datetime], list[dt.datetime]]:
+        """Start times and running maximum end times, in start order."""
+        return self._starts, self._max_ends
+
+    def overlapping(self, start: dt.datetime, end: dt.datetime) -> list[BusyInterval]:
+        """Return the busy intervals overlapping [start, end), ordered by start."""
+        if start >= end:
+            return []
+        lo = self.first_reaching(start)
+        hi = bisect.bisect_left(self._starts, end, lo=lo)
+        return [bi for bi in self.intervals[lo:hi] if bi.end_time > start]
+
+
+class RankedTaskIndex:
+    """
+    Remaining tasks in rank order, indexed by expected duration.
+
+    A segment tree over the rank positions stores the minimum duration of each
+    range, so the highest-ranked task that fits a duration is found by walking
+    down from the root, and taking a task out only updates one root path.
+    """
+
+    def __init__(self, tasks: Iterable[PendingTask]):
+        self._tasks: list[PendingTask | None] = list(tasks)
+        self._remaining = len(self._tasks)
+        self._first = 0
+        self._leaves = 1
+        while self._leaves < len(self._tasks):
+            self._leaves *= 2
+        self._min_durations: list[float] = [math.inf] * (2 * self._leaves)
+        for position, task in enumerate(self._tasks):
+            assert task is not None
+            self._min_durations[self._leaves + position] = (
+                task.expected_duration_minutes
+            )
+        for node in range(self._leaves - 1, 0, -1):
+            self._min_durations[node] = min(
+                self._min_durations[2 * node], self._min_durations[2 * node + 1]
+            )
+
+    def __len__(self) -> int:
+        return self._remaining
+
+    def first(self) -> PendingTask | None:
+        """The highest-ranked remaining task, without taking it out."""
+        while self._first < len(self._tasks) and self._tasks[self._first] is None:
+            self._first += 1
+        return self._tasks[self._first] if self._first < len(self._tasks) else None
+
+    def split_first(self, duration_minutes: int) -> PendingTask:
+        """
+        Take duration_minutes off the highest-ranked task and return them as
+        a task; the remainder keeps its rank.
+        """
+        task = self.first()
+        assert task is not None
+        remainder = task.split(duration_minutes)
+        self._tasks[self._first] = remainder
+        self._set_duration(self._first, remainder.expected_duration_minutes)
+        return task
+
+    def pop_first_fitting(self, duration_minutes: int) -> PendingTask | None:
+        """Remove and return the highest-ranked task fitting duration_minutes."""
+        if self._min_durations[1] > duration_minutes:
+            return None
+        node = 1
+        while node < self._leaves:
+            node *= 2
+            if self._min_durations[node] > duration_minutes:
+                node += 1
+
+        position = node - self._leaves
+        task = self._tasks[position]
+        assert task is not None
+        self._tasks[position] = None
+        self._remaining -= 1
+        self._set_duration(position, math.inf)
+        return task
+
+    def remaining_tasks(self) -> list[PendingTask]:
+        """Return the tasks not taken yet, in rank order."""
+        return [task for task in self._tasks if task is not None]
+
+    def _set_duration(self, position: int, duration_minutes: float) -> None:
+        node = self._leaves + position
+        self._min_durations[node] = duration_minutes
+        node //= 2
+        while node:
+            self._min_durations[node] = min(
+                self._min_durations[2 * node], self._min_durations[2 * node + 1]
+            )
+            node //= 2
+
+
 class ScheduleBlock(BaseModel):
     """A scheduled block of time for a task."""
 
@@ -43,6 +236,28 @@ class ScheduleBlock(BaseModel):
     description: str | None = None
 
 
+@dataclass(slots=True)
+class PlacedBlock:
+    """Compact counterpart of ScheduleBlock produced by the placement loop."""
+
+    task_id: int
+    start_time: dt.datetime
+    end_time: dt.datetime
+    title: str | None = None
+    description: str | None = None
+    source: str = "task"
+
+    def to_schedule_block(self) -> ScheduleBlock:
+        return ScheduleBlock(
+            task_id=self.task_id,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            source=self.source,
+            title=self.title,
+            description=self.description,
+        )
+
+
 class TimeSlot(BaseModel):
     """An available time slot for scheduling."""
 
@@ -79,18 +294,264 @@ class AvailableSlots(BaseModel):
         self.total_duration_minutes += other.total_duration_minutes
 
 
+class FreeGapIndex:
+    """
+    Free time slots in chronological order, indexed by whole free minutes.
+
+    A segment tree over the slot positions stores the longest free stretch of
+    each range, so the earliest slot that still fits a duration is found by
+    walking down from the root. Tasks are always taken from the start of a
+    slot, which keeps every slot at its position; an update only touches one
+    root path. A Fenwick tree of the free minutes per slot answers how much
+    free time is left before a moment, also in O(log n).
+    """
+
+    def __init__(self, slots: Iterable[TimeSlot]):
+        self._starts: list[dt.datetime] = []
+        self._ends: list[dt.datetime] = []
+        for slot in slots:
+            self._starts.append(slot.start)
+            self._ends.append(slot.end)
+        self._first = 0
+        self._leaves = 1
+        while self._leaves < len(self._starts):
+            self._leaves *= 2
+        self._max_minutes: list[int] = [0] * (2 * self._leaves)
+        for position in range(len(self._starts)):
+            self._max_minutes[self._leaves + position] = self.free_minutes(position)
+        for node in range(self._leaves - 1, 0, -1):
+            self._max_minutes[node] = max(
+                self._max_minutes[2 * node], self._max_minutes[2 * node + 1]
+            )
+        self._minute_sums: list[int] = [0] * (len(self._starts) + 1)
+        for position in range(len(self._starts)):
+            node = position + 1
+            self._minute_sums[node] += self._max_minutes[self._leaves + position]
+            parent = node + (node & -node)
+            if parent <= len(self._starts):
+                self._minute_sums[parent] += self._minute_sums[node]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def slot_start(self, position: int) -> dt.datetime:
+        """Start of the free time left in the slot at position."""
+        return self._starts[position]
+
+    def free_minutes_before(self, moment: dt.datetime) -> int:
+        """Whole free minutes left in all slots before moment."""
+        position = bisect.bisect_right(self._ends, moment)
+        minutes = 0
+        node = position
+        while node:
+            minutes += self._minute_sums[node]
+            node -= node & -node
+        if position < len(self._starts) and self._starts[position] < moment:
+            minutes += int((moment - self._starts[position]).total_seconds() / 60)
+        return minutes
+
+    def free_minutes(self, position: int) -> int:
+        """Whole minutes left in the slot at position."""
+        return int((self._ends[position] - self._starts[position]).total_seconds() / 60)
+
+    def advance(self, moment: dt.datetime) -> None:
+        """Drop all free time before moment."""
+        while self._first < len(self._starts) and self._ends[self._first] <= moment:
+            self._starts[self._first] = self._ends[self._first]
+            self._update(self._first)
+            self._first += 1
+        if self._first < len(self._starts) and self._starts[self._first] < moment:
+            self._starts[self._first] = moment
+            self._update(self._first)
+
+    def first_fitting(self, duration_minutes: int) -> int | None:
+        """Position of the earliest slot with at least duration_minutes free."""
+        duration_minutes = max(duration_minutes, 1)
+        if self._max_minutes[1] < duration_minutes:
+            return None
+        node = 1
+        while node < self._leaves:
+            node *= 2
+            if self._max_minutes[node] < duration_minutes:
+                node += 1
+        return node - self._leaves
+
+    def take(self, position: int, duration_minutes: int) -> TimeSlot:
+        """Occupy duration_minutes from the start of the slot at position."""
+        start = self._starts[position]
+        end = start + dt.timedelta(minutes=duration_minutes)
+        self._starts[position] = min(end, self._ends[position])
+        self._update(position)
+        return TimeSlot(start=start, end=end)
+
+    def release(self, taken: TimeSlot) -> None:
+        """Undo the latest take from the slot holding taken."""
+        position = bisect.bisect_right(self._ends, taken.start)
+        self._starts[position] = taken.start
+        self._update(position)
+
+    def slots(self) -> list[TimeSlot]:
+        """Return the remaining free slots in chronological order."""
+        return [
+            TimeSlot(start=start, end=end)
+            for start, end in zip(self._starts, self._ends, strict=True)
+            if start < end
+        ]
+
+    def _update(self, position: int) -> None:
+        node = self._leaves + position
+        delta = self.free_minutes(position) - self._max_minutes[node]
+        self._max_minutes[node] += delta
+        index = position + 1
+        while index <= len(self._starts):
+            self._minute_sums[index] += delta
+            index += index & -index
+        node //= 2
+        while node:
+            self._max_minutes[node] = max(
+                self._max_minutes[2 * node], self._max_minutes[2 * node + 1]
+            )
+            node //= 2
+
+
+class CapacityProfile:
+    """
+    Free slots pulled lazily from a slot iterator, with the cumulative whole
+    free minutes up to each of them.
+
+    Capacity questions only pull as many slots as they need. Iterating the
+    profile yields the pulled slots first and then keeps pulling, so the
+    placement can consume the same slots after a check without expanding
+    them twice.
+    """
+
+    def __init__(self, slots: Iterable[TimeSlot]):
+        self._source = iter(slots)
+        self._slots: list[TimeSlot] = []
+        self._ends: list[dt.datetime] = []
+        self._cumulative: list[int] = [0]
+
+    def __iter__(self) -> Iterator[TimeSlot]:
+        position = 0
+        while position < len(self._slots) or self._pull():
+            yield self._slots[position]
+            position += 1
+
+    @property
+    def last_pulled(self) -> TimeSlot | None:
+        """The latest slot pulled so far."""
+        return self._slots[-1] if self._slots else None
+
+    @property
+    def pulled_minutes(self) -> int:
+        """Whole free minutes of the slots pulled so far."""
+        return self._cumulative[-1]
+
+    def covers(self, minutes: int) -> bool:
+        """Pull slots until they hold minutes; False if all slots hold less."""
+        while self._cumulative[-1] < minutes:
+            if not self._pull():
+                return False
+        return True
+
+    def total_minutes(self) -> int:
+        """Whole free minutes of all slots."""
+        while self._pull():
+            pass
+        return self._cumulative[-1]
+
+    def longest_slot_minutes(self) -> int:
+        """Whole free minutes of the longest slot."""
+        while self._pull():
+            pass
+        return max((int(slot.duration_minutes) for slot in self._slots), default=0)
+
+    def minutes_before(self, moment: dt.datetime) -> int:
+        """Whole free minutes of all slots before moment."""
+        while (not self._ends or self._ends[-1] < moment) and self._pull():
+            pass
+        position = bisect.bisect_right(self._ends, moment)
+        minutes = self._cumulative[position]
+        if position < len(self._slots) and self._slots[position].start < moment:
+            slot = self._slots[position]
+            minutes += min(
+                int((moment - slot.start).total_seconds() / 60),
+                int(slot.duration_minutes),
+            )
+        return minutes
+
+    def _pull(self) -> bool:
+        slot = next(self._source, None)
+        if slot is None:
+            return False
+        self._slots.append(slot)
+        self._ends.append(slot.end)
+        self._cumulative.append(self._cumulative[-1] + int(slot.duration_minutes))
+        return True
+
+
 class SchedulerAvailability(WeeklyAvailabilityBase):
     """Availability schedule for the scheduler."""
 
     pass
 
 
+SlotEngine = Literal["sweep", "timeline"]
+PlacementMode = Literal["greedy", "edf"]
+
+
 class SchedulingConfig(BaseModel):
     """Configuration for the scheduling algorithm."""
 
     max_scheduling_weeks: int = 12
     allow_splitting: bool = True
+    min_split_minutes: int = 0
     timezone: str = "UTC"
+    slot_engine: SlotEngine = "timeline"
+    # user settings always place greedily, "edf" is only chosen by
+    # /schedule/compare variants
+    placement: PlacementMode = "greedy"
+    collect_diagnostics: bool = False
+    search_budget_ms: int = 0
+
+
+T = TypeVar("T")
+
+
+class SchedulingDiagnostics(BaseModel):
+    """Wall time per scheduling phase in milliseconds, plus counters."""
+
+    phase_ms: dict[str, float] = Field(default_factory=lambda: {})
+    week_expansion_ms: list[float] = Field(default_factory=lambda: [])
+    counts: dict[str, int] = Field(default_factory=lambda: {})
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Add seconds of wall time to phase."""
+        self.phase_ms[phase] = self.phase_ms.get(phase, 0.0) + seconds * 1000
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """Add amount to counter."""
+        self.counts[counter] = self.counts.get(counter, 0) + amount
+
+    def timed(self, items: Iterable[T], phase: str, counter: str) -> Iterator[T]:
+        """Pass items through, adding the time spent producing them to phase."""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(phase, time.perf_counter() - started)
+                return
+            self.add_time(phase, time.perf_counter() - started)
+            self.increment(counter)
+            yield item
+
+
+DiagnosticsHook = Callable[[SchedulingDiagnostics], None]
+
+# Current time in the given timezone, now_user_timezone unless injected.
+Clock = Callable[[str], dt.datetime]
 
 
 class SchedulingRequest(BaseModel):
@@ -108,3 +569,39 @@ class SchedulingResponse(BaseModel):
 
     schedule_blocks: list[ScheduleBlock]
     warnings: list[SchedulableTask] = Field(default_factory=lambda: [])
+    infeasible_task_ids: list[int] = Field(default_factory=lambda: [])
+    horizon_weeks: int = 0
+    diagnostics: SchedulingDiagnostics | None = None
+    preview_id: str | None = None
+
+
+class VariantResult(BaseModel):
+    """Outcome of scheduling the same tasks under one configuration variant."""
+
+    config: SchedulingConfig
+    schedule_blocks: list[ScheduleBlock]
+    unscheduled_task_ids: list[int] = Field(default_factory=lambda: [])
+    unscheduled_count: int = 0
+    fragmentation: float = Field(
+        default=0.0, description="Schedule blocks per scheduled task"
+    )
+    horizon_weeks: int = 0
+    duration_ms: float = 0.0
+
+
+class DeadlineBucket(BaseModel):
+    """Cumulative demand and capacity up to one deadline."""
+
+    deadline: dt.datetime
+    demand_minutes: int
+    capacity_minutes: int
+
+
+class CapacityReport(BaseModel):
+    """Requested minutes against the free minutes of the scheduling horizon."""
+
+    demand_minutes: int
+    capacity_minutes: int
+    overflow_task_ids: list[int] = Field(default_factory=lambda: [])
+    late_task_ids: list[int] = Field(default_factory=lambda: [])
+    deadline_buckets: list[DeadlineBucket] = Field(default_factory=lambda: [])
@@ -19,6 +19,7 @@ from app.schemas.user import (
     StringSettingUpdate,
     UserSettingsOut,
 )
+from app.services.schedule_result_cache import schedule_result_cache
 
 
 def get_setting_metadata(key: str) -> SettingMetadata:
@@ -115,6 +116,7 @@ def update_availability_setting(
     updated_model = availability_crud.update_user_availability(
         user_id, availability_update, session
     )
+    schedule_result_cache.invalidate(user_id)
     av_schema = WeeklyAvailabilityRead.model_validate(updated_model)
     return availability_to_setting_out(av_schema)
 
@@ -153,9 +155,15 @@ def _reschedule(user_id: int, new_timezone: str, session: Session):
     schedule_config = setting_crud.get_schedule_config(user_id, session)
     schedule_config.timezone = new_timezone
 
-    all_schedule_items = schedule_item_crud.get_user_schedule_items(user_id, session)
+    greedy = GreedyScheduler()
+    all_schedule_items = schedule_item_crud.get_schedule_items_in_horizon(
+        user_id,
+        greedy._start_time(schedule_config),
+        schedule_config.max_scheduling_weeks,
+        session,
+    )
 
-    scheduler: ChronoScheduler = GreedyScheduler()
+    scheduler: ChronoScheduler = greedy
     response = scheduler.schedule_tasks(
         scheduled_tasks,
         all_schedule_items,
@@ -177,6 +185,7 @@ def _reschedule(user_id: int, new_timezone: str, session: Session):
         )
 
     session.commit()
+    schedule_result_cache.invalidate(user_id)
 
 
 def get_setting_options(key: str) -> list[dict[str, str]] | None:
@@ -0,0 +1,166 @@
+"""Side-by-side scheduling of one task set under several configurations."""
+
+import datetime as dt
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.timezone import get_next_half_hour, now_user_timezone
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.scheduling_types import (
+    SchedulingConfig,
+    SchedulingRequest,
+    SchedulingResponse,
+    VariantResult,
+)
+
+# Below this many tasks summed over all variants, shipping the variants to
+# worker processes costs more than scheduling them in the calling process.
+PARALLEL_MIN_TASKS = 2000
+MAX_POOL_WORKERS = 8
+
+Windows = list[tuple[dt.datetime, dt.datetime]]
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def compare_configs(
+    request: SchedulingRequest,
+    configs: list[SchedulingConfig],
+    parallel: bool | None = None,
+) -> list[VariantResult]:
+    """
+    Schedule request under every config without saving anything.
+
+    The tasks, busy intervals and availability of request are converted once
+    and shared by all variants; only the config differs, and the start time
+    for variants in another timezone. The availability is expanded once per
+    timezone, for the longest horizon of its variants, and every variant is
+    scheduled on those windows.
+
+    Args:
+        request: Request holding the shared inputs
+        configs: Configuration of each variant
+        parallel: Schedule the variants in a long-lived process pool, None to
+            do so only from PARALLEL_MIN_TASKS tasks summed over the variants
+
+    Returns:
+        A VariantResult per config, in the same order
+    """
+    requests = [
+        request.model_copy(
+            update={
+                "config": config,
+                "start_time": (
+                    request.start_time
+                    if config.timezone == request.config.timezone
+                    else get_next_half_hour(now_user_timezone(config.timezone))
+                ),
+            }
+        )
+        for config in configs
+    ]
+    windows = _expand_windows(requests)
+    variants = [
+        (variant, windows[variant.config.timezone, variant.start_time])
+        for variant in requests
+    ]
+    if parallel is None:
+        parallel = (
+            len(requests) > 1
+            and len(request.tasks) * len(requests) >= PARALLEL_MIN_TASKS
+        )
+    if parallel:
+        outcomes = _run_in_pool(variants)
+    else:
+        outcomes = [_schedule_variant(*variant) for variant in variants]
+
+    return [
+        _variant_result(config, response, duration_ms)
+        for config, (response, duration_ms) in zip(configs, outcomes, strict=True)
+    ]
+
+
+def _expand_windows(
+    requests: list[SchedulingRequest],
+) -> dict[tuple[str, dt.datetime], Windows]:
+    """
+    Availability windows per timezone and start time, up to the longest
+    horizon of the variants sharing them.
+    """
+    scheduler = GreedyScheduler()
+    longest: dict[tuple[str, dt.datetime], SchedulingRequest] = {}
+    for variant in requests:
+        key = (variant.config.timezone, variant.start_time)
+        current = longest.get(key)
+        if (
+            current is None
+            or variant.config.max_scheduling_weeks > current.config.max_scheduling_weeks
+        ):
+            longest[key] = variant
+    return {
+        key: list(
+            scheduler._expand_availability_windows(
+                variant.scheduler_availability,
+                variant.start_time,
+                scheduler._horizon_end(variant.start_time, variant.config),
+                variant.config.timezone,
+            )
+        )
+        for key, variant in longest.items()
+    }
+
+
+def _schedule_variant(
+    request: SchedulingRequest, windows: Windows
+) -> tuple[SchedulingResponse, float]:
+    """Schedule one variant, returning the response and the time it took in ms."""
+    started = time.perf_counter()
+    response = GreedyScheduler()._schedule(request, windows=windows)
+    return response, (time.perf_counter() - started) * 1000
+
+
+def _run_in_pool(
+    variants: list[tuple[SchedulingRequest, Windows]],
+) -> list[tuple[SchedulingResponse, float]]:
+    """
+    Schedule the variants in the shared pool, which is started on first use
+    and replaced if a worker died.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=min(MAX_POOL_WORKERS, os.cpu_count() or 1)
+            )
+        pool = _pool
+    try:
+        return list(pool.map(_schedule_variant, *zip(*variants, strict=True)))
+    except BrokenProcessPool:
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
+
+
+def _variant_result(
+    config: SchedulingConfig, response: SchedulingResponse, duration_ms: float
+) -> VariantResult:
+    scheduled_task_ids = {block.task_id for block in response.schedule_blocks}
+    unscheduled_task_ids = [task.id for task in response.warnings]
+    return VariantResult(
+        config=config,
+        schedule_blocks=response.schedule_blocks,
+        unscheduled_task_ids=unscheduled_task_ids,
+        unscheduled_count=len(unscheduled_task_ids),
+        fragmentation=(
+            len(response.schedule_blocks) / len(scheduled_task_ids)
+            if scheduled_task_ids
+            else 0.0
+        ),
+        horizon_weeks=response.horizon_weeks,
+        duration_ms=duration_ms,
+    )
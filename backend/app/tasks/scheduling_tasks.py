@@ -0,0 +1,67 @@
+import argparse
+import multiprocessing
+from typing import Any
+
+from app.celery_app import celery_app
+from app.core.db import get_db
+from app.services.batch_scheduler import DEFAULT_CHUNK_SIZE, schedule_all_users
+
+
+@celery_app.task
+def reschedule_all_users(chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict[str, Any]:
+    """Schedule the unscheduled tasks of every user."""
+    session_gen = get_db()
+    session = next(session_gen)
+
+    try:
+        # Prefork workers are daemonic and may not start a process pool.
+        max_workers = 0 if multiprocessing.current_process().daemon else None
+        report = schedule_all_users(
+            session, max_workers=max_workers, chunk_size=chunk_size
+        )
+        return report.model_dump()
+    finally:
+        session.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point: python -m app.tasks.scheduling_tasks"""
+    parser = argparse.ArgumentParser(
+        description="Schedule the unscheduled tasks of every user."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Scheduler processes, one per CPU by default, 0 to run in-process",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    session = next(get_db())
+    try:
+        report = schedule_all_users(
+            session, max_workers=args.workers, chunk_size=args.chunk_size
+        )
+    finally:
+        session.close()
+
+    for result in report.users:
+        status = result.error or (
+            f"skipped: {result.skip_reason}" if result.skip_reason else "ok"
+        )
+        print(
+            f"user {result.user_id}: {result.scheduled_blocks} blocks, "
+            f"{result.unscheduled_tasks} unscheduled, "
+            f"{result.duration_ms:.1f} ms, {status}"
+        )
+    print(
+        f"{len(report.users)} users in {report.duration_ms:.0f} ms, "
+        f"{len(report.failed_user_ids)} failed, "
+        f"{len(report.skipped_user_ids)} skipped"
+    )
+    return 1 if report.failed_user_ids else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Performance benchmarks for the scheduler, run with python -m benchmarks.scheduler_bench."""
@@ -0,0 +1,102 @@
+"""
+Replay captured scheduling runs against scheduler implementations.
+
+    python -m benchmarks.replay captures/                       # greedy
+    python -m benchmarks.replay captures/ --schedulers greedy,anytime
+    python -m benchmarks.replay run.json.gz --schedulers mypkg.module:factory
+
+Runs are captured in production by setting SCHEDULE_CAPTURE_DIR (and
+optionally SCHEDULE_CAPTURE_SAMPLE_RATE). Every run is scheduled again by each
+scheduler, starting at its original start time, --repeat times; the fastest
+latency is reported together with the differences of its output from the
+captured response. With --strict the command exits with status 1 when any
+output differs.
+
+A scheduler is one of the names in SCHEDULERS or "module:attribute" naming a
+callable that takes a Clock and returns a ChronoScheduler.
+"""
+
+import argparse
+import importlib
+import sys
+from functools import partial
+from pathlib import Path
+
+from app.services.anytime_scheduler import AnytimeScheduler
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.request_capture import (
+    SchedulerFactory,
+    diff_responses,
+    iter_captures,
+    replay,
+)
+from benchmarks.timing import best_of
+
+SCHEDULERS: dict[str, SchedulerFactory] = {
+    "greedy": lambda clock: GreedyScheduler(clock=clock),
+    "anytime": lambda clock: AnytimeScheduler(GreedyScheduler(clock=clock)),
+}
+
+
+def resolve_scheduler(name: str) -> SchedulerFactory:
+    if name in SCHEDULERS:
+        return SCHEDULERS[name]
+    module, _, attribute = name.partition(":")
+    if not attribute:
+        raise SystemExit(
+            f"Unknown scheduler {name!r}, use one of {', '.join(SCHEDULERS)} "
+            "or module:attribute"
+        )
+    factory: SchedulerFactory = getattr(importlib.import_module(module), attribute)
+    return factory
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "captures", type=Path, help="Capture file or directory of captures"
+    )
+    parser.add_argument(
+        "--schedulers",
+        default="greedy",
+        help="Comma separated schedulers to replay against",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Exit with status 1 when any output differs from the capture",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    factories = {name: resolve_scheduler(name) for name in args.schedulers.split(",")}
+
+    differing = 0
+    for path, run in iter_captures(args.captures):
+        for name, factory in factories.items():
+            duration_ms = best_of(args.repeat, partial(replay, run, factory))
+            diff = diff_responses(run.response, replay(run, factory))
+            differing += not diff.identical
+            print(
+                f"{path.name:<40}{name:<12}"
+                f"tasks={len(run.request.tasks):<7}"
+                f"time={duration_ms:>10.2f}ms  "
+                + (
+                    "identical"
+                    if diff.identical
+                    else f"missing_blocks={diff.missing_blocks} "
+                    f"extra_blocks={diff.extra_blocks} "
+                    f"changed_unscheduled={diff.changed_unscheduled}"
+                )
+            )
+
+    if differing:
+        print(f"{differing} replays differ from their capture", file=sys.stderr)
+    return 1 if args.strict and differing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,252 @@
+"""
+Benchmark the scheduler phases on synthetic workloads and compare to baselines.
+
+    python -m benchmarks.scheduler_bench                 # compare to baselines
+    python -m benchmarks.scheduler_bench --save          # record new baselines
+    python -m benchmarks.scheduler_bench --sizes 10,1000 --threshold 0.5
+    python -m benchmarks.scheduler_bench --min-split-minutes 15
+
+Every phase is run --repeat times and the fastest run is kept. The command
+exits with status 1 when a phase is slower than its baseline by more than
+--threshold (relative) and --min-delta-ms (absolute). Baselines are machine
+specific, record them on the machine that runs the comparison. The number of
+schedule blocks of every workload is printed next to the timings, to compare
+the schedule-item volume of different --min-split-minutes values.
+"""
+
+import argparse
+import datetime as dt
+import json
+import platform
+import sys
+from pathlib import Path
+
+from app.core.timezone import get_next_weekday
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.request_capture import frozen_clock
+from app.services.scheduling_types import (
+    AvailableSlots,
+    BusyIntervalIndex,
+    SchedulerAvailability,
+    SchedulingConfig,
+)
+from app.services.scheduling_utils import (
+    schedule_items_to_busy_intervals,
+    tasks_to_schedulables,
+)
+from benchmarks.timing import best_of
+from benchmarks.workloads import (
+    SCHEDULING_WEEKS,
+    TASK_COUNTS,
+    Workload,
+    WorkloadSpec,
+    all_specs,
+    build_workload,
+)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baselines.json")
+PHASES = ("rank_tasks", "available_time_slots", "place_tasks", "schedule_tasks")
+
+PhaseTimings = dict[str, float]
+
+
+def benchmark_workload(
+    workload: Workload, repeat: int, min_split_minutes: int = 0
+) -> tuple[PhaseTimings, int]:
+    """Phase timings of workload and the number of blocks it is scheduled in."""
+    # schedule_tasks starts at the workload's start instead of the wall clock
+    scheduler = GreedyScheduler(clock=frozen_clock(workload.start_time))
+    spec = workload.spec
+    config = SchedulingConfig(
+        max_scheduling_weeks=SCHEDULING_WEEKS,
+        allow_splitting=spec.allow_splitting,
+        min_split_minutes=min_split_minutes,
+        timezone=spec.timezone,
+    )
+    schedulable_tasks = tasks_to_schedulables(workload.tasks)
+    busy_index = BusyIntervalIndex(
+        schedule_items_to_busy_intervals(workload.schedule_items)
+    )
+    availability = SchedulerAvailability.model_validate(workload.availability)
+
+    week_starts = [workload.start_time]
+    while len(week_starts) < SCHEDULING_WEEKS:
+        week_starts.append(get_next_weekday(week_starts[-1]))
+
+    def available_slots() -> AvailableSlots:
+        slots = AvailableSlots()
+        for week_start in week_starts:
+            slots.merge_slots(
+                scheduler._get_available_time_slots(
+                    busy_index, availability, week_start, spec.timezone
+                )
+            )
+        return slots
+
+    ranked_tasks = scheduler._rank_tasks(schedulable_tasks, workload.start_time)
+    slots = available_slots()
+
+    timings: PhaseTimings = {
+        "rank_tasks": best_of(
+            repeat,
+            lambda: scheduler._rank_tasks(schedulable_tasks, workload.start_time),
+        ),
+        "available_time_slots": best_of(repeat, available_slots),
+        "place_tasks": best_of(
+            repeat,
+            lambda: scheduler._place_tasks_in_slots(
+                ranked_tasks,
+                slots,
+                spec.allow_splitting,
+                min_split_minutes=min_split_minutes,
+            ),
+        ),
+    }
+    timings["schedule_tasks"] = best_of(
+        repeat,
+        lambda: scheduler.schedule_tasks(
+            workload.tasks,
+            workload.schedule_items,
+            workload.availability,
+            config,
+        ),
+    )
+    block_count = len(
+        scheduler.schedule_tasks(
+            workload.tasks,
+            workload.schedule_items,
+            workload.availability,
+            config,
+        ).schedule_blocks
+    )
+    return timings, block_count
+
+
+def find_regressions(
+    results: dict[str, PhaseTimings],
+    baselines: dict[str, PhaseTimings],
+    threshold: float,
+    min_delta_ms: float,
+) -> list[str]:
+    """Describe every phase slower than its baseline beyond both limits."""
+    regressions: list[str] = []
+    for name, timings in results.items():
+        for phase, elapsed in timings.items():
+            baseline = baselines.get(name, {}).get(phase)
+            if baseline is None:
+                continue
+            if (
+                elapsed > baseline * (1 + threshold)
+                and elapsed - baseline > min_delta_ms
+            ):
+                regressions.append(
+                    f"{name} {phase}: {elapsed:.2f} ms vs baseline {baseline:.2f} ms "
+                    f"(+{(elapsed / baseline - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _load_baselines(path: Path) -> dict[str, PhaseTimings]:
+    if not path.exists():
+        return {}
+    results: dict[str, PhaseTimings] = json.loads(path.read_text())["results"]
+    return results
+
+
+def _save_baselines(path: Path, results: dict[str, PhaseTimings]) -> None:
+    merged = _load_baselines(path)
+    merged.update(
+        {
+            name: {phase: round(elapsed, 3) for phase, elapsed in timings.items()}
+            for name, timings in results.items()
+        }
+    )
+    path.write_text(
+        json.dumps(
+            {
+                "recorded_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": dict(sorted(merged.items())),
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in TASK_COUNTS),
+        help="Comma separated task counts to run",
+    )
+    parser.add_argument(
+        "--filter", default="", help="Only run workloads whose name contains this"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--min-split-minutes",
+        type=int,
+        default=0,
+        help="Shortest part a task may be split into",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as new baselines"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown per phase, 0.25 means 25%%",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=5.0,
+        help="Ignore slowdowns smaller than this many milliseconds",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    sizes = {int(size) for size in args.sizes.split(",")}
+    specs: list[WorkloadSpec] = [
+        spec
+        for spec in all_specs()
+        if spec.task_count in sizes and args.filter in spec.name
+    ]
+
+    results: dict[str, PhaseTimings] = {}
+    for spec in specs:
+        timings, block_count = benchmark_workload(
+            build_workload(spec), args.repeat, args.min_split_minutes
+        )
+        results[spec.name] = timings
+        print(
+            f"{spec.name:<40}"
+            + "".join(f"{phase}={timings[phase]:>10.2f}ms  " for phase in PHASES)
+            + f"blocks={block_count}"
+        )
+
+    if args.save:
+        _save_baselines(args.baseline, results)
+        print(f"Saved {len(results)} baselines to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(
+        results,
+        _load_baselines(args.baseline),
+        args.threshold,
+        args.min_delta_ms,
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
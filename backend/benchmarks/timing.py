@@ -0,0 +1,23 @@
+"""Timing helpers shared by the benchmark commands."""
+
+import time
+from collections.abc import Callable
+
+from app.services.availability_cache import week_expansion_cache
+
+
+def best_of(repeat: int, run: Callable[[], object]) -> float:
+    """
+    Fastest of repeat runs in milliseconds, after one untimed warm-up run.
+
+    The week expansion cache is cleared before every run, so timezone
+    conversion is always part of the measurement.
+    """
+    run()
+    best = float("inf")
+    for _ in range(repeat):
+        week_expansion_cache.clear()
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
@@ -0,0 +1,144 @@
+"""
+Synthetic, seeded scheduler workloads.
+
+Every workload starts in the week of a DST transition of its timezone (or a
+plain week for UTC), so the availability expansion crosses an offset change.
+The same name always produces the same tasks and calendar.
+"""
+
+import datetime as dt
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Literal
+
+import pytz  # type: ignore[import-untyped]
+
+from app.models.availability import DailyWindowModel, WeeklyAvailability
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.schemas.availability import DayOfWeek
+
+BusyDensity = Literal["sparse", "dense"]
+
+TASK_COUNTS = (10, 1_000, 10_000, 100_000)
+BUSY_DENSITIES: tuple[BusyDensity, ...] = ("sparse", "dense")
+TIMEZONES = ("UTC", "Europe/Berlin", "America/New_York")
+SPLITTING = (True, False)
+SCHEDULING_WEEKS = 12
+
+# Local start of the week containing the 2024 spring DST transition.
+_DST_WEEK_STARTS = {
+    "UTC": dt.datetime(2024, 3, 25, 8, 0),
+    "Europe/Berlin": dt.datetime(2024, 3, 25, 8, 0),
+    "America/New_York": dt.datetime(2024, 3, 4, 8, 0),
+}
+_BUSY_PER_DAY = {"sparse": 2, "dense": 14}
+
+
+@dataclass(frozen=True)
+class WorkloadSpec:
+    task_count: int
+    busy_density: BusyDensity
+    timezone: str
+    allow_splitting: bool
+
+    @property
+    def name(self) -> str:
+        split = "split" if self.allow_splitting else "nosplit"
+        return f"{self.task_count}-{self.busy_density}-{self.timezone}-{split}"
+
+
+@dataclass
+class Workload:
+    spec: WorkloadSpec
+    start_time: dt.datetime
+    tasks: list[Task]
+    schedule_items: list[ScheduleItem]
+    availability: WeeklyAvailability
+
+
+def all_specs() -> list[WorkloadSpec]:
+    return [
+        WorkloadSpec(task_count, busy_density, timezone, allow_splitting)
+        for task_count, busy_density, timezone, allow_splitting in itertools.product(
+            TASK_COUNTS, BUSY_DENSITIES, TIMEZONES, SPLITTING
+        )
+    ]
+
+
+def build_workload(spec: WorkloadSpec, seed: int = 0) -> Workload:
+    rng = random.Random(f"{seed}-{spec.name}")
+    local_start = pytz.timezone(spec.timezone).localize(_DST_WEEK_STARTS[spec.timezone])
+    start_time = local_start.astimezone(dt.timezone.utc)
+    return Workload(
+        spec=spec,
+        start_time=start_time,
+        tasks=_build_tasks(rng, spec.task_count, start_time),
+        schedule_items=_build_schedule_items(rng, spec.busy_density, start_time),
+        availability=_build_availability(),
+    )
+
+
+def _build_tasks(
+    rng: random.Random, task_count: int, start_time: dt.datetime
+) -> list[Task]:
+    horizon_minutes = SCHEDULING_WEEKS * 7 * 24 * 60
+    return [
+        Task(
+            id=task_id,
+            user_id=1,
+            title=f"Task {task_id}",
+            description="Synthetic benchmark task",
+            expected_duration_minutes=rng.choice((15, 30, 45, 60, 90, 120, 240)),
+            priority=rng.randint(0, 4),
+            deadline=(
+                start_time + dt.timedelta(minutes=rng.randrange(horizon_minutes))
+                if rng.random() < 0.3
+                else None
+            ),
+        )
+        for task_id in range(1, task_count + 1)
+    ]
+
+
+def _build_schedule_items(
+    rng: random.Random, busy_density: BusyDensity, start_time: dt.datetime
+) -> list[ScheduleItem]:
+    schedule_items: list[ScheduleItem] = []
+    for day in range(SCHEDULING_WEEKS * 7):
+        day_start = start_time + dt.timedelta(days=day)
+        for _ in range(_BUSY_PER_DAY[busy_density]):
+            busy_start = day_start + dt.timedelta(minutes=30 * rng.randrange(24))
+            schedule_items.append(
+                ScheduleItem(
+                    id=len(schedule_items) + 1,
+                    user_id=1,
+                    start_time=busy_start,
+                    end_time=busy_start + dt.timedelta(minutes=rng.choice((30, 60))),
+                    source="calendar",
+                )
+            )
+    return schedule_items
+
+
+def _build_availability() -> WeeklyAvailability:
+    availability = WeeklyAvailability(id=1, user_id=1)
+    windows: list[DailyWindowModel] = []
+    for day in DayOfWeek:
+        day_windows = (
+            [(dt.time(9, 0), dt.time(12, 0)), (dt.time(13, 0), dt.time(18, 0))]
+            if day < DayOfWeek.SAT
+            else [(dt.time(10, 0), dt.time(14, 0))]
+        )
+        windows.extend(
+            DailyWindowModel(
+                weekly_availability_id=1,
+                day_of_week=day,
+                start_time=start,
+                end_time=end,
+            )
+            for start, end in day_windows
+        )
+    availability.windows = windows
+    return availability
@@ -0,0 +1,264 @@
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.timezone import now_utc
+from app.crud.schedule_item_crud import get_user_schedule_items
+from app.models.task import Task
+from app.services.free_gap_cache import free_gap_cache
+from app.services.schedule_preview_store import schedule_preview_store
+
+
+@pytest.fixture(autouse=True)
+def clear_free_gap_cache() -> Generator[None, None, None]:
+    free_gap_cache.clear()
+    yield
+    free_gap_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_schedule_preview_store() -> Generator[None, None, None]:
+    schedule_preview_store.clear()
+    yield
+    schedule_preview_store.clear()
+
+
+def _create_tasks(
+    session: Session, user_id: int, count: int, committed: bool = False
+) -> list[int]:
+    tasks = [
+        Task(
+            user_id=user_id,
+            title=f"Task {index}",
+            description="Incremental scheduling test task",
+            expected_duration_minutes=90,
+            priority=2,
+            committed_at=now_utc() if committed else None,
+        )
+        for index in range(count)
+    ]
+    session.add_all(tasks)
+    session.flush()
+    return [task.id for task in tasks if task.id is not None]
+
+
+class TestGenerateIncremental:
+    """Tests for POST /schedule/generate/incremental endpoint."""
+
+    def test_reuses_free_slots_between_calls(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that the second call inserts into the cached free slots."""
+        first_id, second_id = _create_tasks(session, mock_user_id, 2)
+
+        first = client.post(
+            "/schedule/generate/incremental", json={"task_ids": [first_id]}
+        )
+        second = client.post(
+            "/schedule/generate/incremental", json={"task_ids": [second_id]}
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert free_gap_cache.misses == 1
+        assert free_gap_cache.hits == 1
+        blocks = first.json()["schedule_blocks"] + second.json()["schedule_blocks"]
+        assert {block["task_id"] for block in blocks} == {first_id, second_id}
+        assert len(get_user_schedule_items(mock_user_id, session)) == len(blocks)
+        intervals = sorted((block["start_time"], block["end_time"]) for block in blocks)
+        for (_, end), (next_start, _) in zip(intervals, intervals[1:], strict=False):
+            assert end <= next_start
+
+    def test_rebuilds_after_schedule_items_change(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that items created outside the incremental path invalidate the cache."""
+        first_id, second_id, third_id = _create_tasks(session, mock_user_id, 3)
+
+        client.post("/schedule/generate/incremental", json={"task_ids": [first_id]})
+        client.post("/schedule/generate/selected", json={"task_ids": [second_id]})
+        response = client.post(
+            "/schedule/generate/incremental", json={"task_ids": [third_id]}
+        )
+
+        assert response.status_code == 200
+        assert free_gap_cache.misses == 2
+        assert free_gap_cache.hits == 0
+
+    def test_preview_is_stored_instead_of_committed(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that a preview creates no items and leaves no cached free slots."""
+        task_id, other_id = _create_tasks(session, mock_user_id, 2)
+
+        preview = client.post(
+            "/schedule/generate/incremental",
+            json={"task_ids": [task_id], "preview": True},
+        )
+
+        assert preview.status_code == 200
+        assert preview.json()["preview_id"] is not None
+        assert len(get_user_schedule_items(mock_user_id, session)) == 0
+        assert session.get(Task, task_id).scheduled_at is None  # type: ignore[union-attr]
+
+        client.post("/schedule/generate/incremental", json={"task_ids": [other_id]})
+
+        assert free_gap_cache.misses == 2
+        assert free_gap_cache.hits == 0
+
+
+class TestGenerateDiagnostics:
+    """Tests for the diagnostics query parameter of the generate endpoints."""
+
+    def test_diagnostics_are_returned_on_request(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that diagnostics=true adds phase timings to the response."""
+        (task_id,) = _create_tasks(session, mock_user_id, 1)
+
+        response = client.post(
+            "/schedule/generate/selected?diagnostics=true",
+            json={"task_ids": [task_id]},
+        )
+
+        assert response.status_code == 200
+        diagnostics = response.json()["diagnostics"]
+        assert "task_conversion" in diagnostics["phase_ms"]
+        assert diagnostics["counts"]["tasks"] == 1
+
+    def test_diagnostics_are_omitted_by_default(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that the response carries no diagnostics unless asked for."""
+        (task_id,) = _create_tasks(session, mock_user_id, 1)
+
+        response = client.post(
+            "/schedule/generate/selected", json={"task_ids": [task_id]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["diagnostics"] is None
+
+
+class TestScheduleCapacity:
+    """Tests for GET /schedule/capacity endpoint."""
+
+    def test_reports_demand_of_unscheduled_tasks(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that the report covers the committed, unscheduled tasks only."""
+        _create_tasks(session, mock_user_id, 2, committed=True)
+        _create_tasks(session, mock_user_id, 1)
+
+        response = client.get("/schedule/capacity")
+
+        assert response.status_code == 200
+        report = response.json()
+        assert report["demand_minutes"] == 180
+        assert report["capacity_minutes"] >= 0
+        assert report["late_task_ids"] == []
+        assert report["deadline_buckets"] == []
+        assert len(get_user_schedule_items(mock_user_id, session)) == 0
+
+
+class TestSchedulePreviewCommit:
+    """Tests for previews of the generate endpoints and POST /schedule/commit."""
+
+    def test_commit_persists_previewed_plan(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that a preview is only persisted by the commit, unchanged."""
+        task_ids = _create_tasks(session, mock_user_id, 2)
+
+        preview = client.post(
+            "/schedule/generate/selected",
+            json={"task_ids": task_ids, "preview": True},
+        )
+
+        assert preview.status_code == 200
+        preview_id = preview.json()["preview_id"]
+        assert preview_id is not None
+        assert len(get_user_schedule_items(mock_user_id, session)) == 0
+
+        commit = client.post("/schedule/commit", json={"preview_id": preview_id})
+
+        assert commit.status_code == 200
+        assert commit.json()["schedule_blocks"] == preview.json()["schedule_blocks"]
+        items = get_user_schedule_items(mock_user_id, session)
+        assert len(items) == len(preview.json()["schedule_blocks"])
+        assert all(
+            session.get(Task, task_id).scheduled_at is not None  # type: ignore[union-attr]
+            for task_id in task_ids
+        )
+
+    def test_preview_can_be_committed_once(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that a committed preview is gone from the store."""
+        _create_tasks(session, mock_user_id, 1, committed=True)
+        preview_id = client.post("/schedule/generate/all?preview=true").json()[
+            "preview_id"
+        ]
+
+        first = client.post("/schedule/commit", json={"preview_id": preview_id})
+        second = client.post("/schedule/commit", json={"preview_id": preview_id})
+
+        assert first.status_code == 200
+        assert second.status_code == 404
+
+    def test_stale_preview_is_rejected(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that schedule items added after the preview block its commit."""
+        first_id, second_id = _create_tasks(session, mock_user_id, 2)
+        preview_id = client.post(
+            "/schedule/generate/selected",
+            json={"task_ids": [first_id], "preview": True},
+        ).json()["preview_id"]
+        client.post("/schedule/generate/selected", json={"task_ids": [second_id]})
+
+        response = client.post("/schedule/commit", json={"preview_id": preview_id})
+
+        assert response.status_code == 409
+        assert session.get(Task, first_id).scheduled_at is None  # type: ignore[union-attr]
+
+
+class TestScheduleCompare:
+    """Tests for POST /schedule/compare endpoint."""
+
+    def test_compares_variants_without_saving(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that every variant is reported and nothing is persisted."""
+        _create_tasks(session, mock_user_id, 2, committed=True)
+
+        response = client.post(
+            "/schedule/compare",
+            json={
+                "variants": [
+                    {"allow_splitting": True},
+                    {"allow_splitting": False, "max_scheduling_weeks": 4},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        splitting, whole = response.json()
+        assert splitting["config"]["allow_splitting"] is True
+        assert whole["config"]["allow_splitting"] is False
+        assert whole["config"]["max_scheduling_weeks"] == 4
+        assert len(whole["schedule_blocks"]) == 2
+        assert whole["fragmentation"] == 1.0
+        assert len(get_user_schedule_items(mock_user_id, session)) == 0
+
+    def test_rejects_unknown_timezone(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that variants are validated before anything is scheduled."""
+        response = client.post(
+            "/schedule/compare", json={"variants": [{"timezone": "Mars/Olympus"}]}
+        )
+
+        assert response.status_code == 422
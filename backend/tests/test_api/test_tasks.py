@@ -1,7 +1,10 @@
 from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
+from sqlmodel import Session
 
+from app.crud.pagination import DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.models.task import Task
 from app.schemas.task import TextAnalysisRequest
 
 
@@ -264,3 +267,68 @@ class TestCreateTasksBulk:
         )
 
         assert response.status_code == 422
+
+
+class TestTaskListPagination:
+    """Tests for limit and cursor of the task list endpoints."""
+
+    def test_next_cursor_header_pages_through_drafts(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that following X-Next-Cursor returns every draft once."""
+        for i in range(5):
+            session.add(
+                Task(
+                    user_id=mock_user_id,
+                    title=f"Draft {i}",
+                    description="Draft",
+                    expected_duration_minutes=30,
+                )
+            )
+        session.commit()
+
+        first = client.get("/tasks/drafts", params={"limit": 3})
+        second = client.get(
+            "/tasks/drafts",
+            params={"limit": 3, "cursor": first.headers[NEXT_CURSOR_HEADER]},
+        )
+
+        assert first.status_code == 200
+        assert len(first.json()) == 3
+        assert NEXT_CURSOR_HEADER not in second.headers
+        titles = [task["title"] for task in first.json() + second.json()]
+        assert titles == [f"Draft {i}" for i in range(5)]
+        assert len(client.get("/tasks/drafts").json()) == 5
+
+    def test_pages_are_bounded_without_a_limit(
+        self, client: TestClient, session: Session, mock_user_id: int
+    ) -> None:
+        """Test that omitting limit returns one page of DEFAULT_PAGE_SIZE."""
+        session.add_all(
+            [
+                Task(
+                    user_id=mock_user_id,
+                    title=f"Draft {i}",
+                    description="Draft",
+                    expected_duration_minutes=30,
+                )
+                for i in range(DEFAULT_PAGE_SIZE + 1)
+            ]
+        )
+        session.commit()
+
+        response = client.get("/tasks/drafts")
+
+        assert len(response.json()) == DEFAULT_PAGE_SIZE
+        assert NEXT_CURSOR_HEADER in response.headers
+
+    def test_invalid_cursor_is_bad_request(
+        self, client: TestClient, mock_user_id: int
+    ) -> None:
+        """Test that a malformed cursor returns 400."""
+        response = client.get(
+            "/tasks/completed", params={"limit": 3, "cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == 400
+        assert "Invalid cursor" in response.json()["detail"]
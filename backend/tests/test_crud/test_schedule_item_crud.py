@@ -0,0 +1,243 @@
+import datetime as dt
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.timezone import ensure_utc
+from app.crud import schedule_item_crud
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.schedule_item import ScheduleItemCreate
+from app.services.scheduling_types import ScheduleBlock
+
+START = dt.datetime.now(dt.timezone.utc).replace(microsecond=0) + dt.timedelta(days=1)
+
+
+def _record_statements(session: Session) -> list[str]:
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    return statements
+
+
+class TestCreateScheduleItems:
+    """Tests for create_schedule_items function."""
+
+    def test_inserts_and_returns_items_without_refresh(
+        self, session: Session, user: User, task: Task
+    ) -> None:
+        """Test that the items are loaded back by their INSERT, without a refresh."""
+        assert user.id is not None
+        statements = _record_statements(session)
+
+        items = schedule_item_crud.create_schedule_items(
+            [
+                ScheduleItemCreate(
+                    user_id=user.id,
+                    task_id=task.id,
+                    start_time=START + dt.timedelta(hours=i),
+                    end_time=START + dt.timedelta(hours=i, minutes=30),
+                    title=f"Block {i}",
+                )
+                for i in range(4)
+            ],
+            session,
+        )
+
+        assert statements
+        assert all(s.startswith("INSERT INTO schedule_items") for s in statements)
+        assert [item.title for item in items] == [f"Block {i}" for i in range(4)]
+        assert all(item.id is not None for item in items)
+
+
+class TestCreateScheduleItemsFromBlocks:
+    """Tests for create_schedule_items_from_blocks function."""
+
+    def test_inserts_blocks_without_refresh(
+        self, session: Session, user: User, task: Task
+    ) -> None:
+        """Test that the blocks are saved in order without a refresh per item."""
+        assert user.id is not None and task.id is not None
+        statements = _record_statements(session)
+        blocks = [
+            ScheduleBlock(
+                task_id=task.id,
+                start_time=START + dt.timedelta(days=i),
+                end_time=START + dt.timedelta(days=i, hours=1),
+            )
+            for i in range(3)
+        ]
+
+        items = schedule_item_crud.create_schedule_items_from_blocks(
+            blocks, user.id, session
+        )
+
+        assert all(s.startswith("INSERT INTO schedule_items") for s in statements)
+        assert [item.task_id for item in items] == [task.id] * 3
+        assert [item.user_id for item in items] == [user.id] * 3
+        assert items[0].source == "task"
+
+    def test_no_blocks_insert_nothing(self, session: Session, user: User) -> None:
+        """Test that an empty schedule creates no items."""
+        assert user.id is not None
+
+        assert (
+            schedule_item_crud.create_schedule_items_from_blocks([], user.id, session)
+            == []
+        )
+
+
+class TestGetScheduleItemsInHorizon:
+    """Tests for get_schedule_items_in_horizon function."""
+
+    def test_only_items_overlapping_the_horizon_are_loaded(
+        self, session: Session, user: User
+    ) -> None:
+        """Test that past, far-future and other users' items are skipped."""
+        assert user.id is not None
+        other_user = User(email="other@example.com", password="password")
+        session.add(other_user)
+        session.commit()
+        session.refresh(other_user)
+        now = dt.datetime.now(dt.timezone.utc)
+        spans = {
+            "past": (now - dt.timedelta(days=400), now - dt.timedelta(days=399)),
+            "running": (now - dt.timedelta(hours=1), now + dt.timedelta(hours=1)),
+            "next week": (
+                now + dt.timedelta(weeks=1),
+                now + dt.timedelta(weeks=1, hours=2),
+            ),
+            "beyond": (
+                now + dt.timedelta(weeks=6),
+                now + dt.timedelta(weeks=6, hours=1),
+            ),
+        }
+        for title, (start_time, end_time) in spans.items():
+            session.add(
+                ScheduleItem(
+                    user_id=user.id,
+                    start_time=start_time,
+                    end_time=end_time,
+                    title=title,
+                )
+            )
+        session.add(
+            ScheduleItem(
+                user_id=other_user.id,  # type: ignore[arg-type]
+                start_time=spans["next week"][0],
+                end_time=spans["next week"][1],
+            )
+        )
+        session.commit()
+        statements = _record_statements(session)
+
+        items = schedule_item_crud.get_schedule_items_in_horizon(
+            user.id, now, 4, session
+        )
+
+        assert sorted(ensure_utc(item.start_time) for item in items) == [  # type: ignore[type-var]
+            spans["running"][0],
+            spans["next week"][0],
+        ]
+        assert all(item.user_id == user.id and item.id is None for item in items)
+        assert "title" not in statements[0]
+
+    def test_horizon_is_anchored_on_the_start_time(
+        self, session: Session, user: User
+    ) -> None:
+        """Test that the window follows the given start time, not the wall clock."""
+        assert user.id is not None
+        start_time = dt.datetime(2030, 1, 7, 9, 0, tzinfo=dt.timezone.utc)
+        starts = {
+            "before": start_time - dt.timedelta(days=1),
+            "inside": start_time + dt.timedelta(weeks=1),
+            "after": start_time + dt.timedelta(weeks=3),
+        }
+        for title, item_start in starts.items():
+            session.add(
+                ScheduleItem(
+                    user_id=user.id,
+                    start_time=item_start,
+                    end_time=item_start + dt.timedelta(hours=1),
+                    title=title,
+                )
+            )
+        session.commit()
+
+        items = schedule_item_crud.get_schedule_items_in_horizon(
+            user.id, start_time, 2, session
+        )
+
+        assert [ensure_utc(item.start_time) for item in items] == [starts["inside"]]
+
+    def test_several_users_are_bounded_by_their_own_horizon(
+        self, session: Session, user: User
+    ) -> None:
+        """Test that each user's items are cut at that user's horizon."""
+        assert user.id is not None
+        other_user = User(email="other@example.com", password="password")
+        session.add(other_user)
+        session.commit()
+        session.refresh(other_user)
+        assert other_user.id is not None
+        user_id, other_user_id = user.id, other_user.id
+        now = dt.datetime.now(dt.timezone.utc)
+        starts = {
+            "next week": now + dt.timedelta(weeks=1),
+            "in five weeks": now + dt.timedelta(weeks=5),
+        }
+        for owner_id in (user_id, other_user_id):
+            for title, start_time in starts.items():
+                session.add(
+                    ScheduleItem(
+                        user_id=owner_id,
+                        start_time=start_time,
+                        end_time=start_time + dt.timedelta(hours=1),
+                        title=title,
+                    )
+                )
+        session.commit()
+        statements = _record_statements(session)
+
+        items = schedule_item_crud.get_users_schedule_items_in_horizon(
+            {user_id: (now, 2), other_user_id: (now, 8)}, session
+        )
+
+        assert sorted(
+            (item.user_id, ensure_utc(item.start_time))  # type: ignore[arg-type]
+            for item in items
+        ) == [
+            (user_id, starts["next week"]),
+            (other_user_id, starts["next week"]),
+            (other_user_id, starts["in five weeks"]),
+        ]
+        assert len(statements) == 1
+        assert "title" not in statements[0]
+
+
+class TestGetScheduleItemPage:
+    """Tests for get_schedule_item_page function."""
+
+    def test_pages_follow_start_time(
+        self, session: Session, user: User, schedule_item_list: list[ScheduleItem]
+    ) -> None:
+        """Test that the cursors walk all items once in start time order."""
+        assert user.id is not None
+        items: list[ScheduleItem] = []
+        cursor = None
+        while True:
+            page, cursor = schedule_item_crud.get_schedule_item_page(
+                user.id, session, limit=3, cursor=cursor
+            )
+            items.extend(page)
+            if cursor is None:
+                break
+
+        assert items == schedule_item_list
+        assert schedule_item_crud.get_schedule_item_page(
+            user.id, session, source="event"
+        ) == ([], None)
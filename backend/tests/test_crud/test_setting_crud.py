@@ -428,3 +428,53 @@ class TestUpdateUserSetting:
         assert result.label == "NYC"
         session.refresh(setting)
         assert setting.label == "NYC"
+
+
+class TestGetMaxSchedulingWeeks:
+    """Tests for get_max_scheduling_weeks function."""
+
+    def test_defaults_when_setting_is_missing(
+        self, session: Session, user: User
+    ) -> None:
+        """Test that users without the setting get the default horizon."""
+        assert user.id is not None
+
+        assert setting_crud.get_max_scheduling_weeks(user.id, session) == 12
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [("26", 26), ("0", 1), ("1000", 104), ("soon", 12)]
+    )
+    def test_parses_and_clamps_stored_value(
+        self, session: Session, user: User, value: str, expected: int
+    ) -> None:
+        """Test that stored values are clamped and invalid ones fall back."""
+        assert user.id is not None
+        session.add(
+            UserSetting(user_id=user.id, key="max_scheduling_weeks", value=value)
+        )
+        session.commit()
+
+        assert setting_crud.get_max_scheduling_weeks(user.id, session) == expected
+
+
+class TestGetIntSetting:
+    """Tests for get_int_setting function."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [(None, 0), ("30", 30), ("-5", 0), ("long", 0)]
+    )
+    def test_min_split_minutes(
+        self, session: Session, user: User, value: str | None, expected: int
+    ) -> None:
+        """Test that min_split_minutes defaults, clamps and falls back."""
+        assert user.id is not None
+        if value is not None:
+            session.add(
+                UserSetting(user_id=user.id, key="min_split_minutes", value=value)
+            )
+            session.commit()
+
+        assert (
+            setting_crud.get_int_setting(user.id, "min_split_minutes", session)
+            == expected
+        )
@@ -0,0 +1,230 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core.exceptions import InvalidCursorError, NotFoundError
+from app.core.timezone import ensure_utc
+from app.crud import task_crud
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskCreate, TasksDelete
+
+SCHEDULED_AT = dt.datetime(2024, 1, 8, 9, 0, tzinfo=dt.timezone.utc)
+
+
+class TestCreateTasks:
+    """Tests for create_tasks function."""
+
+    def test_inserts_and_returns_tasks_without_refresh(
+        self, session: Session, user: User
+    ) -> None:
+        """Test that the tasks are loaded back by their INSERT, without a refresh."""
+        assert user.id is not None
+        statements: list[str] = []
+        event.listen(
+            session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        tasks = task_crud.create_tasks(
+            [
+                TaskCreate(
+                    title=f"Task {i}",
+                    description="Bulk",
+                    expected_duration_minutes=30,
+                    tips=["tip"],
+                )
+                for i in range(5)
+            ],
+            user.id,
+            session,
+        )
+
+        assert statements
+        assert all(s.startswith("INSERT INTO tasks") for s in statements)
+        assert [task.title for task in tasks] == [f"Task {i}" for i in range(5)]
+        assert all(task.id is not None and task.user_id == user.id for task in tasks)
+        assert tasks[0].tips == ["tip"]
+        assert tasks[0].created_at is not None
+
+    def test_empty_list_inserts_nothing(self, session: Session, user: User) -> None:
+        """Test that no tasks create no rows."""
+        assert user.id is not None
+
+        assert task_crud.create_tasks([], user.id, session) == []
+
+
+class TestUpdateTasksScheduledAt:
+    """Tests for update_tasks_scheduled_at function."""
+
+    def test_duplicate_ids_are_updated_in_one_statement(
+        self, session: Session, task_list: list[Task]
+    ) -> None:
+        """Test that all tasks, some listed twice, are set by a single UPDATE."""
+        task_ids = [task.id for task in task_list if task.id is not None]
+        statements: list[str] = []
+        event.listen(
+            session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        task_crud.update_tasks_scheduled_at(
+            task_ids + task_ids[:2], SCHEDULED_AT, task_list[0].user_id, session
+        )
+
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE tasks")
+        for task in task_list:
+            session.refresh(task)
+            assert ensure_utc(task.scheduled_at) == SCHEDULED_AT
+
+    def test_missing_id_raises_not_found(
+        self, session: Session, task: Task, user: User
+    ) -> None:
+        """Test that an id without a task raises NotFoundError."""
+        assert task.id is not None and user.id is not None
+
+        with pytest.raises(NotFoundError, match="Task with id 9999 not found"):
+            task_crud.update_tasks_scheduled_at(
+                [task.id, 9999], SCHEDULED_AT, user.id, session
+            )
+
+    def test_tasks_of_other_users_are_not_found(
+        self, session: Session, task: Task
+    ) -> None:
+        """Test that tasks of another user are neither updated nor found."""
+        other_user = User(email="other@example.com", password="password")
+        session.add(other_user)
+        session.commit()
+        session.refresh(other_user)
+        assert task.id is not None and other_user.id is not None
+
+        with pytest.raises(NotFoundError):
+            task_crud.update_tasks_scheduled_at(
+                [task.id], SCHEDULED_AT, other_user.id, session
+            )
+
+
+class TestDeleteTasks:
+    """Tests for delete_tasks function."""
+
+    def test_deletes_tasks_in_one_statement(
+        self, session: Session, task_list: list[Task]
+    ) -> None:
+        """Test that all tasks are removed by a single DELETE."""
+        task_ids = [task.id for task in task_list if task.id is not None]
+        statements: list[str] = []
+        event.listen(
+            session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        task_crud.delete_tasks(
+            TasksDelete(task_ids=task_ids), task_list[0].user_id, session
+        )
+
+        assert len(statements) == 1
+        assert statements[0].startswith("DELETE FROM tasks")
+        assert session.exec(select(Task)).all() == []
+
+    def test_missing_id_raises_not_found(
+        self, session: Session, task: Task, user: User
+    ) -> None:
+        """Test that an id without a task of the user raises NotFoundError."""
+        assert task.id is not None and user.id is not None
+
+        with pytest.raises(NotFoundError, match="Task with id 9999 not found"):
+            task_crud.delete_tasks(
+                TasksDelete(task_ids=[task.id, 9999]), user.id, session
+            )
+
+
+class TestDescheduleTasks:
+    """Tests for deschedule_tasks function."""
+
+    def test_resets_tasks_and_deletes_their_schedule_items(
+        self,
+        session: Session,
+        task: Task,
+        schedule_item: ScheduleItem,
+        schedule_item_list: list[ScheduleItem],
+    ) -> None:
+        """Test that only the task's items are deleted and scheduled_at is reset."""
+        assert task.id is not None
+        task_crud.update_tasks_scheduled_at(
+            [task.id], SCHEDULED_AT, task.user_id, session
+        )
+
+        task_crud.deschedule_tasks([task.id, task.id], task.user_id, session)
+
+        session.refresh(task)
+        assert task.scheduled_at is None
+        assert len(session.exec(select(ScheduleItem)).all()) == len(schedule_item_list)
+
+    def test_tasks_of_other_users_are_ignored(
+        self, session: Session, task: Task, schedule_item: ScheduleItem
+    ) -> None:
+        """Test that another user's ids neither reset tasks nor delete items."""
+        other_user = User(email="other@example.com", password="password")
+        session.add(other_user)
+        session.commit()
+        session.refresh(other_user)
+        assert task.id is not None and other_user.id is not None
+
+        task_crud.deschedule_tasks([task.id], other_user.id, session)
+
+        assert session.exec(select(ScheduleItem)).all() == [schedule_item]
+
+
+class TestGetTaskPage:
+    """Tests for get_task_page function."""
+
+    def test_pages_follow_created_at_then_id(
+        self, session: Session, task_list: list[Task]
+    ) -> None:
+        """Test that the cursors walk all drafts once, ties broken by id."""
+        created_at = dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc)
+        for task in task_list:
+            task.created_at = created_at
+        session.commit()
+        user_id = task_list[0].user_id
+
+        first, cursor = task_crud.get_task_page(user_id, "drafts", session, limit=4)
+        assert cursor is not None
+        rest, last_cursor = task_crud.get_task_page(
+            user_id, "drafts", session, limit=4, cursor=cursor
+        )
+
+        assert [task.id for task in first + rest] == sorted(
+            task.id for task in task_list if task.id is not None
+        )
+        assert len(first) == 4
+        assert last_cursor is None
+
+    def test_scheduled_tasks_are_ordered_by_scheduled_at(
+        self, session: Session, task_list: list[Task]
+    ) -> None:
+        """Test that scheduled tasks are paged by their scheduled_at."""
+        for offset, task in enumerate(reversed(task_list)):
+            task.scheduled_at = SCHEDULED_AT + dt.timedelta(hours=offset)
+        session.commit()
+
+        tasks, cursor = task_crud.get_task_page(
+            task_list[0].user_id, "scheduled", session, limit=len(task_list)
+        )
+
+        assert tasks == list(reversed(task_list))
+        assert cursor is None
+
+    def test_invalid_cursor_raises(self, session: Session, task: Task) -> None:
+        """Test that a cursor which is not one of ours raises InvalidCursorError."""
+        with pytest.raises(InvalidCursorError):
+            task_crud.get_task_page(
+                task.user_id, "drafts", session, limit=2, cursor="not-a-cursor"
+            )
@@ -0,0 +1,184 @@
+import datetime as dt
+import time
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.schemas.availability import DailyWindow as DailyWindowSchema
+from app.schemas.availability import DayOfWeek
+from app.services.anytime_scheduler import AnytimeScheduler
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.scheduling_types import (
+    BusyInterval,
+    SchedulableTask,
+    SchedulerAvailability,
+    SchedulingConfig,
+    SchedulingRequest,
+)
+from tests.conftest import (
+    busy_intervals_strategy,
+    schedulable_task_strategy,
+    weekly_availability_strategy,
+)
+
+_anytime = AnytimeScheduler()
+_score = _anytime._score  # type: ignore[attr-defined]
+
+START_TIME = dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc)
+
+
+def _request(
+    tasks: list[SchedulableTask],
+    availability: SchedulerAvailability,
+    busy_intervals: list[BusyInterval] | None = None,
+    budget_ms: int = 200,
+    allow_splitting: bool = True,
+) -> SchedulingRequest:
+    return SchedulingRequest(
+        tasks=tasks,
+        busy_intervals=busy_intervals or [],
+        scheduler_availability=availability,
+        config=SchedulingConfig(
+            max_scheduling_weeks=4,
+            allow_splitting=allow_splitting,
+            search_budget_ms=budget_ms,
+        ),
+        start_time=START_TIME,
+    )
+
+
+def _monday_windows(*windows: tuple[dt.time, dt.time]) -> SchedulerAvailability:
+    return SchedulerAvailability(
+        windows={
+            DayOfWeek.MON: [
+                DailyWindowSchema(start=start, end=end) for start, end in windows
+            ]
+        }
+    )
+
+
+class TestAnytimeScheduler:
+    def test_without_budget_returns_greedy_result(self):
+        tasks = [
+            SchedulableTask(id=1, title="A", expected_duration_minutes=90, priority=1),
+            SchedulableTask(id=2, title="B", expected_duration_minutes=60, priority=2),
+        ]
+        availability = _monday_windows(
+            (dt.time(9, 0), dt.time(10, 0)), (dt.time(11, 0), dt.time(12, 30))
+        )
+
+        anytime = _anytime._schedule(  # type: ignore[attr-defined]
+            _request(tasks, availability, budget_ms=0)
+        )
+        greedy = GreedyScheduler()._schedule(  # type: ignore[attr-defined]
+            _request(tasks, availability, budget_ms=0)
+        )
+
+        assert anytime == greedy
+
+    def test_search_removes_avoidable_split(self):
+        tasks = [
+            SchedulableTask(id=1, title="A", expected_duration_minutes=90, priority=1),
+            SchedulableTask(id=2, title="B", expected_duration_minutes=60, priority=2),
+        ]
+        availability = _monday_windows(
+            (dt.time(9, 0), dt.time(10, 0)), (dt.time(11, 0), dt.time(12, 30))
+        )
+
+        greedy = GreedyScheduler()._schedule(  # type: ignore[attr-defined]
+            _request(tasks, availability)
+        )
+        response = _anytime._schedule(  # type: ignore[attr-defined]
+            _request(tasks, availability)
+        )
+
+        assert len(greedy.schedule_blocks) == 3
+        assert response.warnings == []
+        assert [
+            (block.task_id, block.start_time.hour) for block in response.schedule_blocks
+        ] == [(2, 9), (1, 11)]
+        assert response.horizon_weeks == greedy.horizon_weeks == 1
+
+    def test_edf_placement_is_not_searched(self):
+        tasks = [
+            SchedulableTask(id=1, title="A", expected_duration_minutes=90, priority=1),
+            SchedulableTask(
+                id=2,
+                title="B",
+                expected_duration_minutes=60,
+                deadline=START_TIME + dt.timedelta(minutes=30),
+                priority=2,
+            ),
+        ]
+        availability = _monday_windows(
+            (dt.time(9, 0), dt.time(10, 0)), (dt.time(11, 0), dt.time(12, 30))
+        )
+        request = _request(tasks, availability)
+        request.config.placement = "edf"
+
+        response = _anytime._schedule(request)  # type: ignore[attr-defined]
+
+        assert response == GreedyScheduler()._schedule(  # type: ignore[attr-defined]
+            request
+        )
+        assert response.infeasible_task_ids == [2]
+
+    def test_search_stops_at_budget(self):
+        tasks = [
+            SchedulableTask(
+                id=i,
+                title=f"Task {i}",
+                expected_duration_minutes=45 + i % 4 * 30,
+                deadline=START_TIME + dt.timedelta(hours=2 + i),
+                priority=i % 3 + 1,
+            )
+            for i in range(1, 301)
+        ]
+        availability = _monday_windows((dt.time(9, 0), dt.time(17, 0)))
+
+        started = time.perf_counter()
+        response = _anytime._schedule(  # type: ignore[attr-defined]
+            _request(tasks, availability, budget_ms=100)
+        )
+        elapsed = time.perf_counter() - started
+
+        assert response.warnings
+        assert elapsed < 0.1 + 0.5
+
+    @settings(max_examples=25, deadline=None)
+    @given(
+        weekly_availability_strategy(),
+        busy_intervals_strategy(
+            max_count=10,
+            min_date=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc),
+            max_date=dt.datetime(2024, 1, 29, tzinfo=dt.timezone.utc),
+        ),
+        st.lists(schedulable_task_strategy(), min_size=1, max_size=8),
+        st.booleans(),
+    )
+    def test_never_worse_than_greedy(
+        self,
+        availability: SchedulerAvailability,
+        busy_intervals: list[BusyInterval],
+        tasks: list[SchedulableTask],
+        allow_splitting: bool,
+    ):
+        request = _request(
+            tasks,
+            availability,
+            busy_intervals,
+            budget_ms=10,
+            allow_splitting=allow_splitting,
+        )
+        deadlines = {task.id: task.deadline for task in tasks if task.deadline}
+
+        greedy = GreedyScheduler()._schedule(request)  # type: ignore[attr-defined]
+        response = _anytime._schedule(request)  # type: ignore[attr-defined]
+
+        greedy_score, _ = _score(greedy.schedule_blocks, greedy.warnings, deadlines)
+        score, _ = _score(response.schedule_blocks, response.warnings, deadlines)
+        assert score <= greedy_score
+        assert sum(task.expected_duration_minutes for task in response.warnings) + sum(
+            int((block.end_time - block.start_time).total_seconds() / 60)
+            for block in response.schedule_blocks
+        ) == sum(task.expected_duration_minutes for task in tasks)
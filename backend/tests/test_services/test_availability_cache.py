@@ -0,0 +1,173 @@
+import datetime as dt
+
+import pytest
+import pytz
+from sqlmodel import Session
+
+from app.crud import availability_crud
+from app.models.availability import WeeklyAvailability
+from app.schemas.availability import DailyWindow, DayOfWeek, WeeklyAvailabilityUpdate
+from app.services.availability_cache import (
+    WeekExpansionCache,
+    availability_fingerprint,
+    week_expansion_cache,
+)
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.scheduling_types import SchedulerAvailability
+
+_scheduler = GreedyScheduler()
+expand_availability_windows = _scheduler._expand_availability_windows  # type: ignore[attr-defined]
+
+
+@pytest.fixture(autouse=True)
+def clear_week_expansion_cache():
+    week_expansion_cache.clear()
+    yield
+    week_expansion_cache.clear()
+
+
+def _every_day(start: dt.time, end: dt.time) -> SchedulerAvailability:
+    return SchedulerAvailability(
+        windows={day: [DailyWindow(start=start, end=end)] for day in DayOfWeek}
+    )
+
+
+class TestAvailabilityFingerprint:
+    def test_fingerprint_ignores_window_order(self):
+        morning = DailyWindow(start=dt.time(8, 0), end=dt.time(12, 0))
+        afternoon = DailyWindow(start=dt.time(13, 0), end=dt.time(17, 0))
+
+        first = SchedulerAvailability(windows={DayOfWeek.MON: [morning, afternoon]})
+        second = SchedulerAvailability(windows={DayOfWeek.MON: [afternoon, morning]})
+
+        assert availability_fingerprint(first) == availability_fingerprint(second)
+
+    def test_fingerprint_matches_database_model(
+        self, weekly_availability: WeeklyAvailability, daily_windows: None
+    ):
+        from_model = SchedulerAvailability.model_validate(weekly_availability)
+        from_schema = SchedulerAvailability(
+            windows={
+                day: [
+                    DailyWindow(start=dt.time(7, 0), end=dt.time(12, 0)),
+                    DailyWindow(start=dt.time(13, 0), end=dt.time(17, 0)),
+                ]
+                for day in DayOfWeek
+            }
+        )
+
+        assert availability_fingerprint(from_model) == availability_fingerprint(
+            from_schema
+        )
+
+
+class TestWeekExpansionCache:
+    def test_repeated_expansion_hits_cache(self):
+        availability = _every_day(dt.time(9, 0), dt.time(17, 0))
+        range_start = dt.datetime(2024, 1, 3, 10, 0, tzinfo=dt.timezone.utc)
+        range_end = dt.datetime(2024, 1, 29, tzinfo=dt.timezone.utc)
+
+        first = list(
+            expand_availability_windows(availability, range_start, range_end, "UTC")
+        )
+        misses = week_expansion_cache.misses
+        second = list(
+            expand_availability_windows(availability, range_start, range_end, "UTC")
+        )
+
+        assert first == second
+        assert misses == 4
+        assert week_expansion_cache.misses == misses
+        assert week_expansion_cache.hits == 4
+
+    def test_range_is_trimmed_to_partial_weeks(self):
+        availability = _every_day(dt.time(9, 0), dt.time(17, 0))
+        # Wednesday 10:00 until the following Tuesday (exclusive)
+        range_start = dt.datetime(2024, 1, 3, 10, 0, tzinfo=dt.timezone.utc)
+        range_end = dt.datetime(2024, 1, 9, tzinfo=dt.timezone.utc)
+
+        windows = list(
+            expand_availability_windows(availability, range_start, range_end, "UTC")
+        )
+
+        assert windows[0] == (range_start, range_start.replace(hour=17))
+        assert [start.date() for start, _ in windows] == [
+            dt.date(2024, 1, day) for day in range(3, 9)
+        ]
+
+    def test_dst_week_uses_offset_of_each_day(self):
+        availability = _every_day(dt.time(9, 0), dt.time(17, 0))
+        berlin = pytz.timezone("Europe/Berlin")
+        # Europe/Berlin switches to summer time on Sunday, 31 March 2024.
+        range_start = berlin.localize(dt.datetime(2024, 3, 25))
+        range_end = berlin.localize(dt.datetime(2024, 4, 1))
+
+        windows = list(
+            expand_availability_windows(
+                availability, range_start, range_end, "Europe/Berlin"
+            )
+        )
+
+        assert len(windows) == 7
+        assert windows[0] == (
+            dt.datetime(2024, 3, 25, 8, 0, tzinfo=dt.timezone.utc),
+            dt.datetime(2024, 3, 25, 16, 0, tzinfo=dt.timezone.utc),
+        )
+        assert windows[-1] == (
+            dt.datetime(2024, 3, 31, 7, 0, tzinfo=dt.timezone.utc),
+            dt.datetime(2024, 3, 31, 15, 0, tzinfo=dt.timezone.utc),
+        )
+
+    def test_timezones_are_cached_separately(self):
+        availability = _every_day(dt.time(9, 0), dt.time(17, 0))
+        fingerprint = availability_fingerprint(availability)
+        week_start = dt.date(2024, 1, 1)
+
+        utc_week = week_expansion_cache.get_week(fingerprint, "UTC", week_start)
+        ny_week = week_expansion_cache.get_week(
+            fingerprint, "America/New_York", week_start
+        )
+
+        assert utc_week[0][1] == dt.datetime(2024, 1, 1, 9, tzinfo=dt.timezone.utc)
+        assert ny_week[0][1] == dt.datetime(2024, 1, 1, 14, tzinfo=dt.timezone.utc)
+
+    def test_least_recently_used_week_is_evicted(self):
+        cache = WeekExpansionCache(max_weeks=2)
+        fingerprint = availability_fingerprint(
+            _every_day(dt.time(9, 0), dt.time(17, 0))
+        )
+        weeks = [dt.date(2024, 1, 1), dt.date(2024, 1, 8), dt.date(2024, 1, 15)]
+
+        cache.get_week(fingerprint, "UTC", weeks[0])
+        cache.get_week(fingerprint, "UTC", weeks[1])
+        cache.get_week(fingerprint, "UTC", weeks[0])
+        cache.get_week(fingerprint, "UTC", weeks[2])
+        cache.get_week(fingerprint, "UTC", weeks[0])
+        cache.get_week(fingerprint, "UTC", weeks[1])
+
+        assert cache.hits == 2
+        assert cache.misses == 4
+
+    def test_update_user_availability_invalidates_cache(
+        self,
+        session: Session,
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        old_fingerprint = availability_fingerprint(
+            SchedulerAvailability.model_validate(weekly_availability)
+        )
+        week_start = dt.date(2024, 1, 1)
+        week_expansion_cache.get_week(old_fingerprint, "UTC", week_start)
+
+        availability_crud.update_user_availability(
+            weekly_availability.user_id,
+            WeeklyAvailabilityUpdate(
+                windows={DayOfWeek.MON: [DailyWindow(start=dt.time(8), end=dt.time(9))]}
+            ),
+            session,
+        )
+        week_expansion_cache.get_week(old_fingerprint, "UTC", week_start)
+
+        assert week_expansion_cache.hits == 0
+        assert week_expansion_cache.misses == 2
@@ -0,0 +1,147 @@
+import datetime as dt
+import os
+
+from sqlmodel import Session, select
+
+from app.crud.user_crud import create_user
+from app.models.availability import WeeklyAvailability
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.schemas.user import UserCreate
+from app.services import batch_scheduler
+from app.services.batch_scheduler import (
+    iter_user_id_chunks,
+    load_scheduling_requests,
+    schedule_all_users,
+)
+from app.services.schedule_result_cache import schedule_result_cache
+from app.services.scheduling_types import SchedulingRequest, SchedulingResponse
+
+_schedule_request = batch_scheduler.schedule_request
+
+
+def _create_user_with_tasks(
+    session: Session, email: str, titles: list[str], committed: bool = True
+) -> int:
+    user = create_user(UserCreate(email=email, password="password"), session)
+    assert user.id is not None
+    session.add_all(
+        [
+            Task(
+                user_id=user.id,
+                title=title,
+                description="Batch scheduling test task",
+                expected_duration_minutes=60,
+                priority=2,
+                committed_at=batch_scheduler.now_utc() if committed else None,
+            )
+            for title in titles
+        ]
+    )
+    session.commit()
+    return user.id
+
+
+def _crash_on_title(request: SchedulingRequest):
+    if any(task.title == "crash" for task in request.tasks):
+        os._exit(1)
+    return _schedule_request(request)
+
+
+class TestBatchScheduler:
+    def test_iter_user_id_chunks_skips_users_without_work(self, session: Session):
+        first = _create_user_with_tasks(session, "first@example.com", ["a"])
+        _create_user_with_tasks(session, "draft@example.com", ["b"], committed=False)
+        third = _create_user_with_tasks(session, "third@example.com", ["c", "d"])
+
+        assert list(iter_user_id_chunks(session, chunk_size=1)) == [[first], [third]]
+
+    def test_load_scheduling_requests_in_bulk(self, session: Session):
+        first = _create_user_with_tasks(session, "first@example.com", ["a", "b"])
+        second = _create_user_with_tasks(session, "second@example.com", ["c"])
+
+        requests, skipped = load_scheduling_requests([first, second], session)
+
+        assert skipped == []
+        assert [task.title for task in requests[first].tasks] == ["a", "b"]
+        assert [task.title for task in requests[second].tasks] == ["c"]
+        assert requests[first].config.allow_splitting is True
+        assert requests[first].config.timezone == "UTC"
+
+    def test_load_scheduling_requests_skips_past_schedule_items(self, session: Session):
+        user_id = _create_user_with_tasks(session, "first@example.com", ["a"])
+        now = batch_scheduler.now_utc()
+        for start_time in (now - dt.timedelta(days=400), now + dt.timedelta(days=1)):
+            session.add(
+                ScheduleItem(
+                    user_id=user_id,
+                    start_time=start_time,
+                    end_time=start_time + dt.timedelta(hours=1),
+                )
+            )
+        session.commit()
+
+        requests, _ = load_scheduling_requests([user_id], session)
+
+        assert len(requests[user_id].busy_intervals) == 1
+
+    def test_users_without_availability_are_reported_as_skipped(self, session: Session):
+        healthy = _create_user_with_tasks(session, "healthy@example.com", ["a"])
+        unavailable = _create_user_with_tasks(session, "none@example.com", ["b"])
+        availability = session.exec(
+            select(WeeklyAvailability).where(WeeklyAvailability.user_id == unavailable)
+        ).one()
+        for window in availability.windows:
+            session.delete(window)
+        session.delete(availability)
+        session.commit()
+
+        report = schedule_all_users(session, max_workers=0)
+
+        results = {result.user_id: result for result in report.users}
+        assert results[healthy].skip_reason is None
+        assert results[healthy].scheduled_blocks == 1
+        assert results[unavailable].skip_reason == "no availability"
+        assert report.skipped_user_ids == [unavailable]
+        assert report.failed_user_ids == []
+
+    def test_schedule_all_users_in_process(self, session: Session):
+        first = _create_user_with_tasks(session, "first@example.com", ["a", "b"])
+        second = _create_user_with_tasks(session, "second@example.com", ["c"])
+
+        report = schedule_all_users(session, max_workers=0)
+
+        assert {result.user_id for result in report.users} == {first, second}
+        assert report.failed_user_ids == []
+        items = session.exec(select(ScheduleItem)).all()
+        assert len(items) == sum(result.scheduled_blocks for result in report.users)
+        assert all(
+            task.scheduled_at is not None for task in session.exec(select(Task)).all()
+        )
+        assert list(iter_user_id_chunks(session)) == []
+
+    def test_saving_invalidates_cached_results(self, session: Session):
+        user_id = _create_user_with_tasks(session, "first@example.com", ["a"])
+        schedule_result_cache.put(
+            user_id, "fingerprint", SchedulingResponse(schedule_blocks=[])
+        )
+
+        schedule_all_users(session, max_workers=0)
+
+        assert schedule_result_cache.get(user_id, "fingerprint") is None
+        schedule_result_cache.clear()
+
+    def test_worker_crash_only_fails_its_user(self, session: Session, monkeypatch):
+        monkeypatch.setattr(batch_scheduler, "schedule_request", _crash_on_title)
+        healthy = _create_user_with_tasks(session, "healthy@example.com", ["a"])
+        crashing = _create_user_with_tasks(session, "crashing@example.com", ["crash"])
+
+        report = schedule_all_users(session, max_workers=1)
+
+        results = {result.user_id: result for result in report.users}
+        assert results[healthy].error is None
+        assert results[healthy].scheduled_blocks == 1
+        assert results[crashing].error == "worker crashed"
+        assert report.failed_user_ids == [crashing]
+        items = session.exec(select(ScheduleItem)).all()
+        assert {item.user_id for item in items} == {healthy}
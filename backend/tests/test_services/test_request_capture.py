@@ -0,0 +1,166 @@
+import datetime as dt
+from pathlib import Path
+
+from app.models.availability import WeeklyAvailability
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.services.anytime_scheduler import AnytimeScheduler
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.request_capture import (
+    RequestRecorder,
+    diff_responses,
+    iter_captures,
+    read_capture,
+    replay,
+)
+from app.services.scheduling_types import (
+    SchedulableTask,
+    ScheduleBlock,
+    SchedulerAvailability,
+    SchedulingConfig,
+    SchedulingRequest,
+    SchedulingResponse,
+)
+
+CONFIG = SchedulingConfig(max_scheduling_weeks=4, timezone="Europe/Berlin")
+
+
+class TestInjectableClock:
+    def test_clock_sets_start_time(
+        self,
+        task_list: list[Task],
+        schedule_item_list: list[ScheduleItem],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        now = dt.datetime(2024, 3, 4, 9, 10, tzinfo=dt.timezone.utc)
+        scheduler = GreedyScheduler(clock=lambda timezone: now)
+
+        request = scheduler.build_request(
+            task_list, schedule_item_list, weekly_availability, CONFIG
+        )
+
+        assert request.start_time == dt.datetime(
+            2024, 3, 4, 9, 30, tzinfo=dt.timezone.utc
+        )
+
+
+class TestRequestRecorder:
+    def test_recorded_run_replays_identically(
+        self,
+        tmp_path: Path,
+        task_list: list[Task],
+        schedule_item_list: list[ScheduleItem],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        scheduler = GreedyScheduler(recorder=RequestRecorder(tmp_path))
+
+        response = scheduler.schedule_tasks(
+            task_list, schedule_item_list, weekly_availability, CONFIG
+        )
+
+        [(path, run)] = list(iter_captures(tmp_path))
+        assert path.name.endswith(".json.gz")
+        assert run.response.schedule_blocks
+        assert [block.start_time for block in run.response.schedule_blocks] == [
+            block.start_time for block in response.schedule_blocks
+        ]
+        assert all(task.title == f"Task {task.id}" for task in run.request.tasks)
+        assert all(task.description is None for task in run.request.tasks)
+
+        replayed = replay(run, lambda clock: GreedyScheduler(clock=clock))
+
+        assert diff_responses(run.response, replayed).identical
+
+    def test_anytime_scheduler_records_through_its_greedy(
+        self,
+        tmp_path: Path,
+        task_list: list[Task],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        scheduler = AnytimeScheduler(
+            GreedyScheduler(recorder=RequestRecorder(tmp_path))
+        )
+
+        scheduler.schedule_tasks(task_list, [], weekly_availability, CONFIG)
+
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_sample_rate_zero_records_nothing(
+        self,
+        tmp_path: Path,
+        task_list: list[Task],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        scheduler = GreedyScheduler(recorder=RequestRecorder(tmp_path, sample_rate=0.0))
+
+        scheduler.schedule_tasks(task_list, [], weekly_availability, CONFIG)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_write_errors_do_not_fail_scheduling(
+        self,
+        tmp_path: Path,
+        task_list: list[Task],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        not_a_directory = tmp_path / "captures"
+        not_a_directory.write_text("")
+        recorder = RequestRecorder(not_a_directory)
+        scheduler = GreedyScheduler(recorder=recorder)
+
+        response = scheduler.schedule_tasks(task_list, [], weekly_availability, CONFIG)
+
+        assert response.schedule_blocks
+        assert recorder.record(*_empty_run()) is None
+
+    def test_capture_file_round_trips(self, tmp_path: Path):
+        path = RequestRecorder(tmp_path).record(*_empty_run())
+
+        assert path is not None
+        assert read_capture(path).request.start_time == _empty_run()[0].start_time
+
+
+class TestDiffResponses:
+    def test_counts_block_and_unscheduled_differences(self):
+        start = dt.datetime(2024, 1, 1, 9, tzinfo=dt.timezone.utc)
+        blocks = [
+            ScheduleBlock(
+                task_id=task_id,
+                start_time=start + dt.timedelta(hours=task_id),
+                end_time=start + dt.timedelta(hours=task_id, minutes=30),
+            )
+            for task_id in range(3)
+        ]
+        task = SchedulableTask(
+            id=9, title="Task 9", expected_duration_minutes=30, priority=2
+        )
+        expected = SchedulingResponse(schedule_blocks=blocks, warnings=[task])
+        actual = SchedulingResponse(
+            schedule_blocks=[
+                blocks[0],
+                blocks[1].model_copy(update={"end_time": blocks[2].start_time}),
+            ]
+        )
+
+        diff = diff_responses(expected, actual)
+
+        assert (diff.missing_blocks, diff.extra_blocks) == (2, 1)
+        assert diff.changed_unscheduled == 1
+        assert not diff.identical
+        assert diff_responses(expected, expected).identical
+
+
+def _empty_run() -> tuple[SchedulingRequest, SchedulingResponse]:
+    request = SchedulingRequest(
+        tasks=[],
+        busy_intervals=[],
+        scheduler_availability=SchedulerAvailability(windows={}),
+        config=CONFIG,
+        start_time=dt.datetime(2024, 1, 1, 9, tzinfo=dt.timezone.utc),
+    )
+    return request, SchedulingResponse(schedule_blocks=[])
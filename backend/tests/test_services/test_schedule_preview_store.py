@@ -0,0 +1,47 @@
+from app.services.schedule_preview_store import SchedulePreview, SchedulePreviewStore
+from app.services.scheduling_types import SchedulingResponse
+
+PREVIEW = SchedulePreview(
+    response=SchedulingResponse(schedule_blocks=[], warnings=[]),
+    item_count=0,
+    max_item_id=None,
+)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.values[key] = value.encode()
+
+    def getdel(self, key: str) -> bytes | None:
+        return self.values.pop(key, None)
+
+
+class TestSchedulePreviewStore:
+    def test_previews_belong_to_their_user(self):
+        store = SchedulePreviewStore()
+
+        preview_id = store.put(1, PREVIEW)
+
+        assert store.take(2, preview_id) is None
+        assert store.take(1, preview_id) == PREVIEW
+        assert store.take(1, preview_id) is None
+
+    def test_expired_preview_is_not_returned(self):
+        store = SchedulePreviewStore(ttl_seconds=-1)
+
+        preview_id = store.put(1, PREVIEW)
+
+        assert store.take(1, preview_id) is None
+
+    def test_redis_previews_are_shared_between_processes(self):
+        shared = _FakeRedis()
+        generating = SchedulePreviewStore(redis_client=shared)  # type: ignore[arg-type]
+        committing = SchedulePreviewStore(redis_client=shared)  # type: ignore[arg-type]
+
+        preview_id = generating.put(1, PREVIEW)
+
+        assert committing.take(1, preview_id) == PREVIEW
+        assert generating.take(1, preview_id) is None
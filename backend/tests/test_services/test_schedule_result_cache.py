@@ -0,0 +1,296 @@
+import datetime as dt
+
+import pytest
+import redis
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.auth import get_current_user_id
+from app.models.availability import WeeklyAvailability
+from app.models.schedule_item import ScheduleItem
+from app.models.task import Task
+from app.schemas.availability import DailyWindow, DayOfWeek, WeeklyAvailabilityUpdate
+from app.services import settings_service
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.schedule_result_cache import (
+    CachedScheduler,
+    ScheduleResultCache,
+    schedule_fingerprint,
+    schedule_result_cache,
+)
+from app.services.scheduling_types import SchedulingConfig, SchedulingResponse
+
+CONFIG = SchedulingConfig(max_scheduling_weeks=4)
+NOW = dt.datetime(2024, 3, 4, 9, 10, tzinfo=dt.timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_schedule_result_cache():
+    schedule_result_cache.clear()
+    yield
+    schedule_result_cache.clear()
+
+
+def _fixed_clock(_timezone: str) -> dt.datetime:
+    return NOW
+
+
+class _CountingScheduler:
+    def __init__(self):
+        self.calls = 0
+        self.greedy = GreedyScheduler()
+
+    def schedule_tasks(self, tasks, schedule_items, availability, config):
+        self.calls += 1
+        return self.greedy.schedule_tasks(tasks, schedule_items, availability, config)
+
+
+class _FakeRedis:
+    def __init__(self, failing: bool = False):
+        self.values: dict[str, bytes] = {}
+        self.failing = failing
+        self.round_trips = 0
+
+    def get(self, key: str) -> bytes | None:
+        self.round_trips += 1
+        if self.failing:
+            raise redis.ConnectionError("down")
+        return self.values.get(key)
+
+    def mget(self, *keys: str) -> list[bytes | None]:
+        self.round_trips += 1
+        if self.failing:
+            raise redis.ConnectionError("down")
+        return [self.values.get(key) for key in keys]
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        if self.failing:
+            raise redis.ConnectionError("down")
+        self.values[key] = value.encode()
+
+    def incr(self, key: str) -> int:
+        if self.failing:
+            raise redis.ConnectionError("down")
+        self.values[key] = str(int(self.values.get(key, b"0")) + 1).encode()
+        return int(self.values[key])
+
+
+class TestScheduleFingerprint:
+    def test_fingerprint_is_stable(
+        self,
+        task_list: list[Task],
+        schedule_item_list: list[ScheduleItem],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        first = schedule_fingerprint(
+            task_list, schedule_item_list, weekly_availability, CONFIG, NOW
+        )
+        second = schedule_fingerprint(
+            task_list,
+            list(reversed(schedule_item_list)),
+            weekly_availability,
+            CONFIG,
+            NOW,
+        )
+
+        assert first == second
+
+    def test_fingerprint_changes_with_inputs(
+        self,
+        session: Session,
+        task_list: list[Task],
+        schedule_item_list: list[ScheduleItem],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        original = schedule_fingerprint(
+            task_list, schedule_item_list, weekly_availability, CONFIG, NOW
+        )
+        other_config = schedule_fingerprint(
+            task_list,
+            schedule_item_list,
+            weekly_availability,
+            CONFIG.model_copy(update={"allow_splitting": False}),
+            NOW,
+        )
+        fewer_busy = schedule_fingerprint(
+            task_list, schedule_item_list[1:], weekly_availability, CONFIG, NOW
+        )
+        task_list[0].expected_duration_minutes += 15
+        edited_task = schedule_fingerprint(
+            task_list, schedule_item_list, weekly_availability, CONFIG, NOW
+        )
+
+        assert len({original, other_config, fewer_busy, edited_task}) == 4
+
+    def test_fingerprint_follows_the_scheduler_clock(
+        self,
+        task_list: list[Task],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        scheduler = CachedScheduler(_CountingScheduler(), clock=_fixed_clock)
+        scheduler.schedule_tasks(task_list, [], weekly_availability, CONFIG)
+
+        at_clock = schedule_fingerprint(
+            task_list, [], weekly_availability, CONFIG, NOW + dt.timedelta(minutes=5)
+        )
+        next_half_hour = schedule_fingerprint(
+            task_list, [], weekly_availability, CONFIG, NOW + dt.timedelta(minutes=30)
+        )
+
+        assert schedule_result_cache.get(task_list[0].user_id, at_clock) is not None
+        assert at_clock != next_half_hour
+
+
+class TestCachedScheduler:
+    def test_repeated_request_is_served_from_cache(
+        self,
+        task_list: list[Task],
+        schedule_item_list: list[ScheduleItem],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        inner = _CountingScheduler()
+        scheduler = CachedScheduler(inner)
+
+        first = scheduler.schedule_tasks(
+            task_list, schedule_item_list, weekly_availability, CONFIG
+        )
+        first.schedule_blocks.clear()
+        second = scheduler.schedule_tasks(
+            task_list, schedule_item_list, weekly_availability, CONFIG
+        )
+
+        assert inner.calls == 1
+        assert second.schedule_blocks
+        assert schedule_result_cache.hits == 1
+        assert schedule_result_cache.misses == 1
+
+    def test_diagnostics_requests_bypass_cache(
+        self,
+        task_list: list[Task],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        inner = _CountingScheduler()
+        scheduler = CachedScheduler(inner)
+        config = CONFIG.model_copy(update={"collect_diagnostics": True})
+
+        scheduler.schedule_tasks(task_list, [], weekly_availability, config)
+        response = scheduler.schedule_tasks(task_list, [], weekly_availability, config)
+
+        assert inner.calls == 2
+        assert response.diagnostics is not None
+
+    def test_task_deletion_invalidates_results(
+        self,
+        client: TestClient,
+        task_list: list[Task],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        inner = _CountingScheduler()
+        scheduler = CachedScheduler(inner, clock=_fixed_clock)
+        scheduler.schedule_tasks(task_list, [], weekly_availability, CONFIG)
+        fingerprint = schedule_fingerprint(
+            task_list, [], weekly_availability, CONFIG, NOW
+        )
+
+        task = task_list[0]
+        client.app.dependency_overrides[get_current_user_id] = lambda: task.user_id  # type: ignore[attr-defined]
+        response = client.request("DELETE", "/tasks/bulk", json=[task.id])
+
+        assert response.status_code == 204
+        assert schedule_result_cache.get(task.user_id, fingerprint) is None
+
+    def test_availability_update_invalidates_results(
+        self,
+        session: Session,
+        task_list: list[Task],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: None,
+    ):
+        scheduler = CachedScheduler(_CountingScheduler(), clock=_fixed_clock)
+        scheduler.schedule_tasks(task_list, [], weekly_availability, CONFIG)
+        fingerprint = schedule_fingerprint(
+            task_list, [], weekly_availability, CONFIG, NOW
+        )
+
+        settings_service.update_availability_setting(
+            weekly_availability.user_id,
+            WeeklyAvailabilityUpdate(
+                windows={DayOfWeek.MON: [DailyWindow(start="09:00", end="10:00")]}
+            ),
+            session,
+        )
+
+        assert schedule_result_cache.get(task_list[0].user_id, fingerprint) is None
+
+
+class TestScheduleResultCache:
+    def test_lru_evicts_oldest_result(self):
+        cache = ScheduleResultCache(max_results=2)
+        response = SchedulingResponse(schedule_blocks=[], warnings=[])
+
+        cache.put(1, "a", response)
+        cache.put(1, "b", response)
+        cache.get(1, "a")
+        cache.put(1, "c", response)
+
+        assert cache.get(1, "b") is None
+        assert cache.get(1, "a") == response
+        assert cache.get(1, "c") == response
+
+    def test_redis_tier_is_shared_between_processes(self):
+        shared = _FakeRedis()
+        writer = ScheduleResultCache(redis_client=shared)  # type: ignore[arg-type]
+        reader = ScheduleResultCache(redis_client=shared)  # type: ignore[arg-type]
+        response = SchedulingResponse(schedule_blocks=[], warnings=[])
+
+        writer.put(1, "a", response)
+        round_trips = shared.round_trips
+
+        assert reader.get(1, "a") == response
+        assert reader.hits == 1
+        assert shared.round_trips == round_trips + 1
+
+    def test_invalidate_drops_redis_results_of_user(self):
+        shared = _FakeRedis()
+        writer = ScheduleResultCache(redis_client=shared)  # type: ignore[arg-type]
+        reader = ScheduleResultCache(redis_client=shared)  # type: ignore[arg-type]
+        response = SchedulingResponse(schedule_blocks=[], warnings=[])
+        writer.put(1, "a", response)
+        writer.put(2, "a", response)
+
+        writer.invalidate(1)
+
+        assert reader.get(1, "a") is None
+        assert reader.get(2, "a") == response
+
+    def test_results_computed_before_invalidation_are_stale(self):
+        shared = _FakeRedis()
+        worker = ScheduleResultCache(redis_client=shared)  # type: ignore[arg-type]
+        other_worker = ScheduleResultCache(redis_client=shared)  # type: ignore[arg-type]
+        reader = ScheduleResultCache(redis_client=shared)  # type: ignore[arg-type]
+        response = SchedulingResponse(schedule_blocks=[], warnings=[])
+
+        assert worker.get(1, "a") is None
+        other_worker.invalidate(1)
+        worker.put(1, "a", response)
+
+        assert reader.get(1, "a") is None
+
+    def test_redis_errors_fall_back_to_process_tier(self):
+        cache = ScheduleResultCache(
+            redis_client=_FakeRedis(failing=True)  # type: ignore[arg-type]
+        )
+        response = SchedulingResponse(schedule_blocks=[], warnings=[])
+
+        cache.put(1, "a", response)
+
+        assert cache.get(1, "a") == response
+        assert cache.get(1, "b") is None
+        cache.invalidate(1)
+        assert cache.get(1, "a") is None
@@ -3,6 +3,7 @@ import datetime as dt
 import random
 from collections import deque
 
+import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
 
@@ -13,14 +14,21 @@ from app.models.task import Task
 from app.models.user import User
 from app.schemas.availability import DailyWindow as DailyWindowSchema
 from app.schemas.availability import DayOfWeek
+from app.services.availability_cache import week_expansion_cache
 from app.services.greedy_scheduler import GreedyScheduler, schedule_tasks
 from app.services.scheduling_types import (
     AvailableSlots,
     BusyInterval,
+    BusyIntervalIndex,
+    CapacityProfile,
+    FreeGapIndex,
+    PendingTask,
+    RankedTaskIndex,
     SchedulableTask,
     ScheduleBlock,
     SchedulerAvailability,
     SchedulingConfig,
+    SchedulingDiagnostics,
     SchedulingRequest,
     SchedulingResponse,
     TimeSlot,
@@ -30,6 +38,7 @@ from app.services.scheduling_utils import (
     task_to_schedulable,
     tasks_to_schedulables,
 )
+from app.services.timeline_engine import iter_free_slots
 from tests.conftest import (
     available_slots_strategy,
     busy_intervals_strategy,
@@ -587,7 +596,8 @@ class TestAvailableTimeSlots:
             index: int = 0
             daily_windows_duration: float = 0.0
             for daily_windows in st_weekly_availability.windows.values():
-                for daily_window in daily_windows:
+                # slots come out chronologically, whatever order windows were entered in
+                for daily_window in sorted(daily_windows, key=lambda w: w.start):
                     assert (
                         daily_window.start.hour  # type: ignore
                         == available_slots.slots[index].start.hour
@@ -761,6 +771,320 @@ class TestAvailableTimeSlots:
         assert available_slots.total_duration_minutes == 1020
 
 
+class TestBusyIntervalIndex:
+    @given(
+        busy_intervals_strategy(min_count=1, max_count=50),
+        st.integers(min_value=0, max_value=60 * 24 * 365),
+        st.integers(min_value=1, max_value=60 * 24 * 14),
+    )
+    def test_overlapping_matches_linear_scan(
+        self,
+        busy_intervals: list[BusyInterval],
+        offset_minutes: int,
+        window_minutes: int,
+    ):
+        base_date = dt.datetime(2023, 12, 1, tzinfo=dt.timezone.utc)
+        window_start = base_date + dt.timedelta(minutes=offset_minutes)
+        window_end = window_start + dt.timedelta(minutes=window_minutes)
+        index = BusyIntervalIndex(busy_intervals)
+
+        expected = sorted(
+            (
+                bi
+                for bi in busy_intervals
+                if bi.start_time < window_end and bi.end_time > window_start
+            ),
+            key=lambda bi: bi.start_time,
+        )
+
+        assert index.overlapping(window_start, window_end) == expected
+
+    def test_overlapping_finds_enclosing_interval(self):
+        """A long interval enclosing shorter ones must still be returned."""
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        long_busy = BusyInterval(
+            start_time=day.replace(hour=8), end_time=day.replace(hour=18)
+        )
+        short_busy = BusyInterval(
+            start_time=day.replace(hour=9), end_time=day.replace(hour=10)
+        )
+        index = BusyIntervalIndex([short_busy, long_busy])
+
+        overlapping = index.overlapping(day.replace(hour=12), day.replace(hour=13))
+
+        assert overlapping == [long_busy]
+
+    def test_overlapping_empty_window(self):
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        index = BusyIntervalIndex(
+            [
+                BusyInterval(
+                    start_time=day.replace(hour=8), end_time=day.replace(hour=18)
+                )
+            ]
+        )
+
+        assert index.overlapping(day.replace(hour=12), day.replace(hour=12)) == []
+        assert len(index) == 1
+
+    def test_schedule_respects_busy_interval_across_week_boundary(self):
+        """A busy interval starting before a week must still block that week."""
+        availability = SchedulerAvailability(
+            windows={
+                DayOfWeek.MON: [
+                    DailyWindowSchema(start=dt.time(0, 0), end=dt.time(2, 0))
+                ]
+            }
+        )
+        # Sunday 2024-01-07 22:00 -> Monday 2024-01-08 01:00
+        busy = BusyInterval(
+            start_time=dt.datetime(2024, 1, 7, 22, 0, tzinfo=dt.timezone.utc),
+            end_time=dt.datetime(2024, 1, 8, 1, 0, tzinfo=dt.timezone.utc),
+        )
+        request = SchedulingRequest(
+            tasks=[
+                SchedulableTask(
+                    id=1, title="Task", expected_duration_minutes=60, priority=1
+                )
+            ],
+            busy_intervals=[busy],
+            scheduler_availability=availability,
+            config=SchedulingConfig(max_scheduling_weeks=2),
+            start_time=dt.datetime(2024, 1, 3, 9, 0, tzinfo=dt.timezone.utc),
+        )
+
+        response = schedule(request)
+
+        assert len(response.schedule_blocks) == 1
+        assert response.schedule_blocks[0].start_time == busy.end_time
+
+
+class TestSweepFreeSlots:
+    @settings(max_examples=200)
+    @given(
+        weekly_availability_strategy(),
+        busy_intervals_strategy(
+            max_count=30,
+            min_date=dt.datetime(2024, 1, 3, tzinfo=dt.timezone.utc),
+            max_date=dt.datetime(2024, 2, 1, tzinfo=dt.timezone.utc),
+        ),
+    )
+    def test_horizon_sweep_matches_weekly_expansion(
+        self,
+        availability: SchedulerAvailability,
+        busy_intervals: list[BusyInterval],
+    ):
+        start_time = dt.datetime(2024, 1, 3, 9, 30, tzinfo=dt.timezone.utc)
+        horizon_end = dt.datetime(2024, 1, 29, tzinfo=dt.timezone.utc)
+        busy_index = BusyIntervalIndex(busy_intervals)
+
+        windows = _scheduler._expand_availability_windows(  # type: ignore[attr-defined]
+            availability, start_time, horizon_end, "UTC"
+        )
+        swept = list(_scheduler._sweep_free_slots(windows, busy_index))  # type: ignore[attr-defined]
+
+        weekly: list[TimeSlot] = []
+        week_start = start_time
+        while week_start < horizon_end:
+            weekly.extend(
+                get_available_time_slots(
+                    busy_index, availability, week_start, "UTC"
+                ).slots
+            )
+            week_start = get_next_weekday(week_start)
+
+        assert swept == weekly
+        for slot, next_slot in zip(swept, swept[1:], strict=False):
+            assert slot.start < slot.end
+            assert slot.end <= next_slot.start
+
+    def test_busy_interval_spanning_several_windows(self):
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        windows = [
+            (day.replace(hour=8), day.replace(hour=10)),
+            (day.replace(hour=11), day.replace(hour=12)),
+            (day.replace(hour=13), day.replace(hour=15)),
+        ]
+        busy_index = BusyIntervalIndex(
+            [
+                BusyInterval(
+                    start_time=day.replace(hour=9), end_time=day.replace(hour=14)
+                ),
+                BusyInterval(
+                    start_time=day.replace(hour=11),
+                    end_time=day.replace(hour=11, minute=30),
+                ),
+            ]
+        )
+
+        slots = list(_scheduler._sweep_free_slots(windows, busy_index))  # type: ignore[attr-defined]
+
+        assert [(slot.start, slot.end) for slot in slots] == [
+            (day.replace(hour=8), day.replace(hour=9)),
+            (day.replace(hour=14), day.replace(hour=15)),
+        ]
+
+    def test_overlapping_windows_do_not_produce_overlapping_slots(self):
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        windows = [
+            (day.replace(hour=8), day.replace(hour=12)),
+            (day.replace(hour=10), day.replace(hour=14)),
+        ]
+
+        slots = list(_scheduler._sweep_free_slots(windows, BusyIntervalIndex([])))  # type: ignore[attr-defined]
+
+        assert [(slot.start, slot.end) for slot in slots] == [
+            (day.replace(hour=8), day.replace(hour=12)),
+            (day.replace(hour=12), day.replace(hour=14)),
+        ]
+
+
+class TestTimelineEngine:
+    @settings(max_examples=200)
+    @given(
+        weekly_availability_strategy(),
+        busy_intervals_strategy(
+            max_count=30,
+            min_date=dt.datetime(2024, 1, 3, tzinfo=dt.timezone.utc),
+            max_date=dt.datetime(2024, 2, 1, tzinfo=dt.timezone.utc),
+        ),
+    )
+    def test_timeline_engine_matches_sweep(
+        self,
+        availability: SchedulerAvailability,
+        busy_intervals: list[BusyInterval],
+    ):
+        start_time = dt.datetime(2024, 1, 3, 9, 30, tzinfo=dt.timezone.utc)
+        busy_index = BusyIntervalIndex(busy_intervals)
+
+        for week_start in (start_time, get_next_weekday(start_time)):
+            swept = get_available_time_slots(
+                busy_index, availability, week_start, "Europe/Berlin", "sweep"
+            )
+            timeline = get_available_time_slots(
+                busy_index, availability, week_start, "Europe/Berlin", "timeline"
+            )
+
+            assert timeline.slots == swept.slots
+            assert timeline.total_duration_minutes == swept.total_duration_minutes
+
+    def test_timeline_engine_edge_cases(self):
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        windows = [
+            (day.replace(hour=8), day.replace(hour=14)),
+            (day.replace(hour=9), day.replace(hour=10)),  # nested window
+            (day.replace(hour=14), day.replace(hour=16)),  # adjacent window
+        ]
+        busy_index = BusyIntervalIndex(
+            [
+                BusyInterval(
+                    start_time=day.replace(hour=11), end_time=day.replace(hour=11)
+                ),
+                BusyInterval(
+                    start_time=day.replace(hour=12), end_time=day.replace(hour=15)
+                ),
+            ]
+        )
+
+        slots = list(iter_free_slots(windows, busy_index))
+
+        assert slots == list(_scheduler._sweep_free_slots(windows, busy_index))  # type: ignore[attr-defined]
+        assert [(slot.start, slot.end) for slot in slots] == [
+            (day.replace(hour=8), day.replace(hour=11)),
+            (day.replace(hour=11), day.replace(hour=12)),
+            (day.replace(hour=15), day.replace(hour=16)),
+        ]
+
+    def test_schedule_with_either_engine(self):
+        availability = SchedulerAvailability(
+            windows={
+                day: [DailyWindowSchema(start=dt.time(9, 0), end=dt.time(12, 0))]
+                for day in DayOfWeek
+            }
+        )
+        tasks = [
+            SchedulableTask(
+                id=i, title=f"Task {i}", expected_duration_minutes=100, priority=2
+            )
+            for i in range(1, 6)
+        ]
+        start_time = dt.datetime(2024, 1, 3, 9, 30, tzinfo=dt.timezone.utc)
+
+        responses = [
+            schedule(
+                SchedulingRequest(
+                    tasks=tasks,
+                    busy_intervals=[],
+                    scheduler_availability=availability,
+                    config=SchedulingConfig(slot_engine=engine),
+                    start_time=start_time,
+                )
+            )
+            for engine in ("sweep", "timeline")
+        ]
+
+        assert responses[0] == responses[1]
+
+
+class TestLazySlotGeneration:
+    @staticmethod
+    def _daily_availability() -> SchedulerAvailability:
+        return SchedulerAvailability(
+            windows={
+                day: [DailyWindowSchema(start=dt.time(9, 0), end=dt.time(12, 0))]
+                for day in DayOfWeek
+            }
+        )
+
+    def test_schedule_expands_only_needed_weeks(self):
+        week_expansion_cache.clear()
+        tasks = [
+            SchedulableTask(
+                id=i, title=f"Task {i}", expected_duration_minutes=60, priority=2
+            )
+            for i in range(1, 4)
+        ]
+
+        response = schedule(
+            SchedulingRequest(
+                tasks=tasks,
+                busy_intervals=[],
+                scheduler_availability=self._daily_availability(),
+                config=SchedulingConfig(max_scheduling_weeks=12),
+                start_time=dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc),
+            )
+        )
+
+        assert len(response.schedule_blocks) == 3
+        assert week_expansion_cache.misses == 1
+        week_expansion_cache.clear()
+
+    def test_placement_stops_pulling_slots(self):
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        pulled: list[TimeSlot] = []
+
+        def slots():
+            for hour in range(8, 20):
+                slot = TimeSlot(
+                    start=day.replace(hour=hour), end=day.replace(hour=hour, minute=30)
+                )
+                pulled.append(slot)
+                yield slot
+
+        tasks = [
+            SchedulableTask(
+                id=i, title=f"Task {i}", expected_duration_minutes=45, priority=2
+            )
+            for i in range(1, 3)
+        ]
+
+        schedule_blocks, unscheduled = place_tasks_in_slots(tasks, slots(), True)
+
+        assert unscheduled == []
+        assert len(schedule_blocks) == 4
+        assert len(pulled) == 3
+
+
 class TestPlaceTasksInSlots:
     @given(
         tasks=st.lists(schedulable_task_strategy(), min_size=5, max_size=100),
@@ -1397,6 +1721,890 @@ class TestPlaceTasksInSlots:
         _remove_task_from_deque(tasks, non_existent_task)
         assert len(tasks) == original_length
 
+    def test_place_tasks_does_not_mutate_input_tasks(self):
+        """Splitting happens on the internal representation, not on the input."""
+        task = SchedulableTask(
+            id=1, title="Long Task", expected_duration_minutes=120, priority=1
+        )
+        slots = AvailableSlots(
+            slots=[
+                TimeSlot(
+                    start=dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc),
+                    end=dt.datetime(2024, 1, 1, 10, 0, tzinfo=dt.timezone.utc),
+                )
+            ]
+        )
+
+        schedule_blocks, unscheduled_tasks = place_tasks_in_slots(
+            [task], slots, split_tasks=True
+        )
+
+        assert task.expected_duration_minutes == 120
+        assert isinstance(schedule_blocks[0], ScheduleBlock)
+        assert isinstance(unscheduled_tasks[0], SchedulableTask)
+        assert unscheduled_tasks[0].expected_duration_minutes == 60
+
+    def test_pending_task_round_trip_and_split(self):
+        deadline = dt.datetime(2024, 1, 2, 12, 0, tzinfo=dt.timezone.utc)
+        task = SchedulableTask(
+            id=7,
+            title="Task",
+            description="Description",
+            expected_duration_minutes=90,
+            deadline=deadline,
+            priority=3,
+        )
+        pending = PendingTask.from_schedulable(task)
+
+        remainder = pending.split(30)
+
+        assert pending.expected_duration_minutes == 30
+        assert remainder.expected_duration_minutes == 60
+        assert remainder.id == task.id
+        assert remainder.deadline == deadline
+        assert PendingTask.from_schedulable(task).to_schedulable() == task
+
+    @given(
+        available_slots_strategy(),
+        st.lists(schedulable_task_strategy(), min_size=1, max_size=100),
+    )
+    def test_no_splitting_matches_deque_placement(
+        self,
+        available_slots: AvailableSlots,
+        tasks: list[SchedulableTask],
+    ):
+        unique_tasks = {task.id: task for task in tasks}
+        ranked_tasks = rank_tasks(list(unique_tasks.values()), now_utc())
+
+        remaining_tasks = deque(ranked_tasks)
+        expected_blocks: list[ScheduleBlock] = []
+        for slot in available_slots.slots:
+            expected_blocks.extend(
+                block.to_schedule_block()
+                for block in _fill_single_slot(slot, remaining_tasks, False)
+            )
+
+        schedule_blocks, unscheduled_tasks = place_tasks_in_slots(
+            ranked_tasks, available_slots, split_tasks=False
+        )
+
+        assert schedule_blocks == expected_blocks
+        assert unscheduled_tasks == list(remaining_tasks)
+
+    @given(
+        available_slots_strategy(),
+        st.lists(schedulable_task_strategy(), min_size=1, max_size=100),
+        st.sampled_from([15, 30, 60]),
+    )
+    def test_minimum_split_matches_deque_placement(
+        self,
+        available_slots: AvailableSlots,
+        tasks: list[SchedulableTask],
+        min_split_minutes: int,
+    ):
+        unique_tasks = {task.id: task for task in tasks}
+        ranked_tasks = rank_tasks(list(unique_tasks.values()), now_utc())
+
+        remaining_tasks = deque(copy.deepcopy(ranked_tasks))
+        expected_blocks: list[ScheduleBlock] = []
+        for slot in available_slots.slots:
+            expected_blocks.extend(
+                block.to_schedule_block()
+                for block in _fill_single_slot(
+                    slot, remaining_tasks, True, None, min_split_minutes
+                )
+            )
+
+        schedule_blocks, unscheduled_tasks = place_tasks_in_slots(
+            ranked_tasks,
+            available_slots,
+            split_tasks=True,
+            min_split_minutes=min_split_minutes,
+        )
+
+        assert schedule_blocks == expected_blocks
+        assert unscheduled_tasks == list(remaining_tasks)
+
+
+class TestRankedTaskIndex:
+    @staticmethod
+    def _pending(task_id: int, duration: int) -> PendingTask:
+        return PendingTask(task_id, f"Task {task_id}", None, duration, None, 1)
+
+    def test_pops_highest_ranked_fitting_task(self):
+        index = RankedTaskIndex(
+            [self._pending(1, 120), self._pending(2, 45), self._pending(3, 30)]
+        )
+
+        first = index.pop_first_fitting(60)
+        second = index.pop_first_fitting(60)
+
+        assert first is not None and first.id == 2
+        assert second is not None and second.id == 3
+        assert index.pop_first_fitting(60) is None
+        assert len(index) == 1
+        assert [task.id for task in index.remaining_tasks()] == [1]
+
+    def test_remaining_tasks_keep_rank_order(self):
+        index = RankedTaskIndex(
+            [self._pending(task_id, 10 * task_id) for task_id in range(1, 8)]
+        )
+
+        index.pop_first_fitting(35)
+        index.pop_first_fitting(35)
+
+        assert [task.id for task in index.remaining_tasks()] == [3, 4, 5, 6, 7]
+
+    def test_split_first_keeps_remainder_in_rank(self):
+        index = RankedTaskIndex([self._pending(1, 90), self._pending(2, 45)])
+
+        part = index.split_first(30)
+
+        assert (part.id, part.expected_duration_minutes) == (1, 30)
+        assert index.pop_first_fitting(50) is not None
+        first = index.first()
+        assert first is not None
+        assert (first.id, first.expected_duration_minutes) == (1, 60)
+        assert index.pop_first_fitting(60) is first
+        assert index.first() is None
+
+    def test_empty_index(self):
+        index = RankedTaskIndex([])
+
+        assert len(index) == 0
+        assert index.first() is None
+        assert index.pop_first_fitting(1000) is None
+        assert index.remaining_tasks() == []
+
+
+class TestFreeGapIndex:
+    @staticmethod
+    def _slots(*hours: tuple[int, int, int, int]) -> list[TimeSlot]:
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        return [
+            TimeSlot(
+                start=day.replace(hour=start_hour, minute=start_minute),
+                end=day.replace(hour=end_hour, minute=end_minute),
+            )
+            for start_hour, start_minute, end_hour, end_minute in hours
+        ]
+
+    def test_first_fitting_finds_earliest_slot(self):
+        gaps = FreeGapIndex(self._slots((8, 0, 8, 30), (9, 0, 11, 0), (12, 0, 13, 0)))
+
+        assert gaps.first_fitting(30) == 0
+        assert gaps.first_fitting(45) == 1
+        assert gaps.first_fitting(121) is None
+
+    def test_take_shrinks_slot_from_start(self):
+        slots = self._slots((9, 0, 11, 0), (12, 0, 13, 0))
+        gaps = FreeGapIndex(slots)
+
+        taken = gaps.take(0, 90)
+
+        assert taken == TimeSlot(
+            start=slots[0].start, end=slots[0].start + dt.timedelta(minutes=90)
+        )
+        assert gaps.free_minutes(0) == 30
+        assert gaps.first_fitting(45) == 1
+        assert gaps.slots() == [
+            TimeSlot(start=taken.end, end=slots[0].end),
+            slots[1],
+        ]
+
+    def test_advance_drops_past_free_time(self):
+        slots = self._slots((8, 0, 9, 0), (10, 0, 12, 0))
+        gaps = FreeGapIndex(slots)
+
+        gaps.advance(slots[1].start + dt.timedelta(minutes=30))
+
+        assert gaps.first_fitting(60) == 1
+        assert gaps.first_fitting(91) is None
+        assert gaps.slots() == [
+            TimeSlot(start=slots[1].start + dt.timedelta(minutes=30), end=slots[1].end)
+        ]
+
+    def test_empty_index(self):
+        gaps = FreeGapIndex([])
+
+        assert len(gaps) == 0
+        assert gaps.first_fitting(1) is None
+        assert gaps.slots() == []
+
+    def test_free_minutes_before_follows_takes(self):
+        slots = self._slots((8, 0, 9, 0), (10, 0, 12, 0), (13, 0, 14, 0))
+        gaps = FreeGapIndex(slots)
+        day = slots[0].start
+
+        assert gaps.free_minutes_before(day.replace(hour=11)) == 120
+        assert gaps.free_minutes_before(day.replace(hour=23)) == 240
+
+        gaps.take(1, 90)
+        gaps.advance(day.replace(hour=8, minute=30))
+
+        assert gaps.free_minutes_before(day.replace(hour=11)) == 30
+        assert gaps.free_minutes_before(day.replace(hour=12)) == 60
+        assert gaps.free_minutes_before(day.replace(hour=23)) == 120
+        assert gaps.free_minutes_before(day) == 0
+
+
+class TestAddTasks:
+    start_time = dt.datetime(2024, 1, 3, 9, 30, tzinfo=dt.timezone.utc)
+
+    @settings(max_examples=100)
+    @given(
+        weekly_availability_strategy(),
+        busy_intervals_strategy(
+            max_count=30,
+            min_date=dt.datetime(2024, 1, 3, tzinfo=dt.timezone.utc),
+            max_date=dt.datetime(2024, 2, 1, tzinfo=dt.timezone.utc),
+        ),
+        schedulable_task_strategy(),
+        st.booleans(),
+    )
+    def test_single_task_matches_full_schedule(
+        self,
+        availability: SchedulerAvailability,
+        busy_intervals: list[BusyInterval],
+        task: SchedulableTask,
+        allow_splitting: bool,
+    ):
+        config = SchedulingConfig(
+            max_scheduling_weeks=4, allow_splitting=allow_splitting
+        )
+        free_gaps = _scheduler._build_free_gaps(  # type: ignore[attr-defined]
+            busy_intervals, availability, config, self.start_time
+        )
+
+        incremental = _scheduler._add_tasks(  # type: ignore[attr-defined]
+            [task.model_copy()], free_gaps, self.start_time, allow_splitting
+        )
+        full = schedule(
+            SchedulingRequest(
+                tasks=[task.model_copy()],
+                busy_intervals=busy_intervals,
+                scheduler_availability=availability,
+                config=config,
+                start_time=self.start_time,
+            )
+        )
+
+        assert incremental.schedule_blocks == full.schedule_blocks
+        assert incremental.warnings == full.warnings
+
+    @settings(max_examples=100)
+    @given(
+        weekly_availability_strategy(),
+        busy_intervals_strategy(
+            max_count=30,
+            min_date=dt.datetime(2024, 1, 3, tzinfo=dt.timezone.utc),
+            max_date=dt.datetime(2024, 2, 1, tzinfo=dt.timezone.utc),
+        ),
+        st.lists(schedulable_task_strategy(), min_size=1, max_size=10),
+        st.booleans(),
+    )
+    def test_updated_gaps_match_rebuilt_gaps(
+        self,
+        availability: SchedulerAvailability,
+        busy_intervals: list[BusyInterval],
+        tasks: list[SchedulableTask],
+        allow_splitting: bool,
+    ):
+        config = SchedulingConfig(
+            max_scheduling_weeks=4, allow_splitting=allow_splitting
+        )
+        free_gaps = _scheduler._build_free_gaps(  # type: ignore[attr-defined]
+            busy_intervals, availability, config, self.start_time
+        )
+
+        response = _scheduler._add_tasks(  # type: ignore[attr-defined]
+            tasks, free_gaps, self.start_time, allow_splitting
+        )
+        rebuilt = _scheduler._build_free_gaps(  # type: ignore[attr-defined]
+            busy_intervals
+            + [
+                BusyInterval(start_time=block.start_time, end_time=block.end_time)
+                for block in response.schedule_blocks
+            ],
+            availability,
+            config,
+            self.start_time,
+        )
+
+        assert free_gaps.slots() == rebuilt.slots()
+
+    def test_add_tasks_without_tasks(self):
+        response = _scheduler.add_tasks([], FreeGapIndex([]), SchedulingConfig())
+
+        assert response == SchedulingResponse(schedule_blocks=[], warnings=[])
+
+
+class TestEdfPlacement:
+    start_time = dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc)
+
+    def _request(
+        self, tasks: list[SchedulableTask], allow_splitting: bool
+    ) -> SchedulingRequest:
+        return SchedulingRequest(
+            tasks=tasks,
+            busy_intervals=[
+                BusyInterval(
+                    start_time=dt.datetime(2024, 1, 1, 10, tzinfo=dt.timezone.utc),
+                    end_time=dt.datetime(2024, 1, 1, 10, 30, tzinfo=dt.timezone.utc),
+                )
+            ],
+            scheduler_availability=TestLazySlotGeneration._daily_availability(),
+            config=SchedulingConfig(
+                max_scheduling_weeks=2,
+                allow_splitting=allow_splitting,
+                placement="edf",
+            ),
+            start_time=self.start_time,
+        )
+
+    def test_reports_task_that_cannot_meet_deadline(self):
+        tasks = [
+            SchedulableTask(
+                id=1,
+                title="Urgent",
+                expected_duration_minutes=60,
+                deadline=self.start_time + dt.timedelta(hours=2),
+                priority=1,
+            ),
+            SchedulableTask(
+                id=2,
+                title="Too long",
+                expected_duration_minutes=240,
+                deadline=self.start_time + dt.timedelta(hours=4),
+                priority=1,
+            ),
+            SchedulableTask(
+                id=3, title="Open", expected_duration_minutes=60, priority=2
+            ),
+        ]
+
+        response = schedule(self._request(tasks, allow_splitting=True))
+
+        assert response.infeasible_task_ids == [2]
+        assert [task.id for task in response.warnings] == [2]
+        assert [
+            (block.task_id, block.start_time.hour, block.start_time.minute)
+            for block in response.schedule_blocks
+        ] == [(1, 9, 0), (3, 10, 30)]
+
+    def test_unsplit_task_needs_contiguous_gap_before_deadline(self):
+        tasks = [
+            SchedulableTask(
+                id=1,
+                title="Contiguous",
+                expected_duration_minutes=90,
+                deadline=self.start_time + dt.timedelta(hours=2, minutes=45),
+                priority=1,
+            ),
+        ]
+
+        split = schedule(self._request(tasks, allow_splitting=True))
+        unsplit = schedule(self._request(tasks, allow_splitting=False))
+
+        assert split.infeasible_task_ids == []
+        assert len(split.schedule_blocks) == 2
+        assert unsplit.infeasible_task_ids == [1]
+        assert unsplit.schedule_blocks == []
+
+    def test_gaps_below_minimum_split_do_not_meet_deadline(self):
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        slots = [
+            TimeSlot(start=day.replace(hour=8), end=day.replace(hour=8, minute=10)),
+            TimeSlot(
+                start=day.replace(hour=8, minute=20),
+                end=day.replace(hour=8, minute=30),
+            ),
+            TimeSlot(
+                start=day.replace(hour=8, minute=40),
+                end=day.replace(hour=8, minute=50),
+            ),
+            TimeSlot(start=day.replace(hour=12), end=day.replace(hour=14)),
+        ]
+        free_gaps = FreeGapIndex(slots)
+        task = SchedulableTask(
+            id=1,
+            title="Due at nine",
+            expected_duration_minutes=30,
+            deadline=day.replace(hour=9),
+            priority=1,
+        )
+
+        blocks, unscheduled, infeasible_task_ids = _scheduler._place_edf(  # type: ignore[attr-defined]
+            [task], free_gaps, True, 15
+        )
+
+        assert blocks == []
+        assert [(task.id, task.expected_duration_minutes) for task in unscheduled] == [
+            (1, 30)
+        ]
+        assert infeasible_task_ids == [1]
+        assert free_gaps.slots() == slots
+
+    @settings(max_examples=100)
+    @given(
+        weekly_availability_strategy(),
+        busy_intervals_strategy(
+            max_count=20,
+            min_date=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc),
+            max_date=dt.datetime(2024, 1, 15, tzinfo=dt.timezone.utc),
+        ),
+        st.lists(schedulable_task_strategy(), min_size=1, max_size=15),
+        st.booleans(),
+        st.sampled_from([0, 15]),
+    )
+    def test_deadline_tasks_are_never_placed_late(
+        self,
+        availability: SchedulerAvailability,
+        busy_intervals: list[BusyInterval],
+        tasks: list[SchedulableTask],
+        allow_splitting: bool,
+        min_split_minutes: int,
+    ):
+        tasks = [
+            task.model_copy(update={"id": task_id})
+            for task_id, task in enumerate(tasks, start=1)
+        ]
+        response = schedule(
+            SchedulingRequest(
+                tasks=tasks,
+                busy_intervals=busy_intervals,
+                scheduler_availability=availability,
+                config=SchedulingConfig(
+                    max_scheduling_weeks=2,
+                    allow_splitting=allow_splitting,
+                    min_split_minutes=min_split_minutes,
+                    placement="edf",
+                ),
+                start_time=self.start_time,
+            )
+        )
+
+        deadlines = {task.id: task.deadline for task in tasks}
+        for block in response.schedule_blocks:
+            deadline = deadlines[block.task_id]
+            assert deadline is None or block.end_time <= deadline
+            assert block.task_id not in response.infeasible_task_ids
+        assert set(response.infeasible_task_ids) <= {
+            task.id for task in response.warnings
+        }
+
+
+class TestCapacityPrecheck:
+    start_time = dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc)
+
+    def test_profile_pulls_only_needed_slots(self):
+        day = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+        pulled: list[TimeSlot] = []
+
+        def slots():
+            for hour in range(8, 20):
+                slot = TimeSlot(
+                    start=day.replace(hour=hour), end=day.replace(hour=hour, minute=30)
+                )
+                pulled.append(slot)
+                yield slot
+
+        capacity = CapacityProfile(slots())
+
+        assert capacity.covers(60)
+        assert len(pulled) == 2
+        assert capacity.minutes_before(day.replace(hour=10, minute=15)) == 75
+        assert len(pulled) == 3
+        assert list(capacity) == pulled
+        assert len(pulled) == 12
+        assert capacity.total_minutes() == 360
+        assert not capacity.covers(361)
+
+    @settings(max_examples=100)
+    @given(
+        weekly_availability_strategy(),
+        busy_intervals_strategy(
+            max_count=20,
+            min_date=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc),
+            max_date=dt.datetime(2024, 1, 15, tzinfo=dt.timezone.utc),
+        ),
+        st.lists(schedulable_task_strategy(), min_size=1, max_size=20),
+        st.booleans(),
+    )
+    def test_precheck_does_not_change_the_schedule(
+        self,
+        availability: SchedulerAvailability,
+        busy_intervals: list[BusyInterval],
+        tasks: list[SchedulableTask],
+        allow_splitting: bool,
+    ):
+        config = SchedulingConfig(
+            max_scheduling_weeks=2, allow_splitting=allow_splitting
+        )
+        windows = _scheduler._expand_availability_windows(  # type: ignore[attr-defined]
+            availability,
+            self.start_time,
+            _scheduler._horizon_end(self.start_time, config),  # type: ignore[attr-defined]
+            config.timezone,
+        )
+        all_slots = list(
+            _scheduler._sweep_free_slots(  # type: ignore[attr-defined]
+                windows, BusyIntervalIndex(busy_intervals)
+            )
+        )
+        expected_blocks, expected_unscheduled = place_tasks_in_slots(
+            rank_tasks(copy.deepcopy(tasks), self.start_time),
+            all_slots,
+            allow_splitting,
+        )
+        expected_blocks = _scheduler._coalesce_blocks(  # type: ignore[attr-defined]
+            expected_blocks
+        )
+
+        response = schedule(
+            SchedulingRequest(
+                tasks=copy.deepcopy(tasks),
+                busy_intervals=busy_intervals,
+                scheduler_availability=availability,
+                config=config,
+                start_time=self.start_time,
+            )
+        )
+
+        assert response.schedule_blocks == expected_blocks
+        assert [
+            (task.id, task.expected_duration_minutes) for task in response.warnings
+        ] == [
+            (task.id, task.expected_duration_minutes) for task in expected_unscheduled
+        ]
+
+    def test_overflow_keeps_warnings_in_rank_order(self):
+        tasks = [
+            SchedulableTask(
+                id=1, title="Too long", expected_duration_minutes=120, priority=0
+            ),
+            SchedulableTask(
+                id=2, title="Fits", expected_duration_minutes=60, priority=1
+            ),
+            SchedulableTask(
+                id=3, title="Late", expected_duration_minutes=60, priority=2
+            ),
+        ]
+        availability = SchedulerAvailability(
+            windows={
+                DayOfWeek.WED: [
+                    DailyWindowSchema(start=dt.time(9, 0), end=dt.time(10, 0))
+                ]
+            }
+        )
+
+        response = schedule(
+            SchedulingRequest(
+                tasks=tasks,
+                busy_intervals=[],
+                scheduler_availability=availability,
+                config=SchedulingConfig(max_scheduling_weeks=1, allow_splitting=False),
+                start_time=self.start_time,
+            )
+        )
+
+        assert [block.task_id for block in response.schedule_blocks] == [2]
+        assert [task.id for task in response.warnings] == [1, 3]
+
+    def test_report_overflow_and_late_tasks(self):
+        tasks = [
+            SchedulableTask(
+                id=1,
+                title="Due soon",
+                expected_duration_minutes=120,
+                deadline=self.start_time + dt.timedelta(hours=2),
+                priority=1,
+            ),
+            SchedulableTask(
+                id=2,
+                title="Due later",
+                expected_duration_minutes=60,
+                deadline=self.start_time + dt.timedelta(days=1, hours=1),
+                priority=1,
+            ),
+            SchedulableTask(
+                id=3, title="Open", expected_duration_minutes=120, priority=2
+            ),
+            SchedulableTask(
+                id=4, title="Overflow", expected_duration_minutes=60, priority=3
+            ),
+        ]
+        availability = SchedulerAvailability(
+            windows={
+                DayOfWeek.MON: [
+                    DailyWindowSchema(start=dt.time(9, 0), end=dt.time(12, 0))
+                ],
+                DayOfWeek.TUE: [
+                    DailyWindowSchema(start=dt.time(9, 0), end=dt.time(10, 0))
+                ],
+            }
+        )
+
+        report = _scheduler._capacity_report(  # type: ignore[attr-defined]
+            SchedulingRequest(
+                tasks=tasks,
+                busy_intervals=[
+                    BusyInterval(
+                        start_time=dt.datetime(2024, 1, 1, 9, tzinfo=dt.timezone.utc),
+                        end_time=dt.datetime(2024, 1, 1, 10, tzinfo=dt.timezone.utc),
+                    )
+                ],
+                scheduler_availability=availability,
+                config=SchedulingConfig(max_scheduling_weeks=1),
+                start_time=self.start_time,
+            )
+        )
+
+        assert report.demand_minutes == 360
+        assert report.capacity_minutes == 180
+        assert report.overflow_task_ids == [3, 4]
+        assert report.late_task_ids == [1]
+        assert [
+            (bucket.demand_minutes, bucket.capacity_minutes)
+            for bucket in report.deadline_buckets
+        ] == [(120, 60), (180, 180)]
+
+
+class TestAdaptiveHorizon:
+    start_time = dt.datetime(2024, 1, 3, 9, 0, tzinfo=dt.timezone.utc)
+
+    def _request(self, task_count: int, max_weeks: int) -> SchedulingRequest:
+        return SchedulingRequest(
+            tasks=[
+                SchedulableTask(
+                    id=i, title=f"Task {i}", expected_duration_minutes=180, priority=2
+                )
+                for i in range(1, task_count + 1)
+            ],
+            busy_intervals=[],
+            scheduler_availability=TestLazySlotGeneration._daily_availability(),
+            config=SchedulingConfig(max_scheduling_weeks=max_weeks),
+            start_time=self.start_time,
+        )
+
+    def test_light_workload_stays_in_first_week(self):
+        week_expansion_cache.clear()
+
+        response = schedule(self._request(task_count=3, max_weeks=52))
+
+        assert response.horizon_weeks == 1
+        assert response.warnings == []
+        assert week_expansion_cache.misses == 1
+        week_expansion_cache.clear()
+
+    def test_heavy_backlog_extends_past_twelve_weeks(self):
+        response = schedule(self._request(task_count=100, max_weeks=26))
+
+        assert response.warnings == []
+        assert response.horizon_weeks == 15
+        assert response.schedule_blocks[-1].start_time.date() == dt.date(2024, 4, 11)
+
+    def test_horizon_is_capped_by_limit(self):
+        response = schedule(self._request(task_count=100, max_weeks=4))
+
+        assert response.horizon_weeks == 4
+        assert len(response.schedule_blocks) == 26
+        assert len(response.warnings) == 74
+
+
+class TestMinimumSplitAndCoalescing:
+    start_time = dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc)
+
+    def _request(
+        self,
+        tasks: list[SchedulableTask],
+        windows: list[tuple[dt.time, dt.time]],
+        min_split_minutes: int,
+    ) -> SchedulingRequest:
+        return SchedulingRequest(
+            tasks=tasks,
+            busy_intervals=[],
+            scheduler_availability=SchedulerAvailability(
+                windows={
+                    DayOfWeek.MON: [
+                        DailyWindowSchema(start=start, end=end)
+                        for start, end in windows
+                    ]
+                }
+            ),
+            config=SchedulingConfig(
+                max_scheduling_weeks=1,
+                min_split_minutes=min_split_minutes,
+                collect_diagnostics=True,
+            ),
+            start_time=self.start_time,
+        )
+
+    def test_split_keeps_both_parts_above_minimum(self):
+        tasks = [
+            SchedulableTask(id=1, title="A", expected_duration_minutes=60, priority=1)
+        ]
+        windows = [(dt.time(9, 0), dt.time(9, 50)), (dt.time(11, 0), dt.time(13, 0))]
+
+        unrestricted = schedule(self._request(tasks, windows, min_split_minutes=0))
+        restricted = schedule(self._request(tasks, windows, min_split_minutes=15))
+
+        def minutes(response: SchedulingResponse) -> list[int]:
+            return [
+                int((block.end_time - block.start_time).total_seconds() / 60)
+                for block in response.schedule_blocks
+            ]
+
+        assert minutes(unrestricted) == [50, 10]
+        assert minutes(restricted) == [45, 15]
+
+    def test_short_task_is_not_split(self):
+        tasks = [
+            SchedulableTask(id=1, title="A", expected_duration_minutes=25, priority=1)
+        ]
+        windows = [(dt.time(9, 0), dt.time(9, 20)), (dt.time(11, 0), dt.time(12, 0))]
+
+        response = schedule(self._request(tasks, windows, min_split_minutes=15))
+
+        assert [
+            (block.start_time.hour, block.end_time.minute)
+            for block in response.schedule_blocks
+        ] == [(11, 25)]
+
+    def test_parts_of_touching_slots_are_coalesced(self):
+        tasks = [
+            SchedulableTask(id=1, title="A", expected_duration_minutes=400, priority=1)
+        ]
+        windows = [(dt.time(9, 0), dt.time(12, 0)), (dt.time(12, 0), dt.time(17, 0))]
+
+        response = schedule(self._request(tasks, windows, min_split_minutes=0))
+
+        assert len(response.schedule_blocks) == 1
+        block = response.schedule_blocks[0]
+        assert (block.start_time.hour, block.end_time.hour) == (9, 15)
+        assert response.diagnostics is not None
+        assert response.diagnostics.counts["coalesced_blocks"] == 1
+
+    @given(
+        available_slots_strategy(),
+        st.lists(schedulable_task_strategy(), min_size=1, max_size=30),
+        st.sampled_from([15, 30]),
+    )
+    def test_no_split_part_below_minimum(
+        self,
+        available_slots: AvailableSlots,
+        tasks: list[SchedulableTask],
+        min_split_minutes: int,
+    ):
+        tasks = list({task.id: task for task in tasks}.values())
+        durations = {task.id: task.expected_duration_minutes for task in tasks}
+
+        schedule_blocks, unscheduled_tasks = place_tasks_in_slots(
+            rank_tasks(tasks, self.start_time),
+            available_slots,
+            split_tasks=True,
+            min_split_minutes=min_split_minutes,
+        )
+
+        parts: dict[int, list[int]] = {}
+        for block in schedule_blocks:
+            parts.setdefault(block.task_id, []).append(
+                int((block.end_time - block.start_time).total_seconds() / 60)
+            )
+        for task in unscheduled_tasks:
+            parts.setdefault(task.id, []).append(task.expected_duration_minutes)
+        for task_id, minutes in parts.items():
+            assert sum(minutes) == durations[task_id]
+            if len(minutes) > 1:
+                assert min(minutes) >= min_split_minutes
+
+
+class TestSchedulingDiagnostics:
+    start_time = dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc)
+
+    def _request(self, allow_splitting: bool, collect: bool) -> SchedulingRequest:
+        return SchedulingRequest(
+            tasks=[
+                SchedulableTask(
+                    id=1, title="Long", expected_duration_minutes=240, priority=1
+                ),
+                SchedulableTask(
+                    id=2, title="Short", expected_duration_minutes=60, priority=2
+                ),
+            ],
+            busy_intervals=[
+                BusyInterval(
+                    start_time=dt.datetime(2024, 1, 1, 11, tzinfo=dt.timezone.utc),
+                    end_time=dt.datetime(2024, 1, 1, 11, 30, tzinfo=dt.timezone.utc),
+                )
+            ],
+            scheduler_availability=TestLazySlotGeneration._daily_availability(),
+            config=SchedulingConfig(
+                allow_splitting=allow_splitting, collect_diagnostics=collect
+            ),
+            start_time=self.start_time,
+        )
+
+    def test_diagnostics_are_opt_in(self):
+        response = schedule(self._request(allow_splitting=True, collect=False))
+
+        assert response.diagnostics is None
+
+    @pytest.mark.parametrize("allow_splitting", [True, False])
+    def test_diagnostics_do_not_change_the_schedule(self, allow_splitting: bool):
+        plain = schedule(self._request(allow_splitting, collect=False))
+        measured = schedule(self._request(allow_splitting, collect=True))
+
+        assert measured.schedule_blocks == plain.schedule_blocks
+        assert measured.warnings == plain.warnings
+
+    def test_records_phases_and_splits(self):
+        response = schedule(self._request(allow_splitting=True, collect=True))
+
+        diagnostics = response.diagnostics
+        assert diagnostics is not None
+        assert set(diagnostics.phase_ms) == {
+            "ranking",
+            "busy_filtering",
+            "slot_expansion",
+            "placement",
+        }
+        assert all(ms >= 0 for ms in diagnostics.phase_ms.values())
+        assert len(diagnostics.week_expansion_ms) == 1
+        assert diagnostics.counts["tasks"] == 2
+        assert diagnostics.counts["splits"] == 2
+        assert diagnostics.counts["schedule_blocks"] == 4
+        assert diagnostics.counts["free_slots"] == 3
+
+    def test_counts_best_fit_lookups_without_splitting(self):
+        response = schedule(self._request(allow_splitting=False, collect=True))
+
+        diagnostics = response.diagnostics
+        assert diagnostics is not None
+        assert "splits" not in diagnostics.counts
+        assert diagnostics.counts["best_fit_lookups"] > 0
+        assert diagnostics.counts["unscheduled_tasks"] == 1
+
+    def test_hook_receives_diagnostics_including_task_conversion(
+        self,
+        task_list: list[Task],
+        schedule_item_list: list[ScheduleItem],
+        weekly_availability: WeeklyAvailability,
+        daily_windows: list[DailyWindowSchema],
+    ):
+        received: list[SchedulingDiagnostics] = []
+        scheduler = GreedyScheduler(diagnostics_hook=received.append)
+
+        response = scheduler.schedule_tasks(
+            task_list, schedule_item_list, weekly_availability, SchedulingConfig()
+        )
+
+        assert response.diagnostics is None
+        assert len(received) == 1
+        assert "task_conversion" in received[0].phase_ms
+        assert received[0].counts["tasks"] == len(task_list)
+        assert received[0].counts["schedule_blocks"] == len(response.schedule_blocks)
+
 
 class TestSchedulingCore:
     def test_schedule_tasks_main_function(
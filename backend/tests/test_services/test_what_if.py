@@ -0,0 +1,105 @@
+import datetime as dt
+
+import pytest
+
+from app.schemas.availability import DailyWindow as DailyWindowSchema
+from app.schemas.availability import DayOfWeek
+from app.services import what_if
+from app.services.greedy_scheduler import GreedyScheduler
+from app.services.scheduling_types import (
+    SchedulableTask,
+    SchedulerAvailability,
+    SchedulingConfig,
+    SchedulingRequest,
+)
+from app.services.what_if import compare_configs
+
+START_TIME = dt.datetime(2024, 1, 1, 9, 0, tzinfo=dt.timezone.utc)
+
+
+def _request() -> SchedulingRequest:
+    return SchedulingRequest(
+        tasks=[
+            SchedulableTask(id=1, title="A", expected_duration_minutes=90, priority=1),
+            SchedulableTask(id=2, title="B", expected_duration_minutes=60, priority=2),
+        ],
+        busy_intervals=[],
+        scheduler_availability=SchedulerAvailability(
+            windows={
+                day: [
+                    DailyWindowSchema(start=dt.time(9, 0), end=dt.time(10, 0)),
+                    DailyWindowSchema(start=dt.time(11, 0), end=dt.time(11, 45)),
+                ]
+                for day in DayOfWeek
+            }
+        ),
+        config=SchedulingConfig(max_scheduling_weeks=2),
+        start_time=START_TIME,
+    )
+
+
+CONFIGS = [
+    SchedulingConfig(max_scheduling_weeks=2, allow_splitting=True),
+    SchedulingConfig(max_scheduling_weeks=2, allow_splitting=False),
+]
+
+
+class TestCompareConfigs:
+    def test_reports_each_variant_in_order(self):
+        splitting, whole = compare_configs(_request(), CONFIGS, parallel=False)
+
+        assert splitting.config.allow_splitting
+        assert splitting.unscheduled_count == 0
+        assert splitting.fragmentation > 1.0
+        assert not whole.config.allow_splitting
+        assert whole.unscheduled_task_ids == [1]
+        assert whole.fragmentation == 1.0
+        assert whole.duration_ms >= 0
+
+    def test_process_pool_matches_inline_run(self):
+        inline = compare_configs(_request(), CONFIGS, parallel=False)
+        pooled = compare_configs(_request(), CONFIGS, parallel=True)
+
+        assert [result.schedule_blocks for result in pooled] == [
+            result.schedule_blocks for result in inline
+        ]
+        assert [result.unscheduled_task_ids for result in pooled] == [
+            result.unscheduled_task_ids for result in inline
+        ]
+
+    def test_small_comparisons_run_inline(self, monkeypatch: pytest.MonkeyPatch):
+        def fail(_variants):
+            raise AssertionError("small comparisons must not use the pool")
+
+        monkeypatch.setattr(what_if, "_run_in_pool", fail)
+
+        assert len(compare_configs(_request(), CONFIGS)) == len(CONFIGS)
+
+    def test_shared_windows_match_own_expansion(self):
+        configs = [
+            SchedulingConfig(max_scheduling_weeks=1),
+            SchedulingConfig(max_scheduling_weeks=3),
+        ]
+        request = _request().model_copy(
+            update={
+                "tasks": [
+                    SchedulableTask(
+                        id=task_id,
+                        title=str(task_id),
+                        expected_duration_minutes=60,
+                        priority=1,
+                    )
+                    for task_id in range(1, 21)
+                ]
+            }
+        )
+
+        results = compare_configs(request, configs, parallel=False)
+
+        for config, result in zip(configs, results, strict=True):
+            own = GreedyScheduler()._schedule(  # type: ignore[attr-defined]
+                request.model_copy(update={"config": config})
+            )
+            assert result.schedule_blocks == own.schedule_blocks
+            assert result.horizon_weeks == own.horizon_weeks
+        assert results[0].unscheduled_count > results[1].unscheduled_count